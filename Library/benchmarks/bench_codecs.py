@@ -0,0 +1,62 @@
+import gc
+import json
+import time
+import argparse
+from Library.persistence.persistence.bookcodecs import CODECS, decode_books
+from Library.persistence.persistenceentities.bookentity import BookEntity
+from faker import Faker
+
+NAME_POOL_SIZE = 1000
+
+
+def generate_books(book_count, seed):
+    fake = Faker()
+    fake.seed_instance(seed)
+    titles = [fake.catch_phrase() for _ in range(NAME_POOL_SIZE)]
+    authors = [fake.name() for _ in range(NAME_POOL_SIZE)]
+
+    return [BookEntity(titles[index % NAME_POOL_SIZE], authors[index * 7 % NAME_POOL_SIZE], 1800 + index % 225,
+                       fake.uuid4(), index % 3 == 0)
+            for index in range(book_count)]
+
+
+def best_time(action, repeats):
+    timings = []
+    for _ in range(repeats):
+        gc.collect()
+        started = time.perf_counter()
+        action()
+        timings.append(time.perf_counter() - started)
+
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare size, write and parse speed of the book file codecs.")
+    parser.add_argument("--books", type=int, default=100_000)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    arguments = parser.parse_args()
+
+    books = generate_books(arguments.books, arguments.seed)
+    results = {"books": arguments.books, "codecs": {}}
+
+    for codec_name, codec in CODECS.items():
+        data = codec.encode(books)
+        encode_seconds = best_time(lambda: codec.encode(books), arguments.repeats)
+        # Parsing goes through format detection, as the repository does.
+        decode_seconds = best_time(lambda: decode_books(data), arguments.repeats)
+
+        results["codecs"][codec_name] = {
+            "bytes": len(data),
+            "write_seconds": round(encode_seconds, 4),
+            "parse_seconds": round(decode_seconds, 4),
+            "write_books_per_second": round(arguments.books / encode_seconds),
+            "parse_books_per_second": round(arguments.books / decode_seconds),
+        }
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
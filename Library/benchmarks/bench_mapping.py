@@ -0,0 +1,100 @@
+import gc
+import json
+import time
+import argparse
+import tracemalloc
+from Library.consoleapp.consoleapp.mappers import bookmodel_to_bookcontract, bookmodels_to_bookcontracts
+from Library.persistence.persistenceentities.bookentity import BookEntity
+from Library.services.services.mappers import bookentities_to_bookmodels, bookentity_to_bookmodel
+
+
+class PropertyBook:
+    def __init__(self, title, author, publication_year, id = None, is_taken = False):
+        self._title = title
+        self._author = author
+        self._publication_year = publication_year
+        self._id = id
+        self._is_taken = is_taken
+
+    @property
+    def title(self):
+        return self._title
+
+    @property
+    def author(self):
+        return self._author
+
+    @property
+    def publication_year(self):
+        return self._publication_year
+
+    @property
+    def id(self):
+        return self._id
+
+    @property
+    def is_taken(self):
+        return self._is_taken
+
+
+def _copy_property_book(book):
+    return PropertyBook(book.title, book.author, book.publication_year, book.id, book.is_taken)
+
+
+def property_listing(book_count):
+    entities = [PropertyBook(f"title {index}", f"author {index % 1000}", 1900 + index % 120, str(index))
+                for index in range(book_count)]
+    models = [_copy_property_book(book) for book in entities]
+    contracts = [_copy_property_book(book) for book in models]
+
+    return sum(1 for contract in contracts if contract.is_taken is False)
+
+
+def slots_listing(book_count):
+    entities = [BookEntity(f"title {index}", f"author {index % 1000}", 1900 + index % 120, str(index))
+                for index in range(book_count)]
+    models = [bookentity_to_bookmodel(book) for book in entities]
+    contracts = [bookmodel_to_bookcontract(book) for book in models]
+
+    return sum(1 for contract in contracts if contract.is_taken is False)
+
+
+def streamed_slots_listing(book_count):
+    entities = [BookEntity(f"title {index}", f"author {index % 1000}", 1900 + index % 120, str(index))
+                for index in range(book_count)]
+    models = list(bookentities_to_bookmodels(entities))
+
+    return sum(1 for contract in bookmodels_to_bookcontracts(models) if contract.is_taken is False)
+
+
+def measure(listing, book_count):
+    gc.collect()
+    started = time.perf_counter()
+    listing(book_count)
+    elapsed = time.perf_counter() - started
+
+    gc.collect()
+    tracemalloc.start()
+    listing(book_count)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"seconds": round(elapsed, 4), "peak_bytes": peak}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare memory and time of the entity, model and contract mapping chain.")
+    parser.add_argument("--books", type=int, default=1_000_000)
+    arguments = parser.parse_args()
+
+    results = {
+        "books": arguments.books,
+        "property_classes": measure(property_listing, arguments.books),
+        "slots_classes": measure(slots_listing, arguments.books),
+        "slots_classes_streamed": measure(streamed_slots_listing, arguments.books),
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+import gc
+import json
+import time
+import uuid
+import random
+import argparse
+import platform
+import tempfile
+from Library.persistence.persistence.bookrepository import BookRepository
+from Library.persistence.persistence.logbookrepository import LogBookRepository
+from Library.persistence.persistence.mmapbookrepository import MmapBookRepository
+from Library.persistence.persistence.shardedbookrepository import ShardedBookRepository
+from Library.persistence.persistence.sqlitebookrepository import SqliteBookRepository
+from Library.persistence.persistence.streamingbookrepository import StreamingBookRepository
+from Library.persistence.persistenceentities.bookentity import BookEntity
+from Library.services.services.bookservice import BookService
+from Library.services.servicesmodels.bookmodel import BookModel
+from faker import Faker
+
+REPOSITORY_FACTORIES = {
+    "json": lambda directory: BookRepository(f"{directory}/books.json"),
+    "streaming": lambda directory: StreamingBookRepository(f"{directory}/books.json"),
+    "log": lambda directory: LogBookRepository(f"{directory}/books.jsonl"),
+    "sqlite": lambda directory: SqliteBookRepository(f"{directory}/books.db"),
+    "mmap": lambda directory: MmapBookRepository(f"{directory}/books.bin"),
+    "sharded": lambda directory: ShardedBookRepository([BookRepository(f"{directory}/books.{index}.json") for index in range(4)]),
+}
+OPERATIONS = ("create", "buy_copy", "take", "return", "get_all", "search_by_title", "search_by_author")
+SIZES = (1_000, 100_000, 1_000_000)
+# Faker is too slow to name a million books one by one, so catalogs combine
+# a fixed pool of generated titles and authors, which also yields copies.
+NAME_POOL_SIZE = 10_000
+
+
+class CatalogGenerator:
+    def __init__(self, seed):
+        fake = Faker()
+        fake.seed_instance(seed)
+        self.__random = random.Random(seed)
+        self.titles = [fake.catch_phrase() for _ in range(NAME_POOL_SIZE)]
+        self.authors = [fake.name() for _ in range(NAME_POOL_SIZE)]
+
+    def new_id(self):
+        return str(uuid.UUID(int=self.__random.getrandbits(128), version=4))
+
+    def new_book(self):
+        return BookModel(self.__random.choice(self.titles), self.__random.choice(self.authors),
+                         self.__random.randint(1800, 2024))
+
+    def books(self, book_count):
+        for _ in range(book_count):
+            book = self.new_book()
+            yield BookEntity(book.title, book.author, book.publication_year, self.new_id(), False)
+
+    def choice(self, values):
+        return self.__random.choice(values)
+
+    def sample(self, values, count):
+        return self.__random.sample(values, min(count, len(values)))
+
+
+def percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values) + 0.5) - 1))
+    return sorted_values[index]
+
+
+def measure(operation, arguments):
+    latencies = []
+    gc.collect()
+
+    for argument in arguments:
+        started = time.perf_counter()
+        operation(argument)
+        latencies.append(time.perf_counter() - started)
+
+    latencies.sort()
+    total = sum(latencies)
+
+    return {
+        "samples": len(latencies),
+        "throughput_per_second": round(len(latencies) / total, 2) if total else None,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 4),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 4),
+    }
+
+
+def benchmark_repository(book_repository, generator, book_count, samples, scan_samples):
+    book_repository.import_books(generator.books(book_count))
+    book_ids = [book.id for book in book_repository.iter_books()]
+    book_service = BookService(book_repository)
+    taken_ids = generator.sample(book_ids, samples)
+
+    operations = {
+        "create": (book_service.create_book, [generator.new_book() for _ in range(samples)]),
+        "buy_copy": (lambda book_id: book_service.buy_book_copy(book_id, None), generator.sample(book_ids, samples)),
+        "take": (book_service.take_book, taken_ids),
+        "return": (book_service.return_book, taken_ids),
+        "get_all": (lambda _: book_service.get_all_books(), range(scan_samples)),
+        "search_by_title": (book_service.search_books_by_title, [generator.choice(generator.titles) for _ in range(samples)]),
+        "search_by_author": (book_service.search_books_by_author, [generator.choice(generator.authors) for _ in range(samples)]),
+    }
+
+    return {name: measure(*operations[name]) for name in OPERATIONS}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time BookService operations against every book repository.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES))
+    parser.add_argument("--repositories", nargs="+", choices=list(REPOSITORY_FACTORIES), default=list(REPOSITORY_FACTORIES))
+    parser.add_argument("--samples", type=int, default=20)
+    parser.add_argument("--scan-samples", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output")
+    arguments = parser.parse_args()
+
+    generator = CatalogGenerator(arguments.seed)
+    results = []
+
+    for book_count in arguments.sizes:
+        for repository_name in arguments.repositories:
+            with tempfile.TemporaryDirectory() as directory:
+                book_repository = REPOSITORY_FACTORIES[repository_name](directory)
+                try:
+                    operations = benchmark_repository(book_repository, generator, book_count, arguments.samples,
+                                                      arguments.scan_samples)
+                finally:
+                    if hasattr(book_repository, "close"):
+                        book_repository.close()
+
+            results.append({"repository": repository_name, "books": book_count, "operations": operations})
+
+    report = json.dumps({
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": arguments.seed,
+        "samples": arguments.samples,
+        "results": results,
+    }, indent=2)
+
+    if arguments.output:
+        with open(arguments.output, 'w') as file:
+            file.write(report)
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
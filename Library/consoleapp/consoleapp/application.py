@@ -1,9 +1,12 @@
-from Library.consoleapp.consoleapp.mappers import bookcontract_to_bookmodel, bookmodel_to_bookcontract
+from Library.consoleapp.consoleapp.mappers import bookcontract_to_bookmodel, bookmodel_to_bookcontract, bookmodels_to_bookcontracts, \
+    editionmodel_to_editioncontract
 from Library.consoleapp.consoleappcontracts.bookcontract import BookContract
 from Library.persistence.persistence.repositoryexception import RepositoryException
 from Library.services.services.bookvalueexception import BookValueException
 from Library.services.services.ibookservice import IBookService
 
+BOOKS_PAGE_SIZE = 10
+
 class Application:
     def setup(self, book_service: IBookService):
         self.__book_service = book_service
@@ -58,11 +61,7 @@ class Application:
         print("Which book copy you want to buy?")
 
         try:
-            existing_books = self.__book_service.get_all_books()
-            existing_books = [bookmodel_to_bookcontract(book) for book in existing_books]
-            
-            for book in existing_books:
-                self._print_book(book)
+            self._browse_books()
 
             book_id = input("Enter the id of the book you want to buy a copy of:")
             book_publication_year = input("Enter the publication year, if you won't enter it, then publication "
@@ -77,6 +76,22 @@ class Application:
         except RepositoryException as e:
             print(f"Repository exception occured: {e}")
 
+    def _browse_books(self):
+        cursor = None
+
+        while True:
+            page = self.__book_service.get_books(cursor, BOOKS_PAGE_SIZE, "title")
+            for book in bookmodels_to_bookcontracts(page.books):
+                self._print_book(book)
+
+            if page.next_cursor is None:
+                return
+
+            if input("n -> next page, anything else -> stop browsing: ").lower() != "n":
+                return
+
+            cursor = page.next_cursor
+
     def _print_book(self, book):
         print(f"Book id: {book.book_id}")
         print(f"Book title: {book.title}")
@@ -87,11 +102,7 @@ class Application:
     def _take_book(self):
         print("Take a book from the list:")
         try:
-            existing_books = self.__book_service.get_all_books()
-            existing_books = [bookmodel_to_bookcontract(book) for book in existing_books]
-
-            for book in existing_books:
-                self._print_book(book)
+            self._browse_books()
 
             book_id = input("Enter the id of a book that you want to take: ")
             returned_book = bookmodel_to_bookcontract(self.__book_service.take_book(book_id))
@@ -109,11 +120,7 @@ class Application:
     def _return_book(self):
         print("Return a book from the list:")
         try:
-            existing_books = self.__book_service.get_all_books()
-            existing_books = [bookmodel_to_bookcontract(book) for book in existing_books]
-
-            for book in existing_books:
-                self._print_book(book)
+            self._browse_books()
 
             book_id = input("Enter the id of a book that you want to return: ")
             returned_book = bookmodel_to_bookcontract(self.__book_service.return_book(book_id))
@@ -132,26 +139,66 @@ class Application:
         print("You can search only by one of the two parameters: by title or by author")
         print("t -> title search")
         print("a -> author search")
+        print("ft -> fuzzy title search (beginning, part or misspelling of a title)")
+        print("fa -> fuzzy author search (beginning, part or misspelling of an author)")
+        print("y -> publication year range search")
         search_parameter = input("Enter your choice: ").lower()
 
         if search_parameter == "t":
             title = input("Enter title that you want to find: ")
-            found_books = self.__book_service.search_books_by_title(title)
-            self._print_search_results([bookmodel_to_bookcontract(book) for book in found_books])
+            found_editions = self.__book_service.search_editions_by_title(title)
+            self._print_search_results([editionmodel_to_editioncontract(edition) for edition in found_editions])
         elif search_parameter == "a":
             author = input("Enter author that you want to find: ")
-            found_books = self.__book_service.search_books_by_author(author)
-            self._print_search_results([bookmodel_to_bookcontract(book) for book in found_books])
+            found_editions = self.__book_service.search_editions_by_author(author)
+            self._print_search_results([editionmodel_to_editioncontract(edition) for edition in found_editions])
+        elif search_parameter == "ft":
+            title = input("Enter title that you want to find: ")
+            found_editions = self.__book_service.fuzzy_search_editions_by_title(title)
+            self._print_search_results([editionmodel_to_editioncontract(edition) for edition in found_editions])
+        elif search_parameter == "fa":
+            author = input("Enter author that you want to find: ")
+            found_editions = self.__book_service.fuzzy_search_editions_by_author(author)
+            self._print_search_results([editionmodel_to_editioncontract(edition) for edition in found_editions])
+        elif search_parameter == "y":
+            self._search_by_year_range()
         else:
             print("such parameter doesn't exist")
 
-    def _print_search_results(self, books):
-            if len(books) == 0:
+    def _search_by_year_range(self):
+        start_year = input("Enter the first publication year: ")
+        end_year = input("Enter the last publication year: ")
+
+        try:
+            found_books = list(bookmodels_to_bookcontracts(self.__book_service.search_books_by_year_range(start_year, end_year)))
+        except ValueError as e:
+            print(f"Value error occured: {e}")
+            return
+        except RepositoryException as e:
+            print(f"Repository exception occured: {e}")
+            return
+
+        if len(found_books) == 0:
+            print("Sorry, no books were found")
+        else:
+            print("Here is your results:")
+            for book in found_books:
+                self._print_book(book)
+
+    def _print_search_results(self, editions):
+            if len(editions) == 0:
                 print("Sorry, no books were found")
             else:
                 print("Here is your results:")
-                for book in books:
-                    self._print_book(book)
+                for edition in editions:
+                    self._print_edition(edition)
+
+    def _print_edition(self, edition):
+        print(f"Book title: {edition.title}")
+        print(f"Book author: {edition.author}")
+        print(f"Book publication year: {edition.publication_year}")
+        print(f"Available copies: {edition.available_count} of {edition.copy_count}")
+        print(f"Copy ids: {', '.join(edition.book_ids)}")
 
     def _invalid_action(self):
         print("Invalid action. Please choose a valid option.")
\ No newline at end of file
@@ -0,0 +1,34 @@
+import sys
+import json
+import argparse
+from Library.consoleapp.consoleapp.batchrunner import BatchRunner
+from Library.consoleapp.consoleapp.configuration import get_configuration
+from Library.consoleapp.consoleapp.servicefactory import create_book_service
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply a JSON Lines stream of library operations without prompts.")
+    parser.add_argument("--input", help="operations file, standard input by default")
+    parser.add_argument("--output", help="results file, standard output by default")
+    arguments = parser.parse_args()
+
+    book_service, metrics = create_book_service(get_configuration())
+    input_file = open(arguments.input, 'r') if arguments.input else sys.stdin
+    output_file = open(arguments.output, 'w') if arguments.output else sys.stdout
+
+    try:
+        summary = BatchRunner(book_service).run(input_file, output_file)
+    finally:
+        if arguments.input:
+            input_file.close()
+        if arguments.output:
+            output_file.close()
+        if metrics is not None:
+            metrics.stop_exporting()
+
+    # The summary goes to standard error so that it never mixes with the results.
+    print(json.dumps(summary.to_dict()), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
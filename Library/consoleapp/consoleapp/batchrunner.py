@@ -0,0 +1,222 @@
+from collections.abc import Hashable
+import json
+import time
+from Library.persistence.persistence.repositoryexception import RepositoryException
+from Library.services.services.bookvalueexception import BookValueException
+from Library.services.services.ibookservice import IBookService
+from Library.services.servicesmodels.bookmodel import BookModel
+from Library.services.servicesmodels.bookoperationstatus import BookOperationStatus
+from Library.services.servicesmodels.bookserviceexceptions import BookServiceExceptions
+
+CREATE_OPERATION = "create"
+BUY_COPY_OPERATION = "buy_copy"
+TAKE_OPERATION = "take"
+RETURN_OPERATION = "return"
+SEARCH_OPERATION = "search"
+INVALID_OPERATION = "invalid"
+# Consecutive operations of these kinds run as one service batch, which
+# applies them in order and writes the repository once.
+BATCHED_OPERATIONS = (CREATE_OPERATION, TAKE_OPERATION, RETURN_OPERATION)
+MAXIMUM_BATCH_SIZE = 1000
+
+STATUS_ERRORS = {
+    BookOperationStatus.NOT_FOUND: BookServiceExceptions.BOOK_ID_NOT_EXIST,
+    BookOperationStatus.ALREADY_TAKEN: BookServiceExceptions.BOOK_ALREADY_TAKEN,
+    BookOperationStatus.ALREADY_IN_LIBRARY: BookServiceExceptions.BOOK_ALREADY_IN_LIBRARY,
+}
+
+
+class BatchSummary:
+    def __init__(self):
+        self.operations = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.seconds = 0.0
+        self.operation_counts = {}
+
+    def to_dict(self):
+        return {
+            "operations": self.operations,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "seconds": round(self.seconds, 4),
+            "operations_per_second": round(self.operations / self.seconds, 2) if self.seconds else None,
+            "operation_counts": self.operation_counts,
+        }
+
+
+def _book_to_dict(book):
+    return {
+        "id": book.id,
+        "title": book.title,
+        "author": book.author,
+        "publication_year": book.publication_year,
+        "is_taken": book.is_taken,
+    }
+
+
+class BatchRunner:
+    def __init__(self, book_service: IBookService):
+        self.__book_service = book_service
+        self.__references = {}
+
+    def run(self, lines, output):
+        summary = BatchSummary()
+        started = time.perf_counter()
+        batch_operation = None
+        batch = []
+
+        for line_number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+
+            try:
+                operation = json.loads(line)
+                operation_name = operation["op"]
+            except (ValueError, TypeError, KeyError):
+                operation, operation_name = {}, INVALID_OPERATION
+
+            if batch and (operation_name != batch_operation or len(batch) >= MAXIMUM_BATCH_SIZE):
+                self._write_results(self._run_batch(batch_operation, batch), output, summary)
+                batch = []
+
+            if operation_name in BATCHED_OPERATIONS:
+                batch_operation = operation_name
+                batch.append((line_number, operation))
+            else:
+                self._write_results([self._run_operation(line_number, operation_name, operation)], output, summary)
+
+        if batch:
+            self._write_results(self._run_batch(batch_operation, batch), output, summary)
+
+        summary.seconds = time.perf_counter() - started
+
+        return summary
+
+    def _run_batch(self, operation_name, batch):
+        try:
+            if operation_name == CREATE_OPERATION:
+                return self._create_books(batch)
+
+            return self._change_books_taken(operation_name, batch)
+        except RepositoryException as e:
+            return [self._failure(line_number, operation_name, operation, e) for line_number, operation in batch]
+
+    def _create_books(self, batch):
+        books = [BookModel(operation.get("title"), operation.get("author"), operation.get("publication_year"))
+                 for _, operation in batch]
+        batch_result = self.__book_service.create_books(books)
+
+        errors = dict(batch_result.failures)
+        created_books = iter(batch_result.created_books)
+        results = []
+
+        for index, (line_number, operation) in enumerate(batch):
+            if index in errors:
+                results.append(self._failure(line_number, CREATE_OPERATION, operation, errors[index]))
+                continue
+
+            book = next(created_books)
+            if "ref" in operation:
+                self.__references[operation["ref"]] = book.id
+            results.append(self._success(line_number, CREATE_OPERATION, operation, book=_book_to_dict(book)))
+
+        return results
+
+    def _change_books_taken(self, operation_name, batch):
+        errors = {}
+        book_ids = []
+        for index, (_, operation) in enumerate(batch):
+            try:
+                book_ids.append(self._book_id(operation))
+            except ValueError as e:
+                errors[index] = e
+
+        change_books_taken = self.__book_service.take_books if operation_name == TAKE_OPERATION \
+            else self.__book_service.return_books
+        statuses = iter(change_books_taken(book_ids) if book_ids else [])
+
+        results = []
+        for index, (line_number, operation) in enumerate(batch):
+            if index in errors:
+                results.append(self._failure(line_number, operation_name, operation, errors[index]))
+                continue
+
+            book_id, status = next(statuses)
+            if status == BookOperationStatus.OK:
+                results.append(self._success(line_number, operation_name, operation, book_id=book_id))
+            else:
+                results.append(self._failure(line_number, operation_name, operation, STATUS_ERRORS[status]))
+
+        return results
+
+    def _run_operation(self, line_number, operation_name, operation):
+        try:
+            if operation_name == BUY_COPY_OPERATION:
+                book = self.__book_service.buy_book_copy(self._book_id(operation), operation.get("publication_year"))
+                if "ref" in operation:
+                    self.__references[operation["ref"]] = book.id
+                return self._success(line_number, operation_name, operation, book=_book_to_dict(book))
+
+            if operation_name == SEARCH_OPERATION:
+                books = self._search(operation)
+                return self._success(line_number, operation_name, operation, books=[_book_to_dict(book) for book in books])
+
+            if operation_name == INVALID_OPERATION:
+                return self._failure(line_number, operation_name, operation, "Line is not a JSON operation with an op")
+
+            return self._failure(line_number, operation_name, operation, f"Unknown operation: {operation_name}")
+        except (ValueError, BookValueException, RepositoryException) as e:
+            return self._failure(line_number, operation_name, operation, e)
+
+    def _search(self, operation):
+        fuzzy = operation.get("fuzzy", False)
+
+        if "title" in operation:
+            search = self.__book_service.fuzzy_search_books_by_title if fuzzy else self.__book_service.search_books_by_title
+            return search(operation["title"])
+        if "author" in operation:
+            search = self.__book_service.fuzzy_search_books_by_author if fuzzy else self.__book_service.search_books_by_author
+            return search(operation["author"])
+
+        raise ValueError("A search needs a title or an author")
+
+    def _book_id(self, operation):
+        # Replayed traffic refers to books created earlier in the same stream by their ref.
+        if "book_ref" in operation:
+            book_ref = operation["book_ref"]
+            book_id = self.__references.get(book_ref) if isinstance(book_ref, Hashable) else None
+            if book_id is None:
+                raise ValueError(f"Unknown book reference: {book_ref}")
+
+            return book_id
+
+        if operation.get("book_id") is None:
+            raise ValueError("An operation on a book needs a book_id or a book_ref")
+        if not isinstance(operation["book_id"], str):
+            raise ValueError(f"A book_id must be a string: {operation['book_id']}")
+
+        return operation["book_id"]
+
+    def _success(self, line_number, operation_name, operation, **result):
+        return self._result(line_number, operation_name, operation, ok=True, **result)
+
+    def _failure(self, line_number, operation_name, operation, error):
+        return self._result(line_number, operation_name, operation, ok=False, error=str(error))
+
+    def _result(self, line_number, operation_name, operation, **result):
+        if "ref" in operation:
+            result = {"ref": operation["ref"], **result}
+
+        return {"line": line_number, "op": operation_name, **result}
+
+    def _write_results(self, results, output, summary):
+        for result in results:
+            summary.operations += 1
+            summary.operation_counts[result["op"]] = summary.operation_counts.get(result["op"], 0) + 1
+            if result["ok"]:
+                summary.succeeded += 1
+            else:
+                summary.failed += 1
+
+            output.write(json.dumps(result) + "\n")
@@ -3,8 +3,16 @@ import os
 
 
 def get_configuration():
-    script_directory = os.path.dirname(os.path.abspath(__file__))
-    config_file_path = os.path.join(script_directory, 'config.json')
+    with open(_get_config_file_path(), 'r') as file:
+        return json.load(file)
+
+
+def save_configuration(configuration):
+    with open(_get_config_file_path(), 'w') as file:
+        json.dump(configuration, file, indent=4)
+        file.write("\n")
 
-    with open(config_file_path, 'r') as file:
-        return json.load(file)
\ No newline at end of file
+
+def _get_config_file_path():
+    script_directory = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(script_directory, 'config.json')
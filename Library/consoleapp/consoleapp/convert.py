@@ -0,0 +1,27 @@
+import os
+import argparse
+from Library.consoleapp.consoleapp.configuration import get_configuration, save_configuration
+from Library.persistence.persistence.bookcodecs import CODECS, convert_book_file
+from Library.persistence.persistence.shardedbookrepository import shard_file_paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rewrite the book catalog files in another codec.")
+    parser.add_argument("codec", choices=list(CODECS))
+    arguments = parser.parse_args()
+
+    configuration = get_configuration()
+    connection = configuration['connection']
+    file_paths = shard_file_paths(connection['book_file_path'], connection.get('shard_count', 1))
+
+    book_count = sum(convert_book_file(file_path, file_path, arguments.codec)
+                     for file_path in file_paths if os.path.exists(file_path))
+
+    connection['codec'] = arguments.codec
+    save_configuration(configuration)
+
+    print(f"Converted {book_count} books to {arguments.codec}.")
+
+
+if __name__ == "__main__":
+    main()
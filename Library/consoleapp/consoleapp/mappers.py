@@ -1,9 +1,18 @@
 from Library.consoleapp.consoleappcontracts.bookcontract import BookContract
+from Library.consoleapp.consoleappcontracts.editioncontract import EditionContract
 from Library.services.servicesmodels.bookmodel import BookModel
+from Library.services.servicesmodels.editionmodel import EditionModel
 
 
 def bookcontract_to_bookmodel(book: BookContract):
     return BookModel(book.title, book.author, book.publication_year)
 
 def bookmodel_to_bookcontract(book: BookModel):
-    return BookContract(book.title, book.author, book.publication_year, book.id, book.is_taken)
\ No newline at end of file
+    return BookContract(book.title, book.author, book.publication_year, book.id, book.is_taken)
+
+def bookmodels_to_bookcontracts(books):
+    return map(bookmodel_to_bookcontract, books)
+
+def editionmodel_to_editioncontract(edition: EditionModel):
+    return EditionContract(edition.title, edition.author, edition.publication_year, edition.book_ids,
+                           edition.copy_count, edition.available_count)
@@ -0,0 +1,24 @@
+from Library.instrumentation.instrumentation.inmemorymetricsexporter import InMemoryMetricsExporter
+from Library.instrumentation.instrumentation.logmetricsexporter import LogMetricsExporter
+from Library.instrumentation.instrumentation.metricsregistry import MetricsRegistry
+from Library.instrumentation.instrumentation.prometheusmetricsexporter import PrometheusMetricsExporter
+
+MEMORY_EXPORTER = "memory"
+LOG_EXPORTER = "log"
+PROMETHEUS_EXPORTER = "prometheus"
+
+
+def create_metrics_registry(metrics):
+    if not metrics.get('enabled', False):
+        return None
+
+    exporter = metrics.get('exporter', LOG_EXPORTER)
+
+    if exporter == MEMORY_EXPORTER:
+        return MetricsRegistry([InMemoryMetricsExporter()])
+    if exporter == LOG_EXPORTER:
+        return MetricsRegistry([LogMetricsExporter()])
+    if exporter == PROMETHEUS_EXPORTER:
+        return MetricsRegistry([PrometheusMetricsExporter(metrics['file_path'])])
+
+    raise ValueError(f"Unknown metrics exporter: {exporter}")
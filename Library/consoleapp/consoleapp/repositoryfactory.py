@@ -0,0 +1,59 @@
+import os
+from Library.persistence.persistence.bookcodecs import COMPACT_JSON_CODEC, JSON_CODEC
+from Library.persistence.persistence.bookrepository import BookRepository
+from Library.persistence.persistence.columnarbookrepository import ColumnarBookRepository
+from Library.persistence.persistence.logbookrepository import LogBookRepository
+from Library.persistence.persistence.mmapbookrepository import MmapBookRepository, json_to_mapped
+from Library.persistence.persistence.shardedbookrepository import ShardedBookRepository, reshard_books, shard_file_paths
+from Library.persistence.persistence.sqlitebookrepository import SqliteBookRepository
+from Library.persistence.persistence.streamingbookrepository import StreamingBookRepository
+
+JSON_STORAGE = "json"
+LOG_STORAGE = "log"
+SQLITE_STORAGE = "sqlite"
+MMAP_STORAGE = "mmap"
+
+
+def create_book_repository(connection):
+    book_repository = _create_storage_repository(connection)
+
+    if connection.get('columnar', False):
+        return ColumnarBookRepository(book_repository)
+
+    return book_repository
+
+
+def _create_storage_repository(connection):
+    storage = connection.get('storage', JSON_STORAGE)
+    book_file_path = connection['book_file_path']
+
+    if storage == JSON_STORAGE and connection.get('streaming', False):
+        if connection.get('codec', JSON_CODEC) not in (JSON_CODEC, COMPACT_JSON_CODEC):
+            raise ValueError("Streaming storage can only read JSON arrays")
+        return StreamingBookRepository(book_file_path)
+    if storage == JSON_STORAGE and connection.get('shard_count', 1) > 1:
+        shard_count = connection['shard_count']
+        file_paths = shard_file_paths(book_file_path, shard_count)
+        if not any(os.path.exists(file_path) for file_path in file_paths) and os.path.exists(book_file_path):
+            reshard_books(book_file_path, 1, shard_count, connection.get('codec', JSON_CODEC))
+        return ShardedBookRepository([_create_json_repository(file_path, connection) for file_path in file_paths])
+    if storage == JSON_STORAGE:
+        return _create_json_repository(book_file_path, connection)
+    if storage == LOG_STORAGE:
+        return LogBookRepository(connection['book_log_path'], legacy_file_path=book_file_path)
+    if storage == SQLITE_STORAGE:
+        return SqliteBookRepository(connection['database_path'], legacy_file_path=book_file_path)
+    if storage == MMAP_STORAGE:
+        record_file_path = connection['record_file_path']
+        if not os.path.exists(record_file_path) and os.path.exists(book_file_path):
+            json_to_mapped(book_file_path, record_file_path)
+        return MmapBookRepository(record_file_path)
+
+    raise ValueError(f"Unknown storage: {storage}")
+
+
+def _create_json_repository(file_path, connection):
+    return BookRepository(file_path, group_commit=connection.get('group_commit', False),
+                          commit_window=connection.get('group_commit_window_ms', 2) / 1000,
+                          maximum_batch_size=connection.get('group_commit_batch_size', 256),
+                          codec=connection.get('codec', JSON_CODEC))
@@ -0,0 +1,27 @@
+import argparse
+from Library.consoleapp.consoleapp.configuration import get_configuration, save_configuration
+from Library.persistence.persistence.bookcodecs import JSON_CODEC
+from Library.persistence.persistence.shardedbookrepository import reshard_books
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Redistribute the JSON book catalog over a new number of shards.")
+    parser.add_argument("shard_count", type=int)
+    arguments = parser.parse_args()
+
+    if arguments.shard_count < 1:
+        parser.error("shard_count must be at least 1")
+
+    configuration = get_configuration()
+    connection = configuration['connection']
+    book_count = reshard_books(connection['book_file_path'], connection.get('shard_count', 1), arguments.shard_count,
+                               connection.get('codec', JSON_CODEC))
+
+    connection['shard_count'] = arguments.shard_count
+    save_configuration(configuration)
+
+    print(f"Resharded {book_count} books into {arguments.shard_count} shards.")
+
+
+if __name__ == "__main__":
+    main()
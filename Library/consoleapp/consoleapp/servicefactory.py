@@ -0,0 +1,21 @@
+from Library.consoleapp.consoleapp.metricsfactory import create_metrics_registry
+from Library.consoleapp.consoleapp.repositoryfactory import create_book_repository
+from Library.instrumentation.instrumentation.instrumentedbookrepository import InstrumentedBookRepository
+from Library.instrumentation.instrumentation.instrumentedbookservice import InstrumentedBookService
+from Library.services.services.bookservice import SEARCH_CACHE_SIZE, BookService
+
+
+def create_book_service(configuration):
+    book_repository = create_book_repository(configuration['connection'])
+    metrics = create_metrics_registry(configuration.get('metrics', {}))
+    search_cache_size = configuration.get('service', {}).get('search_cache_size', SEARCH_CACHE_SIZE)
+
+    # Without metrics nothing is wrapped, so disabled instrumentation costs nothing.
+    if metrics is None:
+        return BookService(book_repository, search_cache_size), None
+
+    book_service = InstrumentedBookService(
+        BookService(InstrumentedBookRepository(book_repository, metrics), search_cache_size), metrics)
+    metrics.start_exporting(configuration['metrics'].get('interval_seconds', 15))
+
+    return book_service, metrics
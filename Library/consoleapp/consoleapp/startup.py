@@ -1,14 +1,15 @@
 from Library.consoleapp.consoleapp.application import Application
 from Library.consoleapp.consoleapp.configuration import get_configuration
-from Library.persistence.persistence.bookrepository import BookRepository
-from Library.services.services.bookservice import BookService
+from Library.consoleapp.consoleapp.servicefactory import create_book_service
 
 applictaion = Application()
 data = get_configuration()
 
-book_file_path = data['connection']['book_file_path']
-book_service = BookService(BookRepository(book_file_path))
+book_service, metrics = create_book_service(data)
 
 applictaion.setup(book_service)
-applictaion.run()
-
+try:
+    applictaion.run()
+finally:
+    if metrics is not None:
+        metrics.stop_exporting()
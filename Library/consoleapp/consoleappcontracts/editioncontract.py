@@ -0,0 +1,10 @@
+class EditionContract:
+    __slots__ = ("title", "author", "publication_year", "book_ids", "copy_count", "available_count")
+
+    def __init__(self, title, author, publication_year, book_ids, copy_count, available_count):
+        self.title = title
+        self.author = author
+        self.publication_year = publication_year
+        self.book_ids = book_ids
+        self.copy_count = copy_count
+        self.available_count = available_count
@@ -0,0 +1,7 @@
+from abc import ABC, abstractmethod
+
+
+class IMetricsExporter(ABC):
+    @abstractmethod
+    def export(self, snapshot):
+        pass
@@ -0,0 +1,13 @@
+from Library.instrumentation.instrumentation.imetricsexporter import IMetricsExporter
+
+
+class InMemoryMetricsExporter(IMetricsExporter):
+    def __init__(self):
+        self.snapshots = []
+
+    @property
+    def latest(self):
+        return self.snapshots[-1] if self.snapshots else {}
+
+    def export(self, snapshot):
+        self.snapshots.append(snapshot)
@@ -0,0 +1,90 @@
+from Library.instrumentation.instrumentation.measurement import measure, measure_iteration
+from Library.instrumentation.instrumentation.metricsregistry import MetricsRegistry
+from Library.persistence.persistence.ibookrepository import IBookRepository
+
+LAYER = "repository"
+
+
+class InstrumentedBookRepository(IBookRepository):
+    def __init__(self, book_repository: IBookRepository, metrics: MetricsRegistry):
+        self.__book_repository = book_repository
+        self.__metrics = metrics
+
+    def __getattr__(self, name):
+        # Everything outside the interface, such as close or cache_statistics, is passed through.
+        return getattr(self.__book_repository, name)
+
+    def create_book(self, book):
+        return self._measure("create_book", self.__book_repository.create_book, book)
+
+    def create_books(self, books):
+        return self._measure("create_books", self.__book_repository.create_books, books)
+
+    def import_books(self, books):
+        return self._measure("import_books", self.__book_repository.import_books, books)
+
+    def read_books(self):
+        return self._measure("read_books", self.__book_repository.read_books)
+
+    def iter_books(self):
+        return measure_iteration(self.__metrics, LAYER, "iter_books", self.__book_repository,
+                                 self.__book_repository.iter_books)
+
+    def update_book(self, updated_book):
+        return self._measure("update_book", self.__book_repository.update_book, updated_book)
+
+    def update_books(self, updated_books):
+        return self._measure("update_books", self.__book_repository.update_books, updated_books)
+
+    def set_taken(self, book_id, is_taken, expected=None):
+        return self._measure("set_taken", self.__book_repository.set_taken, book_id, is_taken, expected)
+
+    def set_taken_many(self, book_ids, is_taken, expected=None):
+        return self._measure("set_taken_many", self.__book_repository.set_taken_many, book_ids, is_taken, expected)
+
+    def get_books(self, cursor, limit, sort):
+        return self._measure("get_books", self.__book_repository.get_books, cursor, limit, sort)
+
+    def get_book_by_id(self, book_id):
+        return self._measure("get_book_by_id", self.__book_repository.get_book_by_id, book_id)
+
+    def get_books_by_ids(self, book_ids):
+        return self._measure("get_books_by_ids", self.__book_repository.get_books_by_ids, book_ids)
+
+    def read_books_by_title(self, title):
+        return self._measure("read_books_by_title", self.__book_repository.read_books_by_title, title)
+
+    def read_books_by_author(self, author):
+        return self._measure("read_books_by_author", self.__book_repository.read_books_by_author, author)
+
+    def read_books_similar_to_title(self, title, limit):
+        return self._measure("read_books_similar_to_title", self.__book_repository.read_books_similar_to_title,
+                             title, limit)
+
+    def read_books_similar_to_author(self, author, limit):
+        return self._measure("read_books_similar_to_author", self.__book_repository.read_books_similar_to_author,
+                             author, limit)
+
+    def read_books_by_year_range(self, start_year, end_year):
+        return self._measure("read_books_by_year_range", self.__book_repository.read_books_by_year_range,
+                             start_year, end_year)
+
+    def read_editions_by_title(self, title):
+        return self._measure("read_editions_by_title", self.__book_repository.read_editions_by_title, title)
+
+    def read_editions_by_author(self, author):
+        return self._measure("read_editions_by_author", self.__book_repository.read_editions_by_author, author)
+
+    def read_editions_similar_to_title(self, title, limit):
+        return self._measure("read_editions_similar_to_title", self.__book_repository.read_editions_similar_to_title,
+                             title, limit)
+
+    def read_editions_similar_to_author(self, author, limit):
+        return self._measure("read_editions_similar_to_author", self.__book_repository.read_editions_similar_to_author,
+                             author, limit)
+
+    def query_books(self, predicate):
+        return self._measure("query_books", self.__book_repository.query_books, predicate)
+
+    def _measure(self, operation, call, *args):
+        return measure(self.__metrics, LAYER, operation, self.__book_repository, call, *args)
@@ -0,0 +1,82 @@
+from Library.instrumentation.instrumentation.measurement import measure, measure_iteration
+from Library.instrumentation.instrumentation.metricsregistry import MetricsRegistry
+from Library.services.services.bookservice import FUZZY_SEARCH_LIMIT, PAGE_SIZE
+from Library.services.services.ibookservice import IBookService
+
+LAYER = "service"
+
+
+class InstrumentedBookService(IBookService):
+    def __init__(self, book_service: IBookService, metrics: MetricsRegistry):
+        self._book_service = book_service
+        self._metrics = metrics
+
+    @property
+    def search_cache_statistics(self):
+        return self._book_service.search_cache_statistics
+
+    def create_book(self, book):
+        return self._measure("create_book", self._book_service.create_book, book)
+
+    def create_books(self, books):
+        return self._measure("create_books", self._book_service.create_books, books)
+
+    def buy_book_copy(self, book_id, publication_year):
+        return self._measure("buy_book_copy", self._book_service.buy_book_copy, book_id, publication_year)
+
+    def get_all_books(self):
+        return self._measure("get_all_books", self._book_service.get_all_books)
+
+    def iter_all_books(self):
+        return measure_iteration(self._metrics, LAYER, "iter_all_books", None, self._book_service.iter_all_books)
+
+    def get_books(self, cursor = None, limit = PAGE_SIZE, sort = "title"):
+        return self._measure("get_books", self._book_service.get_books, cursor, limit, sort)
+
+    def take_book(self, book_id):
+        return self._measure("take_book", self._book_service.take_book, book_id)
+
+    def return_book(self, book_id):
+        return self._measure("return_book", self._book_service.return_book, book_id)
+
+    def take_books(self, book_ids):
+        return self._measure("take_books", self._book_service.take_books, book_ids)
+
+    def return_books(self, book_ids):
+        return self._measure("return_books", self._book_service.return_books, book_ids)
+
+    def search_books_by_title(self, title):
+        return self._measure("search_books_by_title", self._book_service.search_books_by_title, title)
+
+    def search_books_by_author(self, author):
+        return self._measure("search_books_by_author", self._book_service.search_books_by_author, author)
+
+    def fuzzy_search_books_by_title(self, title, limit = FUZZY_SEARCH_LIMIT):
+        return self._measure("fuzzy_search_books_by_title", self._book_service.fuzzy_search_books_by_title,
+                             title, limit)
+
+    def fuzzy_search_books_by_author(self, author, limit = FUZZY_SEARCH_LIMIT):
+        return self._measure("fuzzy_search_books_by_author", self._book_service.fuzzy_search_books_by_author,
+                             author, limit)
+
+    def search_books_by_year_range(self, start_year, end_year):
+        return self._measure("search_books_by_year_range", self._book_service.search_books_by_year_range,
+                             start_year, end_year)
+
+    def query_books(self, predicate):
+        return self._measure("query_books", self._book_service.query_books, predicate)
+
+    def search_editions_by_title(self, title):
+        return self._measure("search_editions_by_title", self._book_service.search_editions_by_title, title)
+
+    def search_editions_by_author(self, author):
+        return self._measure("search_editions_by_author", self._book_service.search_editions_by_author, author)
+
+    def fuzzy_search_editions_by_title(self, title, limit = FUZZY_SEARCH_LIMIT):
+        return self._measure("fuzzy_search_editions_by_title", self._book_service.fuzzy_search_editions_by_title, title, limit)
+
+    def fuzzy_search_editions_by_author(self, author, limit = FUZZY_SEARCH_LIMIT):
+        return self._measure("fuzzy_search_editions_by_author", self._book_service.fuzzy_search_editions_by_author, author, limit)
+
+    def _measure(self, operation, call, *args):
+        return measure(self._metrics, LAYER, operation, None, call, *args)
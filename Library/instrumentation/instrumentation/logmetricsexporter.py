@@ -0,0 +1,16 @@
+import logging
+from Library.instrumentation.instrumentation.imetricsexporter import IMetricsExporter
+
+
+class LogMetricsExporter(IMetricsExporter):
+    def __init__(self, logger: logging.Logger = None, level: int = logging.INFO):
+        self.__logger = logger or logging.getLogger("Library.metrics")
+        self.__level = level
+
+    def export(self, snapshot):
+        for (layer, operation), operation_metrics in sorted(snapshot.items()):
+            average_ms = operation_metrics.seconds / operation_metrics.calls * 1000 if operation_metrics.calls else 0.0
+            self.__logger.log(self.__level,
+                              "layer=%s operation=%s calls=%d errors=%d avg_ms=%.3f books=%d bytes_read=%d bytes_written=%d",
+                              layer, operation, operation_metrics.calls, operation_metrics.errors, average_ms,
+                              operation_metrics.books, operation_metrics.bytes_read, operation_metrics.bytes_written)
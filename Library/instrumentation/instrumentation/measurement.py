@@ -0,0 +1,75 @@
+import time
+from collections.abc import Sized
+
+NO_IO = None
+
+
+def count_books(result):
+    if result is None:
+        return 0
+    if hasattr(result, "books"):
+        return len(result.books)
+    if hasattr(result, "created_books"):
+        return len(result.created_books)
+    if isinstance(result, Sized) and not isinstance(result, str):
+        return len(result)
+
+    return 1
+
+
+def read_io(target):
+    io_statistics = getattr(target, "io_statistics", None)
+    if io_statistics is None:
+        return NO_IO
+
+    return (io_statistics.bytes_read, io_statistics.bytes_written, io_statistics.books_scanned)
+
+
+def measure(metrics, layer, operation, target, call, *args):
+    # I/O is attributed by the change in the target's counters, so concurrent
+    # calls on the same target may share each other's bytes and books.
+    io = read_io(target)
+    started = time.perf_counter()
+    result = None
+    error = True
+
+    try:
+        result = call(*args)
+        error = False
+    finally:
+        _record(metrics, layer, operation, target, started, io, error, count_books(result))
+
+    return result
+
+
+def measure_iteration(metrics, layer, operation, target, iterate):
+    io = read_io(target)
+    started = time.perf_counter()
+    books = 0
+    error = True
+
+    try:
+        for book in iterate():
+            books += 1
+            yield book
+        error = False
+    except GeneratorExit:
+        # A consumer that stops early has not failed.
+        error = False
+        raise
+    finally:
+        _record(metrics, layer, operation, target, started, io, error, books)
+
+
+def _record(metrics, layer, operation, target, started, io, error, books_returned):
+    seconds = time.perf_counter() - started
+    current_io = read_io(target)
+
+    # Targets that count the books they scan report those, others the books they returned.
+    if io is NO_IO or current_io is NO_IO:
+        metrics.record(layer, operation, seconds, error=error, books=books_returned)
+        return
+
+    bytes_read, bytes_written, books_scanned = (current - previous for current, previous in zip(current_io, io))
+    metrics.record(layer, operation, seconds, error=error, books=books_scanned, bytes_read=bytes_read,
+                   bytes_written=bytes_written)
@@ -0,0 +1,54 @@
+import bisect
+import threading
+from Library.instrumentation.instrumentation.operationmetrics import LATENCY_BUCKETS, OperationMetrics
+
+
+class MetricsRegistry:
+    def __init__(self, exporters = ()):
+        self.__exporters = list(exporters)
+        self.__operations = {}
+        self.__lock = threading.Lock()
+        self.__export_stopped = None
+
+    def record(self, layer, operation, seconds, error = False, books = 0, bytes_read = 0, bytes_written = 0):
+        with self.__lock:
+            operation_metrics = self.__operations.get((layer, operation))
+            if operation_metrics is None:
+                operation_metrics = self.__operations[(layer, operation)] = OperationMetrics()
+
+            operation_metrics.calls += 1
+            operation_metrics.errors += int(error)
+            operation_metrics.seconds += seconds
+            operation_metrics.bucket_counts[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+            operation_metrics.books += books
+            operation_metrics.bytes_read += bytes_read
+            operation_metrics.bytes_written += bytes_written
+
+    def snapshot(self):
+        with self.__lock:
+            return {key: operation_metrics.copy() for key, operation_metrics in self.__operations.items()}
+
+    def export(self):
+        snapshot = self.snapshot()
+        for exporter in self.__exporters:
+            exporter.export(snapshot)
+
+    def start_exporting(self, interval_seconds):
+        if self.__export_stopped is not None:
+            return
+
+        self.__export_stopped = threading.Event()
+        export_stopped = self.__export_stopped
+
+        def export_periodically():
+            while not export_stopped.wait(interval_seconds):
+                self.export()
+
+        threading.Thread(target=export_periodically, daemon=True).start()
+
+    def stop_exporting(self):
+        if self.__export_stopped is not None:
+            self.__export_stopped.set()
+            self.__export_stopped = None
+
+        self.export()
@@ -0,0 +1,25 @@
+# Upper bounds in seconds, the last bucket of bucket_counts is +Inf.
+LATENCY_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+class OperationMetrics:
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.bucket_counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.books = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+
+    def copy(self):
+        operation_metrics = OperationMetrics()
+        operation_metrics.calls = self.calls
+        operation_metrics.errors = self.errors
+        operation_metrics.seconds = self.seconds
+        operation_metrics.bucket_counts = list(self.bucket_counts)
+        operation_metrics.books = self.books
+        operation_metrics.bytes_read = self.bytes_read
+        operation_metrics.bytes_written = self.bytes_written
+
+        return operation_metrics
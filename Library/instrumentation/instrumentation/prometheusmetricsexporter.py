@@ -0,0 +1,53 @@
+import os
+from Library.instrumentation.instrumentation.imetricsexporter import IMetricsExporter
+from Library.instrumentation.instrumentation.operationmetrics import LATENCY_BUCKETS
+
+COUNTERS = (
+    ("library_operation_calls_total", "Operations called.", "calls"),
+    ("library_operation_errors_total", "Operations that raised.", "errors"),
+    ("library_operation_books_total", "Books scanned by repositories, or returned where no scans are counted.", "books"),
+    ("library_operation_bytes_read_total", "Bytes read from storage.", "bytes_read"),
+    ("library_operation_bytes_written_total", "Bytes written to storage.", "bytes_written"),
+)
+DURATION = "library_operation_duration_seconds"
+
+
+def _labels(layer, operation, **labels):
+    labels = {"layer": layer, "operation": operation, **labels}
+    return "{" + ",".join(f'{name}="{value}"' for name, value in labels.items()) + "}"
+
+
+def to_prometheus_text(snapshot):
+    operations = sorted(snapshot.items())
+    lines = []
+
+    for name, description, attribute in COUNTERS:
+        lines.append(f"# HELP {name} {description}")
+        lines.append(f"# TYPE {name} counter")
+        for (layer, operation), operation_metrics in operations:
+            lines.append(f"{name}{_labels(layer, operation)} {getattr(operation_metrics, attribute)}")
+
+    lines.append(f"# HELP {DURATION} Operation latency.")
+    lines.append(f"# TYPE {DURATION} histogram")
+    for (layer, operation), operation_metrics in operations:
+        count = 0
+        for bound, bucket_count in zip((*LATENCY_BUCKETS, "+Inf"), operation_metrics.bucket_counts):
+            count += bucket_count
+            lines.append(f"{DURATION}_bucket{_labels(layer, operation, le=bound)} {count}")
+        lines.append(f"{DURATION}_sum{_labels(layer, operation)} {operation_metrics.seconds}")
+        lines.append(f"{DURATION}_count{_labels(layer, operation)} {operation_metrics.calls}")
+
+    return "\n".join(lines) + "\n"
+
+
+class PrometheusMetricsExporter(IMetricsExporter):
+    def __init__(self, file_path: str):
+        self.__file_path = file_path
+
+    def export(self, snapshot):
+        # The textfile collector may read at any time, so the file is replaced atomically.
+        temporary_file_path = self.__file_path + ".tmp"
+        with open(temporary_file_path, 'w') as file:
+            file.write(to_prometheus_text(snapshot))
+
+        os.replace(temporary_file_path, self.__file_path)
@@ -0,0 +1,90 @@
+from Library.persistence.persistence.coalescingexecutor import CoalescingExecutor
+from Library.persistence.persistence.iasyncbookrepository import IAsyncBookRepository
+from Library.persistence.persistence.ibookrepository import IBookRepository
+from Library.persistence.persistenceentities.bookentity import BookEntity
+
+class AsyncBookRepository(IAsyncBookRepository):
+    def __init__(self, book_repository: IBookRepository, max_workers: int = 4):
+        self.__book_repository = book_repository
+        self.__executor = CoalescingExecutor(max_workers)
+
+    def close(self):
+        self.__executor.shutdown()
+
+    async def create_book(self, book: BookEntity):
+        return await self.__executor.write(self.__book_repository.create_book, book)
+
+    async def create_books(self, books):
+        return await self.__executor.write(self.__book_repository.create_books, list(books))
+
+    async def import_books(self, books):
+        return await self.__executor.write(self.__book_repository.import_books, list(books))
+
+    async def read_books(self):
+        return await self.__executor.read(("read_books",), self.__book_repository.read_books)
+
+    def iter_books(self):
+        return self.__executor.iterate(self.__book_repository.iter_books)
+
+    async def update_book(self, updated_book: BookEntity):
+        return await self.__executor.write(self.__book_repository.update_book, updated_book)
+
+    async def update_books(self, updated_books):
+        return await self.__executor.write(self.__book_repository.update_books, list(updated_books))
+
+    async def set_taken(self, book_id, is_taken, expected=None):
+        return await self.__executor.write(self.__book_repository.set_taken, book_id, is_taken, expected)
+
+    async def set_taken_many(self, book_ids, is_taken, expected=None):
+        return await self.__executor.write(self.__book_repository.set_taken_many, list(book_ids), is_taken, expected)
+
+    async def get_books(self, cursor, limit, sort):
+        return await self.__executor.read(("get_books", cursor, limit, sort), self.__book_repository.get_books,
+                                          cursor, limit, sort)
+
+    async def get_book_by_id(self, book_id):
+        return await self.__executor.read(("get_book_by_id", book_id), self.__book_repository.get_book_by_id, book_id)
+
+    async def get_books_by_ids(self, book_ids):
+        book_ids = tuple(book_ids)
+        return await self.__executor.read(("get_books_by_ids", book_ids), self.__book_repository.get_books_by_ids,
+                                          book_ids)
+
+    async def read_books_by_title(self, title):
+        return await self.__executor.read(("read_books_by_title", title), self.__book_repository.read_books_by_title,
+                                          title)
+
+    async def read_books_by_author(self, author):
+        return await self.__executor.read(("read_books_by_author", author),
+                                          self.__book_repository.read_books_by_author, author)
+
+    async def read_books_similar_to_title(self, title, limit):
+        return await self.__executor.read(("read_books_similar_to_title", title, limit),
+                                          self.__book_repository.read_books_similar_to_title, title, limit)
+
+    async def read_books_similar_to_author(self, author, limit):
+        return await self.__executor.read(("read_books_similar_to_author", author, limit),
+                                          self.__book_repository.read_books_similar_to_author, author, limit)
+
+    async def read_books_by_year_range(self, start_year, end_year):
+        return await self.__executor.read(("read_books_by_year_range", start_year, end_year),
+                                          self.__book_repository.read_books_by_year_range, start_year, end_year)
+
+    async def read_editions_by_title(self, title):
+        return await self.__executor.read(("read_editions_by_title", title),
+                                          self.__book_repository.read_editions_by_title, title)
+
+    async def read_editions_by_author(self, author):
+        return await self.__executor.read(("read_editions_by_author", author),
+                                          self.__book_repository.read_editions_by_author, author)
+
+    async def read_editions_similar_to_title(self, title, limit):
+        return await self.__executor.read(("read_editions_similar_to_title", title, limit),
+                                          self.__book_repository.read_editions_similar_to_title, title, limit)
+
+    async def read_editions_similar_to_author(self, author, limit):
+        return await self.__executor.read(("read_editions_similar_to_author", author, limit),
+                                          self.__book_repository.read_editions_similar_to_author, author, limit)
+
+    async def query_books(self, predicate):
+        return await self.__executor.run(self.__book_repository.query_books, predicate)
@@ -0,0 +1,96 @@
+import os
+import struct
+
+# The bitmap is bound to the catalog file it patches through that file's
+# mtime, size and inode. A rewrite of the catalog silently invalidates it.
+HEADER = struct.Struct("<qQQ")
+
+
+def bitmap_file_path(file_path):
+    return file_path + ".taken"
+
+
+def file_signature(file_path):
+    try:
+        file_stat = os.stat(file_path)
+    except FileNotFoundError:
+        return None
+
+    return (file_stat.st_mtime_ns, file_stat.st_size, file_stat.st_ino)
+
+
+def read_bitmap(file_path):
+    try:
+        with open(bitmap_file_path(file_path), 'rb') as file:
+            data = file.read()
+    except FileNotFoundError:
+        return None
+
+    if len(data) < HEADER.size or HEADER.unpack_from(data) != file_signature(file_path):
+        return None
+
+    return data[HEADER.size:]
+
+
+def taken_at(bitmap, position):
+    return bool(bitmap[position >> 3] >> (position & 7) & 1)
+
+
+def apply_bitmap(books, bitmap):
+    if bitmap is None:
+        return books
+
+    for position, book in enumerate(books):
+        book.is_taken = taken_at(bitmap, position)
+
+    return books
+
+
+def write_bit(file_path, position, taken, get_taken_flags):
+    return write_bits(file_path, {position: taken}, get_taken_flags)
+
+
+def write_bits(file_path, taken_by_position, get_taken_flags):
+    bitmap_path = bitmap_file_path(file_path)
+    header = HEADER.pack(*file_signature(file_path))
+
+    try:
+        with open(bitmap_path, 'r+b') as file:
+            if file.read(HEADER.size) == header:
+                for position, taken in sorted(taken_by_position.items()):
+                    offset = HEADER.size + (position >> 3)
+                    file.seek(offset)
+                    byte = file.read(1)
+                    byte = byte[0] if byte else 0
+                    byte = byte | (1 << (position & 7)) if taken else byte & ~(1 << (position & 7))
+
+                    file.seek(offset)
+                    file.write(bytes((byte,)))
+
+                return len(taken_by_position)
+    except FileNotFoundError:
+        pass
+
+    # Missing or stale, the bitmap is built once from the current flags.
+    taken_flags = list(get_taken_flags())
+    for position, taken in taken_by_position.items():
+        taken_flags[position] = taken
+    bitmap = bytearray((len(taken_flags) + 7) >> 3)
+    for flag_position, flag in enumerate(taken_flags):
+        if flag:
+            bitmap[flag_position >> 3] |= 1 << (flag_position & 7)
+
+    temporary_file_path = bitmap_path + ".tmp"
+    with open(temporary_file_path, 'wb') as file:
+        file.write(header)
+        file.write(bitmap)
+    os.replace(temporary_file_path, bitmap_path)
+
+    return HEADER.size + len(bitmap)
+
+
+def remove_bitmap(file_path):
+    try:
+        os.remove(bitmap_file_path(file_path))
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,196 @@
+from Library.persistence.persistence.bookcursor import sort_key, to_page
+from Library.persistence.persistence.editionindex import EditionIndex, edition_key
+from Library.persistence.persistence.sortedindex import SortedIndex
+from Library.persistence.persistence.trigramindex import TrigramIndex
+from Library.persistence.persistenceentities.bookentity import BookEntity
+from Library.persistence.persistenceentities.iostatistics import IoStatistics
+
+
+class BookCatalog:
+    def __init__(self, books=(), io_statistics: IoStatistics = None):
+        # Readers count the books they touch, lookups through an index only touch the books they return.
+        self.__io_statistics = io_statistics or IoStatistics()
+        # The catalog owns its entities and hands out copies, so they always match what is indexed.
+        self.__books = {}
+        self.__positions = {}
+        self.__title_index = {}
+        self.__author_index = {}
+        self.__title_search_index = TrigramIndex()
+        self.__author_search_index = TrigramIndex()
+        self.__sorted_indexes = {}
+        self.__edition_index = EditionIndex()
+
+        for book in books:
+            self._add(book)
+
+    def __len__(self):
+        return len(self.__books)
+
+    def __contains__(self, book_id):
+        return book_id in self.__books
+
+    def __iter__(self):
+        return iter(self.__books.values())
+
+    def add(self, book: BookEntity):
+        self._add(book.copy())
+
+    def _add(self, book):
+        previous_book = self.__books.get(book.id)
+        if previous_book is not None:
+            self.__edition_index.remove(previous_book)
+            self._unindex(self.__title_index, self.__title_search_index, previous_book.title, self._year_key(previous_book))
+            self._unindex(self.__author_index, self.__author_search_index, previous_book.author, self._year_key(previous_book))
+            for sort, sorted_index in self.__sorted_indexes.items():
+                sorted_index.remove(sort_key(previous_book, sort))
+
+        self.__books[book.id] = book
+        self.__edition_index.add(book)
+        self.__positions.setdefault(book.id, len(self.__positions))
+        self._index(self.__title_index, self.__title_search_index, book.title, self._year_key(book))
+        self._index(self.__author_index, self.__author_search_index, book.author, self._year_key(book))
+        for sort, sorted_index in self.__sorted_indexes.items():
+            sorted_index.add(sort_key(book, sort))
+
+    def update(self, updated_book: BookEntity):
+        book = self.__books.get(updated_book.id)
+        if book is None:
+            return None
+
+        year_key = self._year_key(book)
+        updated_year_key = self._year_key(updated_book)
+
+        if book.title != updated_book.title or year_key != updated_year_key:
+            self._unindex(self.__title_index, self.__title_search_index, book.title, year_key)
+            self._index(self.__title_index, self.__title_search_index, updated_book.title, updated_year_key)
+
+        if book.author != updated_book.author or year_key != updated_year_key:
+            self._unindex(self.__author_index, self.__author_search_index, book.author, year_key)
+            self._index(self.__author_index, self.__author_search_index, updated_book.author, updated_year_key)
+
+        for sort, sorted_index in self.__sorted_indexes.items():
+            if sort_key(book, sort) != sort_key(updated_book, sort):
+                sorted_index.remove(sort_key(book, sort))
+                sorted_index.add(sort_key(updated_book, sort))
+
+        if edition_key(book) != edition_key(updated_book):
+            self.__edition_index.remove(book)
+            self.__edition_index.add(updated_book)
+        else:
+            self.__edition_index.set_taken(book, updated_book.is_taken)
+
+        self._assign(book, updated_book)
+
+        return book.copy()
+
+    def set_taken(self, book_id, is_taken):
+        book = self.__books.get(book_id)
+        if book is None:
+            return None
+
+        self.__edition_index.set_taken(book, is_taken)
+        book.is_taken = is_taken
+
+        return book.copy()
+
+    def is_taken(self, book_id):
+        return self.__books[book_id].is_taken
+
+    def changeable_ids(self, book_ids, expected):
+        # Each id once, and only while its flag still holds the expected value.
+        return [book_id for book_id in dict.fromkeys(book_ids)
+                if book_id in self.__books and (expected is None or self.__books[book_id].is_taken == expected)]
+
+    def get(self, book_id):
+        book = self.__books.get(book_id)
+        return None if book is None else self._scanned([book.copy()])[0]
+
+    def position(self, book_id):
+        return self.__positions.get(book_id)
+
+    def books(self):
+        return self._scanned([book.copy() for book in self.__books.values()])
+
+    def books_by_title(self, title):
+        return self._scanned([self.__books[book_id].copy() for _, _, book_id in self.__title_index.get(title, ())])
+
+    def books_by_author(self, author):
+        return self._scanned([self.__books[book_id].copy() for _, _, book_id in self.__author_index.get(author, ())])
+
+    def books_by_year_range(self, start_year, end_year):
+        return self._scanned([self.__books[book_id].copy()
+                              for _, book_id in self._sorted_index("publication_year").between(start_year, end_year)])
+
+    def query(self, predicate):
+        self.__io_statistics.books_scanned += len(self.__books)
+
+        return [book.copy() for book in self.__books.values() if predicate.matches(book)]
+
+    def page(self, after_key, limit, sort):
+        keys = self._sorted_index(sort).after(after_key, limit + 1)
+
+        self.__io_statistics.books_scanned += len(keys)
+
+        return to_page([(key, self.__books[key[1]].copy()) for key in keys], limit, sort)
+
+    def books_similar_to_title(self, title, limit):
+        return self._books_similar_to(self.__title_index, self.__title_search_index, title, limit)
+
+    def books_similar_to_author(self, author, limit):
+        return self._books_similar_to(self.__author_index, self.__author_search_index, author, limit)
+
+    def editions_by_title(self, title):
+        return self.__edition_index.editions_by_title(title)
+
+    def editions_by_author(self, author):
+        return self.__edition_index.editions_by_author(author)
+
+    def editions_similar_to_title(self, title, limit):
+        return self.__edition_index.editions_by_titles(self.__title_search_index.search(title, limit))
+
+    def editions_similar_to_author(self, author, limit):
+        return self.__edition_index.editions_by_authors(self.__author_search_index.search(author, limit))
+
+    def _assign(self, book, updated_book):
+        book.title = updated_book.title
+        book.author = updated_book.author
+        book.publication_year = updated_book.publication_year
+        book.is_taken = updated_book.is_taken
+
+    def _books_similar_to(self, index, search_index, query, limit):
+        return self._scanned([self.__books[book_id].copy()
+                              for key in search_index.search(query, limit) for _, _, book_id in index[key]])
+
+    def _scanned(self, books):
+        self.__io_statistics.books_scanned += len(books)
+        return books
+
+    def _sorted_index(self, sort):
+        sorted_index = self.__sorted_indexes.get(sort)
+        if sorted_index is None:
+            sorted_index = self.__sorted_indexes[sort] = SortedIndex(
+                sort_key(book, sort) for book in self.__books.values())
+
+        return sorted_index
+
+    def _year_key(self, book):
+        # Copies of one year keep their insertion order.
+        return (book.publication_year, self.__positions[book.id], book.id)
+
+    def _index(self, index, search_index, key, year_key):
+        year_keys = index.get(key)
+        if year_keys is None:
+            year_keys = index[key] = SortedIndex()
+            search_index.add(key)
+
+        year_keys.add(year_key)
+
+    def _unindex(self, index, search_index, key, year_key):
+        year_keys = index.get(key)
+        if year_keys is None:
+            return
+
+        year_keys.remove(year_key)
+        if not year_keys:
+            del index[key]
+            search_index.remove(key)
@@ -0,0 +1,142 @@
+import os
+import json
+import pickle
+from Library.persistence.persistence.availabilitybitmap import apply_bitmap, read_bitmap, remove_bitmap
+from Library.persistence.persistence.ibookcodec import IBookCodec
+from Library.persistence.persistence.repositoryexception import RepositoryException
+from Library.persistence.persistenceentities.bookentity import BookEntity
+from Library.persistence.persistenceentities.repositoryexceptions import RepositoryExceptions
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+JSON_CODEC = "json"
+COMPACT_JSON_CODEC = "compact_json"
+JSON_LINES_CODEC = "jsonl"
+MSGPACK_CODEC = "msgpack"
+PICKLE_CODEC = "pickle"
+
+PICKLE_PROTOCOL = 5
+_JSON_WHITESPACE = b" \t\r\n"
+
+
+def _to_row(book):
+    return (book.title, book.author, book.publication_year, book.id, book.is_taken)
+
+
+def _first_byte(data):
+    stripped_data = data.lstrip(_JSON_WHITESPACE)
+    return stripped_data[:1]
+
+
+class JsonBookCodec(IBookCodec):
+    def __init__(self, indent = 2):
+        self.__indent = indent
+
+    def encode(self, books):
+        if self.__indent is None:
+            text = json.dumps([book.to_dict() for book in books], separators=(",", ":"))
+        else:
+            text = json.dumps([book.to_dict() for book in books], indent=self.__indent)
+
+        return text.encode("utf-8")
+
+    def decode(self, data):
+        return [BookEntity.from_dict(book_dict) for book_dict in json.loads(data)]
+
+    def detect(self, data):
+        return _first_byte(data) == b"["
+
+
+class JsonLinesBookCodec(IBookCodec):
+    def encode(self, books):
+        return "".join(json.dumps(book.to_dict(), separators=(",", ":")) + "\n" for book in books).encode("utf-8")
+
+    def decode(self, data):
+        return [BookEntity.from_dict(json.loads(line)) for line in data.splitlines() if line.strip()]
+
+    def detect(self, data):
+        return _first_byte(data) == b"{"
+
+
+class PickleBookCodec(IBookCodec):
+    # Rows instead of entities keep the pickle free of class references.
+    # Pickle runs code while loading, only files this library wrote belong here.
+    def encode(self, books):
+        return pickle.dumps([_to_row(book) for book in books], protocol=PICKLE_PROTOCOL)
+
+    def decode(self, data):
+        return [BookEntity(*row) for row in pickle.loads(data)]
+
+    def detect(self, data):
+        return data[:2] == bytes((0x80, PICKLE_PROTOCOL))
+
+
+class MsgpackBookCodec(IBookCodec):
+    def encode(self, books):
+        return msgpack.packb([_to_row(book) for book in books], use_bin_type=True)
+
+    def decode(self, data):
+        return [BookEntity(*row) for row in msgpack.unpackb(data, raw=False)]
+
+    def detect(self, data):
+        # A top level array: fixarray, array 16 or array 32.
+        return bool(data) and (0x90 <= data[0] <= 0x9f or data[0] in (0xdc, 0xdd))
+
+
+CODECS = {
+    JSON_CODEC: JsonBookCodec(),
+    COMPACT_JSON_CODEC: JsonBookCodec(indent=None),
+    JSON_LINES_CODEC: JsonLinesBookCodec(),
+    PICKLE_CODEC: PickleBookCodec(),
+}
+if msgpack is not None:
+    CODECS[MSGPACK_CODEC] = MsgpackBookCodec()
+
+
+def get_codec(codec_name):
+    codec = CODECS.get(codec_name)
+    if codec is None:
+        raise ValueError(f"Unknown or unavailable book codec: {codec_name}")
+
+    return codec
+
+
+def detect_codec(data):
+    for codec in CODECS.values():
+        if codec.detect(data):
+            return codec
+
+    raise RepositoryException(RepositoryExceptions.ERROR_READING_FILE)
+
+
+def decode_books(data):
+    if not data.strip(_JSON_WHITESPACE):
+        return []
+
+    return detect_codec(data).decode(data)
+
+
+def read_book_file(file_path):
+    with open(file_path, 'rb') as file:
+        books = decode_books(file.read())
+
+    return apply_bitmap(books, read_bitmap(file_path))
+
+
+def convert_book_file(source_file_path, target_file_path, codec_name):
+    try:
+        books = read_book_file(source_file_path)
+        data = get_codec(codec_name).encode(books)
+
+        temporary_file_path = target_file_path + ".tmp"
+        with open(temporary_file_path, 'wb') as file:
+            file.write(data)
+        os.replace(temporary_file_path, target_file_path)
+        remove_bitmap(target_file_path)
+
+        return len(books)
+    except Exception:
+        raise RepositoryException(RepositoryExceptions.ERROR_MIGRATING_FILE)
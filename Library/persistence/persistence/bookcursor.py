@@ -0,0 +1,59 @@
+import json
+import uuid
+import base64
+from Library.persistence.persistence.repositoryexception import RepositoryException
+from Library.persistence.persistenceentities.bookpage import BookPage
+from Library.persistence.persistenceentities.repositoryexceptions import RepositoryExceptions
+
+SORT_FIELDS = ("id", "title", "author", "publication_year")
+
+
+def sort_key(book, sort):
+    return (getattr(book, sort), book.id)
+
+
+def encode_cursor(sort, key):
+    return base64.urlsafe_b64encode(json.dumps([sort, *key]).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor, sort):
+    if sort not in SORT_FIELDS:
+        raise RepositoryException(RepositoryExceptions.INVALID_SORT)
+
+    if cursor is None:
+        return None
+
+    try:
+        cursor_sort, value, book_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except Exception:
+        raise RepositoryException(RepositoryExceptions.INVALID_CURSOR)
+
+    if cursor_sort != sort or not _is_book_id(book_id) or not _is_sort_value(value, sort):
+        raise RepositoryException(RepositoryExceptions.INVALID_CURSOR)
+
+    return (value, book_id)
+
+
+def _is_book_id(value):
+    try:
+        return isinstance(value, str) and str(uuid.UUID(value)) == value.lower()
+    except ValueError:
+        return False
+
+
+def _is_sort_value(value, sort):
+    if sort == "publication_year":
+        return isinstance(value, int) and not isinstance(value, bool)
+    if sort == "id":
+        return _is_book_id(value)
+
+    return isinstance(value, str)
+
+
+def to_page(keyed_books, limit, sort):
+    # Callers fetch one extra row, its presence tells whether a next page exists.
+    books = [book for _, book in keyed_books[:limit]]
+    next_cursor = encode_cursor(sort, keyed_books[limit - 1][0]) if len(keyed_books) > limit else None
+
+    return BookPage(books, next_cursor)
+
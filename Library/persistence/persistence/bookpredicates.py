@@ -0,0 +1,140 @@
+import operator
+from abc import ABC, abstractmethod
+
+TEXT_FIELDS = ("title", "author")
+VALUE_FIELDS = ("publication_year", "is_taken")
+
+OPERATORS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+
+def field(name):
+    if name not in TEXT_FIELDS + VALUE_FIELDS:
+        raise ValueError(f"Books can only be queried by {', '.join(TEXT_FIELDS + VALUE_FIELDS)}")
+
+    return BookField(name)
+
+
+class Predicate(ABC):
+    @abstractmethod
+    def matches(self, book):
+        pass
+
+    @abstractmethod
+    def mask(self, columns):
+        pass
+
+    def __and__(self, other):
+        return AndPredicate(self, other)
+
+    def __or__(self, other):
+        return OrPredicate(self, other)
+
+    def __invert__(self):
+        return NotPredicate(self)
+
+
+class BookField:
+    def __init__(self, name):
+        self.name = name
+
+    def __eq__(self, value):
+        return Comparison(self.name, "==", value)
+
+    def __ne__(self, value):
+        return Comparison(self.name, "!=", value)
+
+    def __lt__(self, value):
+        return Comparison(self.name, "<", value)
+
+    def __le__(self, value):
+        return Comparison(self.name, "<=", value)
+
+    def __gt__(self, value):
+        return Comparison(self.name, ">", value)
+
+    def __ge__(self, value):
+        return Comparison(self.name, ">=", value)
+
+    def isin(self, values):
+        return Membership(self.name, frozenset(values))
+
+    __hash__ = None
+
+
+class Comparison(Predicate):
+    def __init__(self, name, comparison, value):
+        self.name = name
+        self.comparison = comparison
+        self.value = value
+
+    def matches(self, book):
+        return OPERATORS[self.comparison](getattr(book, self.name), self.value)
+
+    def mask(self, columns):
+        if self.name not in TEXT_FIELDS:
+            return OPERATORS[self.comparison](columns.values(self.name), self.value)
+
+        # Equality is answered from the dictionary, other comparisons test each distinct text once.
+        if self.comparison == "==":
+            return columns.text_in_mask(self.name, (self.value,))
+        if self.comparison == "!=":
+            return ~columns.text_in_mask(self.name, (self.value,))
+
+        return columns.text_mask(self.name, lambda text: OPERATORS[self.comparison](text, self.value))
+
+
+class Membership(Predicate):
+    def __init__(self, name, values):
+        self.name = name
+        self.values = values
+
+    def matches(self, book):
+        return getattr(book, self.name) in self.values
+
+    def mask(self, columns):
+        if self.name in TEXT_FIELDS:
+            return columns.text_in_mask(self.name, self.values)
+
+        return columns.value_mask(self.name, self.values)
+
+
+class AndPredicate(Predicate):
+    def __init__(self, left, right):
+        self.left = left
+        self.right = right
+
+    def matches(self, book):
+        return self.left.matches(book) and self.right.matches(book)
+
+    def mask(self, columns):
+        return self.left.mask(columns) & self.right.mask(columns)
+
+
+class OrPredicate(Predicate):
+    def __init__(self, left, right):
+        self.left = left
+        self.right = right
+
+    def matches(self, book):
+        return self.left.matches(book) or self.right.matches(book)
+
+    def mask(self, columns):
+        return self.left.mask(columns) | self.right.mask(columns)
+
+
+class NotPredicate(Predicate):
+    def __init__(self, predicate):
+        self.predicate = predicate
+
+    def matches(self, book):
+        return not self.predicate.matches(book)
+
+    def mask(self, columns):
+        return ~self.predicate.mask(columns)
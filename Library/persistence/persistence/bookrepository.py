@@ -1,58 +1,427 @@
 import os
-import json
+import time
 import uuid
+import queue
+import threading
+from concurrent.futures import Future
+from Library.persistence.persistence.availabilitybitmap import apply_bitmap, bitmap_file_path, file_signature, read_bitmap, remove_bitmap, \
+    write_bit, write_bits
+from Library.persistence.persistence.bookcatalog import BookCatalog
+from Library.persistence.persistence.bookcodecs import JSON_CODEC, decode_books, get_codec
+from Library.persistence.persistence.bookcursor import decode_cursor
 from Library.persistence.persistence.ibookrepository import IBookRepository
+from Library.persistence.persistence.readwritelock import ReadWriteLock
 from Library.persistence.persistence.repositoryexception import RepositoryException
 from Library.persistence.persistenceentities.bookentity import BookEntity
+from Library.persistence.persistenceentities.cachestatistics import CacheStatistics
+from Library.persistence.persistenceentities.iostatistics import IoStatistics
+from Library.persistence.persistenceentities.repositoryexceptions import RepositoryExceptions
+
+COMMIT_WINDOW = 0.002
+MAXIMUM_BATCH_SIZE = 256
+
+
+def _fsync_directory(file_path):
+    # The rename only reaches the disk once the directory entry does.
+    directory = os.open(os.path.dirname(os.path.abspath(file_path)), os.O_RDONLY)
+    try:
+        os.fsync(directory)
+    finally:
+        os.close(directory)
+
 
 class BookRepository(IBookRepository):
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, group_commit: bool = False, commit_window: float = COMMIT_WINDOW,
+                 maximum_batch_size: int = MAXIMUM_BATCH_SIZE, codec: str = JSON_CODEC):
         self.__file_path = file_path
+        self.__codec = get_codec(codec)
+        self.__catalog = None
+        self.__file_signature = None
+        self.__cache_statistics = CacheStatistics()
+        self.__io_statistics = IoStatistics()
+        self.__write_generation = 0
+        self.__lock = ReadWriteLock()
+        self.__load_lock = threading.Lock()
+        self.__group_commit = group_commit
+        self.__commit_window = commit_window
+        self.__maximum_batch_size = maximum_batch_size
+        self.__pending_writes = queue.Queue()
+        self.__flusher = None
+        self.__flusher_lock = threading.Lock()
+
+    @property
+    def cache_statistics(self):
+        return self.__cache_statistics
+
+    @property
+    def io_statistics(self):
+        return self.__io_statistics
+
+    @property
+    def write_generation(self):
+        # The file signature also moves when another process rewrites the file.
+        return (self.__write_generation, self._get_file_signature())
 
     def create_book(self, book: BookEntity):
         try:
-            existing_books = []
-            if os.path.exists(self.__file_path):
-                existing_books = self.read_books() or []
-
             book.id = str(uuid.uuid4())
-            existing_books.append(book)
-
-            with open(self.__file_path, 'w') as file:
-                json.dump([book.to_dict() for book in existing_books], file, indent=2)
+            self._commit(lambda catalog: catalog.add(book))
             
             return book
         except Exception:
-            raise RepositoryException(RepositoryException.ERROR_CREATING_BOOK)
+            raise RepositoryException(RepositoryExceptions.ERROR_CREATING_BOOK)
+
+    def create_books(self, books):
+        books = list(books)
+
+        for book in books:
+            book.id = str(uuid.uuid4())
+
+        return self.import_books(books)
+
+    def import_books(self, books):
+        books = list(books)
+
+        def add_books(catalog):
+            for book in books:
+                catalog.add(book)
+
+        try:
+            self._commit(add_books)
+
+            return books
+        except Exception:
+            raise RepositoryException(RepositoryExceptions.ERROR_CREATING_BOOK)
 
     def read_books(self):
         try:
-            if os.path.exists(self.__file_path):
-                with open(self.__file_path, 'r') as file:
-                    books_list = json.load(file)
-                    return [BookEntity.from_dict(book_dict) for book_dict in books_list]
-            else:
-                return []
+            with self.__lock.read():
+                return self._load_catalog().books()
 
         except FileNotFoundError:
-            raise RepositoryException(RepositoryException.FILE_NOT_FOUND)
+            raise RepositoryException(RepositoryExceptions.FILE_NOT_FOUND)
         except Exception:
-            raise RepositoryException(RepositoryException.ERROR_READING_FILE)
+            raise RepositoryException(RepositoryExceptions.ERROR_READING_FILE)
 
-    def update_book(self, updated_book: BookEntity):
+    def iter_books(self):
+        return iter(self.read_books())
+
+    def get_books(self, cursor, limit, sort):
+        after_key = decode_cursor(cursor, sort)
+
+        try:
+            with self.__lock.read():
+                return self._load_catalog().page(after_key, limit, sort)
+
+        except FileNotFoundError:
+            raise RepositoryException(RepositoryExceptions.FILE_NOT_FOUND)
+        except Exception:
+            raise RepositoryException(RepositoryExceptions.ERROR_READING_FILE)
+
+    def get_book_by_id(self, book_id):
         try:
-            existing_books = self.read_books() or []
+            with self.__lock.read():
+                return self._load_catalog().get(book_id)
+
+        except FileNotFoundError:
+            raise RepositoryException(RepositoryExceptions.FILE_NOT_FOUND)
+        except Exception:
+            raise RepositoryException(RepositoryExceptions.ERROR_READING_FILE)
 
-            for book in existing_books:
-                if book.id == updated_book.id:
-                    book.title = updated_book.title
-                    book.author = updated_book.author
-                    book.publication_year = updated_book.publication_year
-                    book.is_taken = updated_book.is_taken
+    def get_books_by_ids(self, book_ids):
+        try:
+            with self.__lock.read():
+                catalog = self._load_catalog()
+                return [catalog.get(book_id) for book_id in book_ids]
 
-            with open(self.__file_path, 'w') as file:
-                json.dump([book.to_dict() for book in existing_books], file, indent=2)
+        except FileNotFoundError:
+            raise RepositoryException(RepositoryExceptions.FILE_NOT_FOUND)
+        except Exception:
+            raise RepositoryException(RepositoryExceptions.ERROR_READING_FILE)
+
+    def read_books_by_title(self, title):
+        try:
+            with self.__lock.read():
+                return self._load_catalog().books_by_title(title)
+
+        except FileNotFoundError:
+            raise RepositoryException(RepositoryExceptions.FILE_NOT_FOUND)
+        except Exception:
+            raise RepositoryException(RepositoryExceptions.ERROR_READING_FILE)
+
+    def read_books_by_author(self, author):
+        try:
+            with self.__lock.read():
+                return self._load_catalog().books_by_author(author)
+
+        except FileNotFoundError:
+            raise RepositoryException(RepositoryExceptions.FILE_NOT_FOUND)
+        except Exception:
+            raise RepositoryException(RepositoryExceptions.ERROR_READING_FILE)
+
+    def read_books_similar_to_title(self, title, limit):
+        try:
+            with self.__lock.read():
+                return self._load_catalog().books_similar_to_title(title, limit)
+
+        except FileNotFoundError:
+            raise RepositoryException(RepositoryExceptions.FILE_NOT_FOUND)
+        except Exception:
+            raise RepositoryException(RepositoryExceptions.ERROR_READING_FILE)
+
+    def read_books_similar_to_author(self, author, limit):
+        try:
+            with self.__lock.read():
+                return self._load_catalog().books_similar_to_author(author, limit)
+
+        except FileNotFoundError:
+            raise RepositoryException(RepositoryExceptions.FILE_NOT_FOUND)
+        except Exception:
+            raise RepositoryException(RepositoryExceptions.ERROR_READING_FILE)
+
+    def read_books_by_year_range(self, start_year, end_year):
+        try:
+            with self.__lock.read():
+                return self._load_catalog().books_by_year_range(start_year, end_year)
+
+        except FileNotFoundError:
+            raise RepositoryException(RepositoryExceptions.FILE_NOT_FOUND)
+        except Exception:
+            raise RepositoryException(RepositoryExceptions.ERROR_READING_FILE)
+
+    def read_editions_by_title(self, title):
+        try:
+            with self.__lock.read():
+                return self._load_catalog().editions_by_title(title)
+
+        except FileNotFoundError:
+            raise RepositoryException(RepositoryExceptions.FILE_NOT_FOUND)
+        except Exception:
+            raise RepositoryException(RepositoryExceptions.ERROR_READING_FILE)
+
+    def read_editions_by_author(self, author):
+        try:
+            with self.__lock.read():
+                return self._load_catalog().editions_by_author(author)
+
+        except FileNotFoundError:
+            raise RepositoryException(RepositoryExceptions.FILE_NOT_FOUND)
+        except Exception:
+            raise RepositoryException(RepositoryExceptions.ERROR_READING_FILE)
+
+    def read_editions_similar_to_title(self, title, limit):
+        try:
+            with self.__lock.read():
+                return self._load_catalog().editions_similar_to_title(title, limit)
+
+        except FileNotFoundError:
+            raise RepositoryException(RepositoryExceptions.FILE_NOT_FOUND)
+        except Exception:
+            raise RepositoryException(RepositoryExceptions.ERROR_READING_FILE)
+
+    def read_editions_similar_to_author(self, author, limit):
+        try:
+            with self.__lock.read():
+                return self._load_catalog().editions_similar_to_author(author, limit)
+
+        except FileNotFoundError:
+            raise RepositoryException(RepositoryExceptions.FILE_NOT_FOUND)
+        except Exception:
+            raise RepositoryException(RepositoryExceptions.ERROR_READING_FILE)
+
+    def query_books(self, predicate):
+        try:
+            with self.__lock.read():
+                return self._load_catalog().query(predicate)
+
+        except FileNotFoundError:
+            raise RepositoryException(RepositoryExceptions.FILE_NOT_FOUND)
+        except Exception:
+            raise RepositoryException(RepositoryExceptions.ERROR_READING_FILE)
+
+    def update_book(self, updated_book: BookEntity):
+        try:
+            self._commit(lambda catalog: catalog.update(updated_book))
 
             return updated_book
-        except Exception as e:
-            raise RepositoryException(RepositoryException.ERROR_UPDATING_BOOK)
+        except Exception:
+            raise RepositoryException(RepositoryExceptions.ERROR_UPDATING_BOOK)
+
+    def update_books(self, updated_books):
+        updated_books = list(updated_books)
+
+        def update_books(catalog):
+            for updated_book in updated_books:
+                catalog.update(updated_book)
+
+        try:
+            self._commit(update_books)
+
+            return updated_books
+        except Exception:
+            raise RepositoryException(RepositoryExceptions.ERROR_UPDATING_BOOK)
+
+    def set_taken(self, book_id, is_taken, expected=None):
+        try:
+            with self.__lock.write():
+                catalog = self._load_catalog()
+                if book_id not in catalog or (expected is not None and catalog.is_taken(book_id) != expected):
+                    return None
+
+                # Only the book's bit in the availability bitmap is written, never the catalog.
+                self.__io_statistics.bytes_written += write_bit(
+                    self.__file_path, catalog.position(book_id), is_taken,
+                    lambda: (catalog_book.is_taken for catalog_book in catalog))
+                book = catalog.set_taken(book_id, is_taken)
+                self.__file_signature = self._get_file_signature()
+                self.__write_generation += 1
+
+                return book
+        except Exception:
+            self.__catalog = None
+            raise RepositoryException(RepositoryExceptions.ERROR_UPDATING_BOOK)
+
+    def set_taken_many(self, book_ids, is_taken, expected=None):
+        try:
+            with self.__lock.write():
+                catalog = self._load_catalog()
+                changed_ids = catalog.changeable_ids(book_ids, expected)
+                if not changed_ids:
+                    return []
+
+                self.__io_statistics.bytes_written += write_bits(
+                    self.__file_path, {catalog.position(book_id): is_taken for book_id in changed_ids},
+                    lambda: (catalog_book.is_taken for catalog_book in catalog))
+                for book_id in changed_ids:
+                    catalog.set_taken(book_id, is_taken)
+                self.__file_signature = self._get_file_signature()
+                self.__write_generation += 1
+
+                return changed_ids
+        except Exception:
+            self.__catalog = None
+            raise RepositoryException(RepositoryExceptions.ERROR_UPDATING_BOOK)
+
+    def close(self):
+        with self.__flusher_lock:
+            if self.__flusher is not None:
+                self.__pending_writes.put(None)
+                self.__flusher.join()
+                self.__flusher = None
+
+    def _commit(self, mutate):
+        if not self.__group_commit:
+            return self._commit_batch([(mutate, None)])
+
+        future = Future()
+        with self.__flusher_lock:
+            if self.__flusher is None:
+                self.__flusher = threading.Thread(target=self._flush_pending_writes, daemon=True)
+                self.__flusher.start()
+            self.__pending_writes.put((mutate, future))
+
+        return future.result()
+
+    def _flush_pending_writes(self):
+        while True:
+            pending_write = self.__pending_writes.get()
+            if pending_write is None:
+                return
+
+            batch = [pending_write]
+            deadline = time.monotonic() + self.__commit_window
+            while len(batch) < self.__maximum_batch_size:
+                try:
+                    pending_write = self.__pending_writes.get(timeout=max(0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+
+                if pending_write is None:
+                    self._commit_batch(batch)
+                    return
+                batch.append(pending_write)
+
+            self._commit_batch(batch)
+
+    def _commit_batch(self, batch):
+        # A failing mutation is dropped from the batch and the others are retried
+        # on a freshly loaded catalog, so one bad write cannot fail its neighbours.
+        while batch:
+            failed_index = None
+
+            try:
+                with self.__lock.write():
+                    catalog = self._load_catalog()
+                    for failed_index, (mutate, _) in enumerate(batch):
+                        mutate(catalog)
+                    failed_index = None
+                    self._write_books(catalog)
+                    self.__write_generation += 1
+            except Exception as e:
+                self.__catalog = None
+                failed_batch = batch if failed_index is None else [batch.pop(failed_index)]
+                for _, future in failed_batch:
+                    if future is None:
+                        raise
+                    future.set_exception(e)
+                if failed_index is None:
+                    return
+                continue
+
+            for _, future in batch:
+                if future is not None:
+                    future.set_result(None)
+            return
+
+    def _load_catalog(self):
+        # Readers share the read lock, so only one of them may reload the catalog.
+        with self.__load_lock:
+            file_signature = self._get_file_signature()
+
+            if self.__catalog is not None and file_signature == self.__file_signature:
+                self.__cache_statistics.hits += 1
+                return self.__catalog
+
+            self.__cache_statistics.misses += 1
+            books = []
+            if file_signature is not None:
+                # Files keep whatever format they were written in until the next write.
+                with open(self.__file_path, 'rb') as file:
+                    data = file.read()
+                bitmap = read_bitmap(self.__file_path)
+                books = apply_bitmap(decode_books(data), bitmap)
+                self.__io_statistics.bytes_read += len(data) + len(bitmap or b"")
+                self.__io_statistics.books_scanned += len(books)
+
+            self.__catalog = BookCatalog(books, self.__io_statistics)
+            self.__file_signature = file_signature
+
+            return self.__catalog
+
+    def _write_books(self, catalog: BookCatalog):
+        data = self.__codec.encode(catalog)
+        # The catalog is replaced whole, so a crash mid-write leaves the previous file intact.
+        temporary_file_path = self.__file_path + ".tmp"
+
+        with open(temporary_file_path, 'wb') as file:
+            file.write(data)
+            if self.__group_commit:
+                # Callers are only released once their batch has reached the disk.
+                file.flush()
+                os.fsync(file.fileno())
+
+        os.replace(temporary_file_path, self.__file_path)
+        if self.__group_commit:
+            _fsync_directory(self.__file_path)
+
+        # The rewritten catalog holds every flag, the bitmap would only be stale.
+        remove_bitmap(self.__file_path)
+        self.__file_signature = self._get_file_signature()
+        self.__io_statistics.bytes_written += len(data)
+
+    def _get_file_signature(self):
+        catalog_signature = file_signature(self.__file_path)
+        if catalog_signature is None:
+            return None
+
+        return (catalog_signature, file_signature(bitmap_file_path(self.__file_path)))
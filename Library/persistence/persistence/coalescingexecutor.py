@@ -0,0 +1,99 @@
+import copy
+import asyncio
+import itertools
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+
+BATCH_SIZE = 1000
+
+
+def _iterate(iterator_function):
+    return iter(iterator_function())
+
+
+def _close(iterator):
+    close = getattr(iterator, "close", None)
+    if close is not None:
+        close()
+
+
+def _next_batch(iterator, batch_size):
+    return list(itertools.islice(iterator, batch_size))
+
+
+def _copy_result(result):
+    # Lazy views such as mapped books decode a new entity on every access and cannot be changed.
+    if isinstance(result, Sequence) and not isinstance(result, list):
+        return result
+
+    return copy.deepcopy(result)
+
+
+class _Read:
+    __slots__ = ("future", "callers")
+
+    def __init__(self, future):
+        self.future = future
+        self.callers = 0
+
+
+class CoalescingExecutor:
+    def __init__(self, max_workers: int = 4):
+        self.__executor = ThreadPoolExecutor(max_workers=max_workers)
+        # Iterators may hold thread-bound resources such as SQLite cursors, so each one is pinned to a single thread.
+        self.__iteration_executors = [ThreadPoolExecutor(max_workers=1) for _ in range(max_workers)]
+        self.__next_iteration_executor = itertools.cycle(self.__iteration_executors)
+        self.__reads = {}
+
+    async def run(self, function, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.__executor, function, *args)
+
+    async def read(self, key, function, *args):
+        read = self.__reads.get(key)
+        if read is None or read.future.done():
+            future = asyncio.get_running_loop().run_in_executor(self.__executor, function, *args)
+            read = self.__reads[key] = _Read(future)
+            future.add_done_callback(lambda _: self._forget(key, read))
+        read.callers += 1
+
+        # Shielded so that a cancelled caller does not cancel the shared read.
+        result = await asyncio.shield(read.future)
+
+        # Callers that joined a read each get their own copy, so none of them sees another one's changes.
+        return result if read.callers == 1 else _copy_result(result)
+
+    async def write(self, function, *args):
+        # Reads started before the write may miss it, later callers must not join them.
+        self.__reads.clear()
+        try:
+            return await self.run(function, *args)
+        finally:
+            self.__reads.clear()
+
+    async def iterate(self, iterator_function, batch_size: int = BATCH_SIZE):
+        loop = asyncio.get_running_loop()
+        executor = next(self.__next_iteration_executor)
+        iterator = None
+
+        try:
+            iterator = await loop.run_in_executor(executor, _iterate, iterator_function)
+
+            while True:
+                batch = await loop.run_in_executor(executor, _next_batch, iterator, batch_size)
+                if not batch:
+                    return
+
+                for item in batch:
+                    yield item
+        finally:
+            if iterator is not None:
+                executor.submit(_close, iterator)
+
+    def shutdown(self):
+        self.__executor.shutdown(wait=True)
+        for executor in self.__iteration_executors:
+            executor.shutdown(wait=True)
+
+    def _forget(self, key, read):
+        if self.__reads.get(key) is read:
+            del self.__reads[key]
@@ -0,0 +1,121 @@
+import threading
+from Library.persistence.persistence.columnarcatalog import ColumnarCatalog
+from Library.persistence.persistence.ibookrepository import IBookRepository
+from Library.persistence.persistenceentities.iostatistics import IoStatistics
+
+
+class ColumnarBookRepository(IBookRepository):
+    def __init__(self, book_repository: IBookRepository):
+        self.__book_repository = book_repository
+        self.__lock = threading.Lock()
+        self.__books_scanned = 0
+        # Writes made through other processes or repositories are not seen until the next start.
+        self.__columns = ColumnarCatalog(book_repository.iter_books())
+
+    def __getattr__(self, name):
+        return getattr(self.__book_repository, name)
+
+    @property
+    def io_statistics(self):
+        io_statistics = getattr(self.__book_repository, "io_statistics", None) or IoStatistics()
+
+        return IoStatistics(io_statistics.bytes_read, io_statistics.bytes_written,
+                            io_statistics.books_scanned + self.__books_scanned)
+
+    def create_book(self, book):
+        created_book = self.__book_repository.create_book(book)
+        with self.__lock:
+            self.__columns.add(created_book)
+
+        return created_book
+
+    def create_books(self, books):
+        return self._add_books(self.__book_repository.create_books(books))
+
+    def import_books(self, books):
+        return self._add_books(self.__book_repository.import_books(books))
+
+    def read_books(self):
+        return self.__book_repository.read_books()
+
+    def iter_books(self):
+        return self.__book_repository.iter_books()
+
+    def update_book(self, updated_book):
+        updated_book = self.__book_repository.update_book(updated_book)
+        with self.__lock:
+            self.__columns.update(updated_book)
+
+        return updated_book
+
+    def update_books(self, updated_books):
+        updated_books = self.__book_repository.update_books(updated_books)
+        with self.__lock:
+            for updated_book in updated_books:
+                self.__columns.update(updated_book)
+
+        return updated_books
+
+    def set_taken(self, book_id, is_taken, expected=None):
+        book = self.__book_repository.set_taken(book_id, is_taken, expected)
+        if book is not None:
+            with self.__lock:
+                self.__columns.set_taken(book_id, is_taken)
+
+        return book
+
+    def set_taken_many(self, book_ids, is_taken, expected=None):
+        changed_ids = self.__book_repository.set_taken_many(book_ids, is_taken, expected)
+        with self.__lock:
+            for book_id in changed_ids:
+                self.__columns.set_taken(book_id, is_taken)
+
+        return changed_ids
+
+    def get_books(self, cursor, limit, sort):
+        return self.__book_repository.get_books(cursor, limit, sort)
+
+    def get_book_by_id(self, book_id):
+        return self.__book_repository.get_book_by_id(book_id)
+
+    def get_books_by_ids(self, book_ids):
+        return self.__book_repository.get_books_by_ids(book_ids)
+
+    def read_books_by_title(self, title):
+        return self.__book_repository.read_books_by_title(title)
+
+    def read_books_by_author(self, author):
+        return self.__book_repository.read_books_by_author(author)
+
+    def read_books_similar_to_title(self, title, limit):
+        return self.__book_repository.read_books_similar_to_title(title, limit)
+
+    def read_books_similar_to_author(self, author, limit):
+        return self.__book_repository.read_books_similar_to_author(author, limit)
+
+    def read_books_by_year_range(self, start_year, end_year):
+        return self.__book_repository.read_books_by_year_range(start_year, end_year)
+
+    def read_editions_by_title(self, title):
+        return self.__book_repository.read_editions_by_title(title)
+
+    def read_editions_by_author(self, author):
+        return self.__book_repository.read_editions_by_author(author)
+
+    def read_editions_similar_to_title(self, title, limit):
+        return self.__book_repository.read_editions_similar_to_title(title, limit)
+
+    def read_editions_similar_to_author(self, author, limit):
+        return self.__book_repository.read_editions_similar_to_author(author, limit)
+
+    def query_books(self, predicate):
+        with self.__lock:
+            self.__books_scanned += len(self.__columns)
+            return self.__columns.query(predicate)
+
+    def _add_books(self, books):
+        with self.__lock:
+            for book in books:
+                self.__columns.add(book)
+
+        return books
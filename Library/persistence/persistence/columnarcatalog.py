@@ -0,0 +1,110 @@
+from Library.persistence.persistenceentities.bookentity import BookEntity
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+INITIAL_CAPACITY = 1024
+TEXT_COLUMNS = ("title", "author")
+
+
+def columnar_available():
+    return numpy is not None
+
+
+class ColumnarCatalog:
+    def __init__(self, books=()):
+        if numpy is None:
+            raise ValueError("Columnar queries need NumPy, which is not installed")
+
+        self.__book_ids = []
+        self.__positions = {}
+        # Titles and authors are dictionary encoded: text -> code and code -> text.
+        self.__codes = {name: {} for name in TEXT_COLUMNS}
+        self.__texts = {name: [] for name in TEXT_COLUMNS}
+        self.__columns = {
+            "title": numpy.empty(INITIAL_CAPACITY, dtype=numpy.int32),
+            "author": numpy.empty(INITIAL_CAPACITY, dtype=numpy.int32),
+            "publication_year": numpy.empty(INITIAL_CAPACITY, dtype=numpy.int64),
+            "is_taken": numpy.empty(INITIAL_CAPACITY, dtype=numpy.bool_),
+        }
+
+        for book in books:
+            self.add(book)
+
+    def __len__(self):
+        return len(self.__book_ids)
+
+    def add(self, book: BookEntity):
+        position = self.__positions.get(book.id)
+        if position is None:
+            position = len(self.__book_ids)
+            self._reserve(position + 1)
+            self.__book_ids.append(book.id)
+            self.__positions[book.id] = position
+
+        self._write(position, book)
+
+    def update(self, book: BookEntity):
+        position = self.__positions.get(book.id)
+        if position is not None:
+            self._write(position, book)
+
+    def set_taken(self, book_id, is_taken):
+        position = self.__positions.get(book_id)
+        if position is not None:
+            self.__columns["is_taken"][position] = is_taken
+
+    def query(self, predicate):
+        return [self._read_book(position) for position in numpy.flatnonzero(predicate.mask(self))]
+
+    def values(self, name):
+        return self.__columns[name][:len(self.__book_ids)]
+
+    def value_mask(self, name, values):
+        return numpy.isin(self.values(name), list(values))
+
+    def text_in_mask(self, name, texts):
+        codes = self.__codes[name]
+        return numpy.isin(self.values(name), [codes[text] for text in texts if text in codes])
+
+    def text_mask(self, name, matches):
+        return numpy.isin(self.values(name), [code for text, code in self.__codes[name].items() if matches(text)])
+
+    def _reserve(self, size):
+        capacity = len(self.__columns["is_taken"])
+        if size <= capacity:
+            return
+
+        while capacity < size:
+            capacity *= 2
+
+        for name, column in self.__columns.items():
+            grown_column = numpy.empty(capacity, dtype=column.dtype)
+            grown_column[:len(self.__book_ids)] = column[:len(self.__book_ids)]
+            self.__columns[name] = grown_column
+
+    def _write(self, position, book):
+        for name in TEXT_COLUMNS:
+            self.__columns[name][position] = self._encode(name, getattr(book, name))
+        self.__columns["publication_year"][position] = book.publication_year
+        self.__columns["is_taken"][position] = bool(book.is_taken)
+
+    def _encode(self, name, text):
+        codes = self.__codes[name]
+        code = codes.get(text)
+        if code is None:
+            code = codes[text] = len(self.__texts[name])
+            self.__texts[name].append(text)
+
+        return code
+
+    def _read_book(self, position):
+        return BookEntity(
+            self.__texts["title"][self.__columns["title"][position]],
+            self.__texts["author"][self.__columns["author"][position]],
+            int(self.__columns["publication_year"][position]),
+            self.__book_ids[position],
+            bool(self.__columns["is_taken"][position])
+        )
@@ -0,0 +1,111 @@
+from Library.persistence.persistence.sortedindex import SortedIndex
+from Library.persistence.persistenceentities.editionentity import EditionEntity
+
+
+def edition_key(book):
+    return (book.title, book.author, book.publication_year)
+
+
+def _year_key(key):
+    title, author, publication_year = key
+    return (publication_year, title, author)
+
+
+def _edition_key(year_key):
+    publication_year, title, author = year_key
+    return (title, author, publication_year)
+
+
+def merge_editions(editions):
+    merged_editions = {}
+
+    for edition in editions:
+        key = (edition.title, edition.author, edition.publication_year)
+        merged_edition = merged_editions.get(key)
+        if merged_edition is None:
+            merged_editions[key] = EditionEntity(*key, list(edition.book_ids), edition.taken_count)
+        else:
+            merged_edition.book_ids.extend(edition.book_ids)
+            merged_edition.taken_count += edition.taken_count
+
+    return list(merged_editions.values())
+
+
+class EditionIndex:
+    def __init__(self, books=()):
+        # edition key -> (copy ids in insertion order, ids of the taken copies)
+        self.__editions = {}
+        self.__title_index = {}
+        self.__author_index = {}
+
+        for book in books:
+            self.add(book)
+
+    def __len__(self):
+        return len(self.__editions)
+
+    def add(self, book):
+        key = edition_key(book)
+        edition = self.__editions.get(key)
+        if edition is None:
+            edition = self.__editions[key] = ({}, set())
+            self.__title_index.setdefault(book.title, SortedIndex()).add(_year_key(key))
+            self.__author_index.setdefault(book.author, SortedIndex()).add(_year_key(key))
+
+        book_ids, taken_book_ids = edition
+        book_ids[book.id] = None
+        if book.is_taken:
+            taken_book_ids.add(book.id)
+
+    def remove(self, book):
+        key = edition_key(book)
+        edition = self.__editions.get(key)
+        if edition is None:
+            return
+
+        book_ids, taken_book_ids = edition
+        book_ids.pop(book.id, None)
+        taken_book_ids.discard(book.id)
+        if book_ids:
+            return
+
+        del self.__editions[key]
+        self._unindex(self.__title_index, book.title, key)
+        self._unindex(self.__author_index, book.author, key)
+
+    def set_taken(self, book, is_taken):
+        edition = self.__editions.get(edition_key(book))
+        if edition is None:
+            return
+
+        _, taken_book_ids = edition
+        if is_taken:
+            taken_book_ids.add(book.id)
+        else:
+            taken_book_ids.discard(book.id)
+
+    def get(self, title, author, publication_year):
+        key = (title, author, publication_year)
+        return self._to_edition(key) if key in self.__editions else None
+
+    def editions_by_title(self, title):
+        return [self._to_edition(_edition_key(year_key)) for year_key in self.__title_index.get(title, ())]
+
+    def editions_by_author(self, author):
+        return [self._to_edition(_edition_key(year_key)) for year_key in self.__author_index.get(author, ())]
+
+    def editions_by_titles(self, titles):
+        return [edition for title in titles for edition in self.editions_by_title(title)]
+
+    def editions_by_authors(self, authors):
+        return [edition for author in authors for edition in self.editions_by_author(author)]
+
+    def _to_edition(self, key):
+        book_ids, taken_book_ids = self.__editions[key]
+        return EditionEntity(*key, list(book_ids), len(taken_book_ids))
+
+    def _unindex(self, index, text, key):
+        year_keys = index[text]
+        year_keys.remove(_year_key(key))
+        if not year_keys:
+            del index[text]
@@ -0,0 +1,90 @@
+from abc import ABC, abstractmethod
+
+class IAsyncBookRepository(ABC):
+    @abstractmethod
+    async def create_book(self, book):
+        pass
+
+    @abstractmethod
+    async def create_books(self, books):
+        pass
+
+    @abstractmethod
+    async def import_books(self, books):
+        pass
+    
+    @abstractmethod
+    async def read_books(self):
+        pass
+
+    @abstractmethod
+    def iter_books(self):
+        pass
+
+    @abstractmethod
+    async def update_book(self, updated_book):
+        pass
+
+    @abstractmethod
+    async def update_books(self, updated_books):
+        pass
+
+    @abstractmethod
+    async def set_taken(self, book_id, is_taken, expected=None):
+        pass
+
+    @abstractmethod
+    async def set_taken_many(self, book_ids, is_taken, expected=None):
+        pass
+
+    @abstractmethod
+    async def get_books(self, cursor, limit, sort):
+        pass
+
+    @abstractmethod
+    async def get_book_by_id(self, book_id):
+        pass
+
+    @abstractmethod
+    async def get_books_by_ids(self, book_ids):
+        pass
+
+    @abstractmethod
+    async def read_books_by_title(self, title):
+        pass
+
+    @abstractmethod
+    async def read_books_by_author(self, author):
+        pass
+
+    @abstractmethod
+    async def read_books_similar_to_title(self, title, limit):
+        pass
+
+    @abstractmethod
+    async def read_books_similar_to_author(self, author, limit):
+        pass
+
+    @abstractmethod
+    async def read_books_by_year_range(self, start_year, end_year):
+        pass
+
+    @abstractmethod
+    async def read_editions_by_title(self, title):
+        pass
+
+    @abstractmethod
+    async def read_editions_by_author(self, author):
+        pass
+
+    @abstractmethod
+    async def read_editions_similar_to_title(self, title, limit):
+        pass
+
+    @abstractmethod
+    async def read_editions_similar_to_author(self, author, limit):
+        pass
+
+    @abstractmethod
+    async def query_books(self, predicate):
+        pass
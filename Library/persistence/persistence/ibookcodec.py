@@ -0,0 +1,15 @@
+from abc import ABC, abstractmethod
+
+
+class IBookCodec(ABC):
+    @abstractmethod
+    def encode(self, books):
+        pass
+
+    @abstractmethod
+    def decode(self, data):
+        pass
+
+    @abstractmethod
+    def detect(self, data):
+        pass
@@ -5,10 +5,86 @@ class IBookRepository(ABC):
     def create_book(self):
         pass
     
+    @abstractmethod
+    def create_books(self, books):
+        pass
+
+    @abstractmethod
+    def import_books(self, books):
+        pass
+
     @abstractmethod
     def read_books(self):
         pass
 
+    @abstractmethod
+    def iter_books(self):
+        pass
+
     @abstractmethod
     def update_book(self, updated_book):
+        pass
+
+    @abstractmethod
+    def update_books(self, updated_books):
+        pass
+
+    @abstractmethod
+    def set_taken(self, book_id, is_taken, expected=None):
+        pass
+
+    @abstractmethod
+    def set_taken_many(self, book_ids, is_taken, expected=None):
+        pass
+
+    @abstractmethod
+    def get_books(self, cursor, limit, sort):
+        pass
+
+    @abstractmethod
+    def get_book_by_id(self, book_id):
+        pass
+
+    @abstractmethod
+    def get_books_by_ids(self, book_ids):
+        pass
+
+    @abstractmethod
+    def read_books_by_title(self, title):
+        pass
+
+    @abstractmethod
+    def read_books_by_author(self, author):
+        pass
+
+    @abstractmethod
+    def read_books_similar_to_title(self, title, limit):
+        pass
+
+    @abstractmethod
+    def read_books_similar_to_author(self, author, limit):
+        pass
+
+    @abstractmethod
+    def read_books_by_year_range(self, start_year, end_year):
+        pass
+
+    @abstractmethod
+    def read_editions_by_title(self, title):
+        pass
+
+    @abstractmethod
+    def read_editions_by_author(self, author):
+        pass
+
+    @abstractmethod
+    def read_editions_similar_to_title(self, title, limit):
+        pass
+
+    @abstractmethod
+    def read_editions_similar_to_author(self, author, limit):
+        pass
+
+    @abstractmethod
+    def query_books(self, predicate):
         pass
\ No newline at end of file
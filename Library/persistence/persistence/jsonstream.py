@@ -0,0 +1,72 @@
+import json
+
+CHUNK_SIZE = 64 * 1024
+WHITESPACE = " \t\n\r"
+
+
+def iter_json_array(file, chunk_size: int = CHUNK_SIZE):
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    is_end_of_file = False
+    is_array_started = False
+
+    while True:
+        while position < len(buffer) and buffer[position] in WHITESPACE:
+            position += 1
+
+        if position == len(buffer):
+            if is_end_of_file:
+                raise ValueError("Unexpected end of JSON array")
+
+            buffer, position, is_end_of_file = _read_more(file, buffer, position, chunk_size)
+            continue
+
+        if not is_array_started:
+            if buffer[position] != "[":
+                raise ValueError("JSON array expected")
+
+            is_array_started = True
+            position += 1
+            continue
+
+        if buffer[position] == "]":
+            return
+        if buffer[position] == ",":
+            position += 1
+            continue
+
+        try:
+            value, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            if is_end_of_file:
+                raise
+
+            buffer, position, is_end_of_file = _read_more(file, buffer, position, chunk_size)
+            continue
+
+        # A value touching the end of the buffer may be a truncated number.
+        if end == len(buffer) and not is_end_of_file:
+            buffer, position, is_end_of_file = _read_more(file, buffer, position, chunk_size)
+            continue
+
+        position = end
+        yield value
+
+
+def _read_more(file, buffer, position, chunk_size):
+    chunk = file.read(chunk_size)
+
+    return buffer[position:] + chunk, 0, not chunk
+
+
+def write_json_array(file, values):
+    is_empty = True
+    file.write("[")
+
+    for value in values:
+        file.write("\n  " if is_empty else ",\n  ")
+        file.write(json.dumps(value, indent=2).replace("\n", "\n  "))
+        is_empty = False
+
+    file.write("]" if is_empty else "\n]")
@@ -0,0 +1,333 @@
+import os
+import json
+import uuid
+import threading
+from Library.persistence.persistence.bookcatalog import BookCatalog
+from Library.persistence.persistence.bookcodecs import read_book_file
+from Library.persistence.persistence.bookcursor import decode_cursor
+from Library.persistence.persistence.ibookrepository import IBookRepository
+from Library.persistence.persistence.repositoryexception import RepositoryException
+from Library.persistence.persistenceentities.bookentity import BookEntity
+from Library.persistence.persistenceentities.iostatistics import IoStatistics
+from Library.persistence.persistenceentities.repositoryexceptions import RepositoryExceptions
+
+CREATE_OPERATION = "create"
+UPDATE_OPERATION = "update"
+TAKEN_OPERATION = "taken"
+
+
+def migrate_json_to_log(json_file_path: str, log_file_path: str):
+    try:
+        books = read_book_file(json_file_path)
+        _write_log(log_file_path, [_to_record(CREATE_OPERATION, book.to_dict()) for book in books])
+
+        return len(books)
+    except Exception:
+        raise RepositoryException(RepositoryExceptions.ERROR_MIGRATING_FILE)
+
+
+def _to_record(operation, book_dict):
+    return json.dumps({"op": operation, "book": book_dict}, separators=(",", ":")) + "\n"
+
+
+def _to_taken_record(book_id, is_taken):
+    return json.dumps({"op": TAKEN_OPERATION, "id": book_id, "is_taken": is_taken}, separators=(",", ":")) + "\n"
+
+
+def _write_log(file_path, records):
+    temporary_file_path = file_path + ".tmp"
+
+    with open(temporary_file_path, 'w') as file:
+        file.writelines(records)
+
+    os.replace(temporary_file_path, file_path)
+
+
+class LogBookRepository(IBookRepository):
+    def __init__(self, file_path: str, compaction_threshold: int = 1000, legacy_file_path: str = None):
+        self.__file_path = file_path
+        self.__compaction_threshold = compaction_threshold
+        self.__lock = threading.Lock()
+        self.__compaction_lock = threading.Lock()
+        self.__io_statistics = IoStatistics()
+        self.__catalog = BookCatalog(io_statistics=self.__io_statistics)
+        self.__record_count = 0
+        self.__compaction = None
+        self.__pending_records = None
+        self.__write_generation = 0
+
+        if legacy_file_path and not os.path.exists(file_path) and os.path.exists(legacy_file_path):
+            migrate_json_to_log(legacy_file_path, file_path)
+
+        self._load()
+
+    @property
+    def io_statistics(self):
+        return self.__io_statistics
+
+    @property
+    def write_generation(self):
+        return self.__write_generation
+
+    def create_book(self, book: BookEntity):
+        try:
+            with self.__lock:
+                book.id = str(uuid.uuid4())
+                self._append(_to_record(CREATE_OPERATION, book.to_dict()))
+                self.__catalog.add(book)
+                self.__write_generation += 1
+
+            self._compact_if_needed()
+
+            return book
+        except Exception:
+            raise RepositoryException(RepositoryExceptions.ERROR_CREATING_BOOK)
+
+    def create_books(self, books):
+        books = list(books)
+
+        for book in books:
+            book.id = str(uuid.uuid4())
+
+        return self.import_books(books)
+
+    def import_books(self, books):
+        books = list(books)
+
+        try:
+            with self.__lock:
+                self._append(*[_to_record(CREATE_OPERATION, book.to_dict()) for book in books])
+                for book in books:
+                    self.__catalog.add(book)
+                self.__write_generation += 1
+
+            self._compact_if_needed()
+
+            return books
+        except Exception:
+            raise RepositoryException(RepositoryExceptions.ERROR_CREATING_BOOK)
+
+    def read_books(self):
+        with self.__lock:
+            return self.__catalog.books()
+
+    def iter_books(self):
+        return iter(self.read_books())
+
+    def get_books(self, cursor, limit, sort):
+        after_key = decode_cursor(cursor, sort)
+
+        with self.__lock:
+            return self.__catalog.page(after_key, limit, sort)
+
+    def get_book_by_id(self, book_id):
+        with self.__lock:
+            return self.__catalog.get(book_id)
+
+    def get_books_by_ids(self, book_ids):
+        with self.__lock:
+            return [self.__catalog.get(book_id) for book_id in book_ids]
+
+    def read_books_by_title(self, title):
+        with self.__lock:
+            return self.__catalog.books_by_title(title)
+
+    def read_books_by_author(self, author):
+        with self.__lock:
+            return self.__catalog.books_by_author(author)
+
+    def read_books_similar_to_title(self, title, limit):
+        with self.__lock:
+            return self.__catalog.books_similar_to_title(title, limit)
+
+    def read_books_similar_to_author(self, author, limit):
+        with self.__lock:
+            return self.__catalog.books_similar_to_author(author, limit)
+
+    def read_books_by_year_range(self, start_year, end_year):
+        with self.__lock:
+            return self.__catalog.books_by_year_range(start_year, end_year)
+
+    def read_editions_by_title(self, title):
+        with self.__lock:
+            return self.__catalog.editions_by_title(title)
+
+    def read_editions_by_author(self, author):
+        with self.__lock:
+            return self.__catalog.editions_by_author(author)
+
+    def read_editions_similar_to_title(self, title, limit):
+        with self.__lock:
+            return self.__catalog.editions_similar_to_title(title, limit)
+
+    def read_editions_similar_to_author(self, author, limit):
+        with self.__lock:
+            return self.__catalog.editions_similar_to_author(author, limit)
+
+    def query_books(self, predicate):
+        with self.__lock:
+            return self.__catalog.query(predicate)
+
+    def update_book(self, updated_book: BookEntity):
+        try:
+            with self.__lock:
+                if updated_book.id in self.__catalog:
+                    self._append(_to_record(UPDATE_OPERATION, updated_book.to_dict()))
+                    self.__catalog.update(updated_book)
+                    self.__write_generation += 1
+
+            self._compact_if_needed()
+
+            return updated_book
+        except Exception:
+            raise RepositoryException(RepositoryExceptions.ERROR_UPDATING_BOOK)
+
+    def update_books(self, updated_books):
+        updated_books = list(updated_books)
+
+        try:
+            with self.__lock:
+                existing_books = [book for book in updated_books if book.id in self.__catalog]
+
+                self._append(*[_to_record(UPDATE_OPERATION, book.to_dict()) for book in existing_books])
+                for book in existing_books:
+                    self.__catalog.update(book)
+                self.__write_generation += 1
+
+            self._compact_if_needed()
+
+            return updated_books
+        except Exception:
+            raise RepositoryException(RepositoryExceptions.ERROR_UPDATING_BOOK)
+
+    def set_taken(self, book_id, is_taken, expected=None):
+        try:
+            with self.__lock:
+                if book_id not in self.__catalog or (expected is not None and self.__catalog.is_taken(book_id) != expected):
+                    return None
+
+                self._append(_to_taken_record(book_id, is_taken))
+                book = self.__catalog.set_taken(book_id, is_taken)
+                self.__write_generation += 1
+
+            self._compact_if_needed()
+
+            return book
+        except Exception:
+            raise RepositoryException(RepositoryExceptions.ERROR_UPDATING_BOOK)
+
+    def set_taken_many(self, book_ids, is_taken, expected=None):
+        try:
+            with self.__lock:
+                changed_ids = self.__catalog.changeable_ids(book_ids, expected)
+                if not changed_ids:
+                    return []
+
+                self._append(*[_to_taken_record(book_id, is_taken) for book_id in changed_ids])
+                for book_id in changed_ids:
+                    self.__catalog.set_taken(book_id, is_taken)
+                self.__write_generation += 1
+
+            self._compact_if_needed()
+
+            return changed_ids
+        except Exception:
+            raise RepositoryException(RepositoryExceptions.ERROR_UPDATING_BOOK)
+
+    def compact(self):
+        with self.__compaction_lock:
+            self._compact()
+
+    def _compact(self):
+        try:
+            with self.__lock:
+                # Iterated directly so that compaction does not count as books scanned by callers.
+                books = [book.copy() for book in self.__catalog]
+                self.__pending_records = []
+
+            records = [_to_record(CREATE_OPERATION, book.to_dict()) for book in books]
+            temporary_file_path = self.__file_path + ".tmp"
+
+            with open(temporary_file_path, 'w') as file:
+                file.writelines(records)
+
+            with self.__lock:
+                with open(temporary_file_path, 'a') as file:
+                    file.writelines(self.__pending_records)
+
+                self.__io_statistics.bytes_written += os.path.getsize(temporary_file_path)
+                os.replace(temporary_file_path, self.__file_path)
+                self.__record_count = len(records) + len(self.__pending_records)
+        except Exception:
+            raise RepositoryException(RepositoryExceptions.ERROR_COMPACTING_LOG)
+        finally:
+            with self.__lock:
+                self.__pending_records = None
+
+    def wait_for_compaction(self, timeout=None):
+        compaction = self.__compaction
+        if compaction is not None:
+            compaction.join(timeout)
+
+    def _compact_if_needed(self):
+        with self.__lock:
+            superseded_records = self.__record_count - len(self.__catalog)
+            if superseded_records < self.__compaction_threshold or self.__compaction is not None:
+                return
+
+            self.__compaction = threading.Thread(target=self._run_compaction, daemon=True)
+            self.__compaction.start()
+
+    def _run_compaction(self):
+        try:
+            self.compact()
+        except RepositoryException:
+            # The old log is still complete, the next write will retry.
+            pass
+        finally:
+            with self.__lock:
+                self.__compaction = None
+
+    def _append(self, *records):
+        data = "".join(records).encode("utf-8")
+        with open(self.__file_path, 'ab') as file:
+            file.write(data)
+
+        self.__io_statistics.bytes_written += len(data)
+
+        self.__record_count += len(records)
+        if self.__pending_records is not None:
+            self.__pending_records.extend(records)
+
+    def _load(self):
+        try:
+            if not os.path.exists(self.__file_path):
+                return
+
+            with open(self.__file_path, 'r') as file:
+                lines = file.readlines()
+            self.__io_statistics.bytes_read += os.path.getsize(self.__file_path)
+
+            # An unterminated final record is the result of an interrupted append.
+            if lines and not lines[-1].endswith("\n"):
+                lines.pop()
+                _write_log(self.__file_path, lines)
+
+            for line in lines:
+                if not line.strip():
+                    continue
+
+                record = json.loads(line)
+                self.__record_count += 1
+
+                if record["op"] == TAKEN_OPERATION:
+                    self.__catalog.set_taken(record["id"], record["is_taken"])
+                    continue
+
+                book = BookEntity.from_dict(record["book"])
+                if record["op"] == CREATE_OPERATION:
+                    self.__catalog.add(book)
+                else:
+                    self.__catalog.update(book)
+        except Exception:
+            raise RepositoryException(RepositoryExceptions.ERROR_READING_FILE)
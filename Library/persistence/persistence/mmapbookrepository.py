@@ -0,0 +1,491 @@
+import os
+import json
+import mmap
+import uuid
+import struct
+import threading
+from collections.abc import Sequence
+from Library.persistence.persistence.bookcodecs import read_book_file
+from Library.persistence.persistence.bookcursor import decode_cursor, sort_key, to_page
+from Library.persistence.persistence.editionindex import EditionIndex
+from Library.persistence.persistence.ibookrepository import IBookRepository
+from Library.persistence.persistence.repositoryexception import RepositoryException
+from Library.persistence.persistence.sortedindex import SortedIndex
+from Library.persistence.persistence.trigramindex import TrigramIndex
+from Library.persistence.persistenceentities.bookentity import BookEntity
+from Library.persistence.persistenceentities.iostatistics import IoStatistics
+from Library.persistence.persistenceentities.repositoryexceptions import RepositoryExceptions
+
+# id, publication_year, is_taken, title offset, title length, author offset, author length
+RECORD = struct.Struct("<16sqBQIQI")
+HEADER = struct.Struct("<4sHxx")
+MAGIC = b"LIBR"
+VERSION = 1
+IS_TAKEN_OFFSET = 24
+EMPTY_ID = bytes(16)
+# Files grow at least by this much and by half their size, so appends rarely remap.
+RECORD_CHUNK_SIZE = 1024 * RECORD.size
+HEAP_CHUNK_SIZE = 64 * 1024
+
+
+def json_to_mapped(json_file_path: str, record_file_path: str):
+    try:
+        books = read_book_file(json_file_path)
+
+        records, heap = _encode_books(books, 0)
+        with open(record_file_path, 'wb') as file:
+            file.write(HEADER.pack(MAGIC, VERSION))
+            file.write(records)
+        with open(_heap_file_path(record_file_path), 'wb') as file:
+            file.write(heap)
+
+        return len(books)
+    except Exception:
+        raise RepositoryException(RepositoryExceptions.ERROR_MIGRATING_FILE)
+
+
+def mapped_to_json(record_file_path: str, json_file_path: str):
+    book_repository = MmapBookRepository(record_file_path)
+    try:
+        books = book_repository.read_books()
+        with open(json_file_path, 'w') as file:
+            json.dump([book.to_dict() for book in books], file, indent=2)
+
+        return len(books)
+    finally:
+        book_repository.close()
+
+
+def _heap_file_path(record_file_path):
+    return record_file_path + ".heap"
+
+
+def _map_heap(heap_file):
+    # Empty files cannot be mapped.
+    if not os.fstat(heap_file.fileno()).st_size:
+        return b""
+
+    return mmap.mmap(heap_file.fileno(), 0, access=mmap.ACCESS_WRITE)
+
+
+def _encode_books(books, heap_size):
+    records = bytearray()
+    heap = bytearray()
+
+    for book in books:
+        title = str(book.title).encode("utf-8")
+        author = str(book.author).encode("utf-8")
+        title_offset = heap_size + len(heap)
+        heap += title
+        author_offset = heap_size + len(heap)
+        heap += author
+
+        records += RECORD.pack(uuid.UUID(book.id).bytes, int(book.publication_year), int(bool(book.is_taken)),
+                               title_offset, len(title), author_offset, len(author))
+
+    return records, heap
+
+
+class _MappedBooks(Sequence):
+    def __init__(self, book_repository, positions):
+        self.__book_repository = book_repository
+        self.__positions = positions
+
+    def __len__(self):
+        return len(self.__positions)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return _MappedBooks(self.__book_repository, self.__positions[index])
+
+        return self.__book_repository._read_book(self.__positions[index])
+
+
+class MmapBookRepository(IBookRepository):
+    def __init__(self, file_path: str):
+        self.__file_path = file_path
+        self.__lock = threading.RLock()
+        self.__title_index = None
+        self.__author_index = None
+        self.__title_search_index = None
+        self.__author_search_index = None
+        self.__edition_index = None
+        self.__sorted_indexes = {}
+        self.__io_statistics = IoStatistics()
+        self.__write_generation = 0
+
+        try:
+            if not os.path.exists(file_path):
+                with open(file_path, 'wb') as file:
+                    file.write(HEADER.pack(MAGIC, VERSION))
+                open(_heap_file_path(file_path), 'wb').close()
+
+            self.__record_file = open(file_path, 'r+b')
+            self.__heap_file = open(_heap_file_path(file_path), 'r+b')
+
+            magic, version = HEADER.unpack(self.__record_file.read(HEADER.size))
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"Unsupported book record file: {file_path}")
+
+            self.__records = mmap.mmap(self.__record_file.fileno(), 0, access=mmap.ACCESS_WRITE)
+            self.__heap = _map_heap(self.__heap_file)
+
+            # Records after the last book are spare capacity and still zeroed.
+            self.__positions = {}
+            self.__heap_size = 0
+            for offset in range(HEADER.size, len(self.__records) - RECORD.size + 1, RECORD.size):
+                book_id, _, _, title_offset, title_length, author_offset, author_length = \
+                    RECORD.unpack_from(self.__records, offset)
+                if book_id == EMPTY_ID:
+                    break
+
+                self.__positions[book_id] = len(self.__positions)
+                self.__heap_size = max(self.__heap_size, title_offset + title_length, author_offset + author_length)
+        except Exception:
+            raise RepositoryException(RepositoryExceptions.ERROR_READING_FILE)
+
+    @property
+    def io_statistics(self):
+        # Pages are read by the kernel on access, so only the decoded records are counted.
+        return self.__io_statistics
+
+    @property
+    def write_generation(self):
+        return self.__write_generation
+
+    def close(self):
+        with self.__lock:
+            self.__records.close()
+            if self.__heap:
+                self.__heap.close()
+            self.__record_file.close()
+            self.__heap_file.close()
+
+    def create_book(self, book: BookEntity):
+        try:
+            book.id = str(uuid.uuid4())
+            self._append_books([book])
+
+            return book
+        except Exception:
+            raise RepositoryException(RepositoryExceptions.ERROR_CREATING_BOOK)
+
+    def create_books(self, books):
+        books = list(books)
+
+        for book in books:
+            book.id = str(uuid.uuid4())
+
+        return self.import_books(books)
+
+    def import_books(self, books):
+        books = list(books)
+
+        try:
+            with self.__lock:
+                # Ids that exist already are replaced in place, so their old index entries go first.
+                latest_books = {uuid.UUID(book.id).bytes: book for book in books}
+                existing_books = [book for key, book in latest_books.items() if key in self.__positions]
+                new_books = [book for key, book in latest_books.items() if key not in self.__positions]
+                if new_books:
+                    self._append_books(new_books)
+                for book in existing_books:
+                    self._update_book(book)
+                self.__write_generation += 1
+
+            return books
+        except Exception:
+            raise RepositoryException(RepositoryExceptions.ERROR_CREATING_BOOK)
+
+    def read_books(self):
+        with self.__lock:
+            return _MappedBooks(self, range(len(self.__positions)))
+
+    def iter_books(self):
+        return iter(self.read_books())
+
+    def get_books(self, cursor, limit, sort):
+        after_key = decode_cursor(cursor, sort)
+
+        try:
+            with self.__lock:
+                keys = self._sorted_index(sort).after(after_key, limit + 1)
+                keyed_books = [(key, self._read_book(self.__positions[uuid.UUID(key[1]).bytes])) for key in keys]
+
+            return to_page(keyed_books, limit, sort)
+        except Exception:
+            raise RepositoryException(RepositoryExceptions.ERROR_READING_FILE)
+
+    def get_book_by_id(self, book_id):
+        try:
+            with self.__lock:
+                position = self.__positions.get(uuid.UUID(book_id).bytes)
+                return None if position is None else self._read_book(position)
+        except (ValueError, TypeError, AttributeError):
+            return None
+        except Exception:
+            raise RepositoryException(RepositoryExceptions.ERROR_READING_FILE)
+
+    def get_books_by_ids(self, book_ids):
+        return [self.get_book_by_id(book_id) for book_id in book_ids]
+
+    def read_books_by_title(self, title):
+        with self.__lock:
+            self._build_search_indexes()
+            return _MappedBooks(self, [position for _, position in self.__title_index.get(title, ())])
+
+    def read_books_by_author(self, author):
+        with self.__lock:
+            self._build_search_indexes()
+            return _MappedBooks(self, [position for _, position in self.__author_index.get(author, ())])
+
+    def read_books_similar_to_title(self, title, limit):
+        with self.__lock:
+            self._build_search_indexes()
+            titles = self.__title_search_index.search(title, limit)
+
+            return [self._read_book(position) for found_title in titles for _, position in self.__title_index[found_title]]
+
+    def read_books_similar_to_author(self, author, limit):
+        with self.__lock:
+            self._build_search_indexes()
+            authors = self.__author_search_index.search(author, limit)
+
+            return [self._read_book(position) for found_author in authors for _, position in self.__author_index[found_author]]
+
+    def read_books_by_year_range(self, start_year, end_year):
+        try:
+            with self.__lock:
+                keys = self._sorted_index("publication_year").between(start_year, end_year)
+                return _MappedBooks(self, [self.__positions[uuid.UUID(book_id).bytes] for _, book_id in keys])
+        except Exception:
+            raise RepositoryException(RepositoryExceptions.ERROR_READING_FILE)
+
+    def read_editions_by_title(self, title):
+        with self.__lock:
+            self._build_search_indexes()
+            return self.__edition_index.editions_by_title(title)
+
+    def read_editions_by_author(self, author):
+        with self.__lock:
+            self._build_search_indexes()
+            return self.__edition_index.editions_by_author(author)
+
+    def read_editions_similar_to_title(self, title, limit):
+        with self.__lock:
+            self._build_search_indexes()
+            return self.__edition_index.editions_by_titles(self.__title_search_index.search(title, limit))
+
+    def read_editions_similar_to_author(self, author, limit):
+        with self.__lock:
+            self._build_search_indexes()
+            return self.__edition_index.editions_by_authors(self.__author_search_index.search(author, limit))
+
+    def query_books(self, predicate):
+        return [book for book in self.iter_books() if predicate.matches(book)]
+
+    def update_book(self, updated_book: BookEntity):
+        try:
+            with self.__lock:
+                self._update_book(updated_book)
+                self.__write_generation += 1
+
+            return updated_book
+        except Exception:
+            raise RepositoryException(RepositoryExceptions.ERROR_UPDATING_BOOK)
+
+    def update_books(self, updated_books):
+        updated_books = list(updated_books)
+
+        try:
+            with self.__lock:
+                for updated_book in updated_books:
+                    self._update_book(updated_book)
+                self.__write_generation += 1
+
+            return updated_books
+        except Exception:
+            raise RepositoryException(RepositoryExceptions.ERROR_UPDATING_BOOK)
+
+    def set_taken(self, book_id, is_taken, expected=None):
+        try:
+            with self.__lock:
+                position = self.__positions.get(uuid.UUID(book_id).bytes)
+                if position is None or not self._set_taken(position, is_taken, expected):
+                    return None
+
+                self.__write_generation += 1
+
+                return self._read_book(position)
+        except (ValueError, TypeError, AttributeError):
+            return None
+        except Exception:
+            raise RepositoryException(RepositoryExceptions.ERROR_UPDATING_BOOK)
+
+    def set_taken_many(self, book_ids, is_taken, expected=None):
+        try:
+            with self.__lock:
+                changed_ids = []
+                seen_positions = set()
+                for book_id in book_ids:
+                    try:
+                        position = self.__positions.get(uuid.UUID(book_id).bytes)
+                    except (ValueError, TypeError, AttributeError):
+                        continue
+
+                    if position is None or position in seen_positions:
+                        continue
+                    seen_positions.add(position)
+
+                    if self._set_taken(position, is_taken, expected):
+                        changed_ids.append(book_id)
+
+                if changed_ids:
+                    self.__write_generation += 1
+
+                return changed_ids
+        except Exception:
+            raise RepositoryException(RepositoryExceptions.ERROR_UPDATING_BOOK)
+
+    def _set_taken(self, position, is_taken, expected):
+        taken_offset = HEADER.size + position * RECORD.size + IS_TAKEN_OFFSET
+        if expected is not None and bool(self.__records[taken_offset]) != expected:
+            return False
+
+        if self.__edition_index is not None:
+            self.__edition_index.set_taken(self._read_book(position), is_taken)
+        self.__records[taken_offset] = int(bool(is_taken))
+
+        return True
+
+    def _update_book(self, updated_book: BookEntity):
+        position = self.__positions.get(uuid.UUID(updated_book.id).bytes)
+        if position is None:
+            return
+
+        book = self._read_book(position)
+        record_offset = HEADER.size + position * RECORD.size
+
+        if book.title == updated_book.title and book.author == updated_book.author \
+                and book.publication_year == updated_book.publication_year:
+            # Checkouts only flip the flag, which is patched in place.
+            if self.__edition_index is not None:
+                self.__edition_index.set_taken(book, updated_book.is_taken)
+            self.__records[record_offset + IS_TAKEN_OFFSET] = int(bool(updated_book.is_taken))
+            return
+
+        for sort, sorted_index in self.__sorted_indexes.items():
+            if sort_key(book, sort) != sort_key(updated_book, sort):
+                sorted_index.remove(sort_key(book, sort))
+                sorted_index.add(sort_key(updated_book, sort))
+
+        record, heap = _encode_books([updated_book], self.__heap_size)
+        self._append_heap(heap)
+        self.__records[record_offset:record_offset + RECORD.size] = record
+
+        if self.__title_index is not None:
+            self._unindex(self.__title_index, self.__title_search_index, book.title, (book.publication_year, position))
+            self._unindex(self.__author_index, self.__author_search_index, book.author, (book.publication_year, position))
+            self._index(self.__title_index, self.__title_search_index, updated_book.title,
+                        (updated_book.publication_year, position))
+            self._index(self.__author_index, self.__author_search_index, updated_book.author,
+                        (updated_book.publication_year, position))
+            self.__edition_index.remove(book)
+            self.__edition_index.add(updated_book)
+
+    def _append_books(self, books):
+        with self.__lock:
+            records, heap = _encode_books(books, self.__heap_size)
+            self._append_heap(heap)
+
+            first_position = len(self.__positions)
+            records_offset = HEADER.size + first_position * RECORD.size
+            self.__records = self._reserve(self.__record_file, self.__records, records_offset + len(records),
+                                           RECORD_CHUNK_SIZE)
+            self.__records[records_offset:records_offset + len(records)] = records
+
+            for position, book in enumerate(books, first_position):
+                self.__positions[uuid.UUID(book.id).bytes] = position
+                for sort, sorted_index in self.__sorted_indexes.items():
+                    sorted_index.add(sort_key(book, sort))
+                if self.__title_index is not None:
+                    self._index(self.__title_index, self.__title_search_index, book.title, (book.publication_year, position))
+                    self._index(self.__author_index, self.__author_search_index, book.author, (book.publication_year, position))
+                    self.__edition_index.add(book)
+
+            self.__write_generation += 1
+
+    def _append_heap(self, heap):
+        if not heap:
+            return
+
+        self.__heap = self._reserve(self.__heap_file, self.__heap, self.__heap_size + len(heap), HEAP_CHUNK_SIZE)
+        self.__heap[self.__heap_size:self.__heap_size + len(heap)] = heap
+        self.__heap_size += len(heap)
+
+    def _reserve(self, file, mapped, size, chunk_size):
+        if len(mapped) >= size:
+            return mapped
+
+        # The previous map is closed first, views handed out earlier read through the repository, not the map.
+        mapped_size = len(mapped)
+        if mapped:
+            mapped.close()
+        file.truncate(max(size, mapped_size + max(chunk_size, mapped_size // 2)))
+
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_WRITE)
+
+    def _read_book(self, position):
+        # Writers may replace the maps, so a read must not run between closing and remapping them.
+        with self.__lock:
+            self.__io_statistics.books_scanned += 1
+            book_id, publication_year, is_taken, title_offset, title_length, author_offset, author_length = \
+                RECORD.unpack_from(self.__records, HEADER.size + position * RECORD.size)
+
+            return BookEntity(
+                self.__heap[title_offset:title_offset + title_length].decode("utf-8"),
+                self.__heap[author_offset:author_offset + author_length].decode("utf-8"),
+                publication_year,
+                str(uuid.UUID(bytes=book_id)),
+                bool(is_taken)
+            )
+
+    def _build_search_indexes(self):
+        if self.__title_index is not None:
+            return
+
+        self.__title_index = {}
+        self.__author_index = {}
+        self.__title_search_index = TrigramIndex()
+        self.__author_search_index = TrigramIndex()
+        self.__edition_index = EditionIndex()
+
+        for position in range(len(self.__positions)):
+            book = self._read_book(position)
+            self._index(self.__title_index, self.__title_search_index, book.title, (book.publication_year, position))
+            self._index(self.__author_index, self.__author_search_index, book.author, (book.publication_year, position))
+            self.__edition_index.add(book)
+
+    def _sorted_index(self, sort):
+        sorted_index = self.__sorted_indexes.get(sort)
+        if sorted_index is None:
+            sorted_index = self.__sorted_indexes[sort] = SortedIndex(
+                sort_key(self._read_book(position), sort) for position in range(len(self.__positions)))
+
+        return sorted_index
+
+    def _index(self, index, search_index, key, year_key):
+        # Year keys end with the record position, so copies of one year keep their file order.
+        year_keys = index.get(key)
+        if year_keys is None:
+            year_keys = index[key] = SortedIndex()
+            search_index.add(key)
+
+        year_keys.add(year_key)
+
+    def _unindex(self, index, search_index, key, year_key):
+        year_keys = index[key]
+        year_keys.remove(year_key)
+        if not year_keys:
+            del index[key]
+            search_index.remove(key)
@@ -0,0 +1,240 @@
+import os
+import uuid
+import zlib
+import heapq
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from Library.persistence.persistence.bookcodecs import JSON_CODEC
+from Library.persistence.persistence.bookcursor import sort_key, to_page
+from Library.persistence.persistence.bookrepository import BookRepository
+from Library.persistence.persistence.editionindex import merge_editions
+from Library.persistence.persistence.ibookrepository import IBookRepository
+from Library.persistence.persistence.repositoryexception import RepositoryException
+from Library.persistence.persistence.trigramindex import TrigramIndex
+from Library.persistence.persistenceentities.bookentity import BookEntity
+from Library.persistence.persistenceentities.iostatistics import IoStatistics
+from Library.persistence.persistenceentities.repositoryexceptions import RepositoryExceptions
+
+
+def shard_index(book_id, shard_count):
+    # crc32 rather than hash(), which is salted per process for strings.
+    return zlib.crc32(str(book_id).encode("utf-8")) % shard_count
+
+
+def shard_file_paths(file_path: str, shard_count: int):
+    if shard_count == 1:
+        return [file_path]
+
+    root, extension = os.path.splitext(file_path)
+    return [f"{root}.{index}-of-{shard_count}{extension}" for index in range(shard_count)]
+
+
+def reshard_books(file_path: str, shard_count: int, new_shard_count: int, codec: str = JSON_CODEC):
+    try:
+        source_file_paths = [path for path in shard_file_paths(file_path, shard_count) if os.path.exists(path)]
+        books = [book for path in source_file_paths for book in BookRepository(path).read_books()]
+
+        shards = [[] for _ in range(new_shard_count)]
+        for book in books:
+            shards[shard_index(book.id, new_shard_count)].append(book)
+
+        for shard_file_path, shard_books in zip(shard_file_paths(file_path, new_shard_count), shards):
+            temporary_file_path = shard_file_path + ".tmp"
+            if os.path.exists(temporary_file_path):
+                os.remove(temporary_file_path)
+
+            BookRepository(temporary_file_path, codec=codec).import_books(shard_books)
+            os.replace(temporary_file_path, shard_file_path)
+
+        # A single unsharded file is kept, like the legacy files of the other migrations.
+        if shard_count > 1 and shard_count != new_shard_count:
+            for path in source_file_paths:
+                os.remove(path)
+
+        return len(books)
+    except Exception:
+        raise RepositoryException(RepositoryExceptions.ERROR_MIGRATING_FILE)
+
+
+class ShardedBookRepository(IBookRepository):
+    def __init__(self, shard_repositories):
+        self.__shard_repositories = list(shard_repositories)
+        self.__executor = ThreadPoolExecutor(max_workers=len(self.__shard_repositories))
+
+    @property
+    def io_statistics(self):
+        shard_statistics = [statistics for statistics in (getattr(shard_repository, "io_statistics", None)
+                                                          for shard_repository in self.__shard_repositories)
+                            if statistics is not None]
+
+        return IoStatistics(sum(statistics.bytes_read for statistics in shard_statistics),
+                            sum(statistics.bytes_written for statistics in shard_statistics),
+                            sum(statistics.books_scanned for statistics in shard_statistics))
+
+    @property
+    def write_generation(self):
+        return tuple(getattr(shard_repository, "write_generation", None) for shard_repository in self.__shard_repositories)
+
+    def close(self):
+        self.__executor.shutdown(wait=True)
+        for shard_repository in self.__shard_repositories:
+            if hasattr(shard_repository, "close"):
+                shard_repository.close()
+
+    def create_book(self, book: BookEntity):
+        book.id = str(uuid.uuid4())
+        self._shard_for(book.id).import_books([book])
+
+        return book
+
+    def create_books(self, books):
+        books = list(books)
+
+        for book in books:
+            book.id = str(uuid.uuid4())
+
+        return self.import_books(books)
+
+    def import_books(self, books):
+        books = list(books)
+        self._write_by_shard(books, lambda shard_repository, shard_books: shard_repository.import_books(shard_books))
+
+        return books
+
+    def read_books(self):
+        return [book for books in self._fan_out(lambda shard_repository: shard_repository.read_books()) for book in books]
+
+    def iter_books(self):
+        return itertools.chain.from_iterable(shard_repository.iter_books() for shard_repository in self.__shard_repositories)
+
+    def get_books(self, cursor, limit, sort):
+        # Every shard returns its own first limit + 1 books, so together they
+        # hold the first limit + 1 books of the whole catalog.
+        pages = self._fan_out(lambda shard_repository: shard_repository.get_books(cursor, limit + 1, sort))
+        keyed_books = heapq.merge(*[[(sort_key(book, sort), book) for book in page.books] for page in pages],
+                                  key=lambda keyed_book: keyed_book[0])
+
+        return to_page(list(itertools.islice(keyed_books, limit + 1)), limit, sort)
+
+    def get_book_by_id(self, book_id):
+        return self._shard_for(book_id).get_book_by_id(book_id)
+
+    def get_books_by_ids(self, book_ids):
+        book_ids = list(book_ids)
+        shard_book_ids = {}
+        for book_id in book_ids:
+            shard_book_ids.setdefault(shard_index(book_id, len(self.__shard_repositories)), []).append(book_id)
+
+        found_books = {}
+        for books in self.__executor.map(lambda item: self.__shard_repositories[item[0]].get_books_by_ids(item[1]),
+                                         shard_book_ids.items()):
+            found_books.update((book.id, book) for book in books if book is not None)
+
+        return [found_books.get(book_id) for book_id in book_ids]
+
+    def read_books_by_title(self, title):
+        return self._merge_by_year(self._fan_out(lambda shard_repository: shard_repository.read_books_by_title(title)))
+
+    def read_books_by_author(self, author):
+        return self._merge_by_year(self._fan_out(lambda shard_repository: shard_repository.read_books_by_author(author)))
+
+    def read_books_by_year_range(self, start_year, end_year):
+        shard_books = self._fan_out(lambda shard_repository: shard_repository.read_books_by_year_range(start_year, end_year))
+
+        return list(heapq.merge(*shard_books, key=lambda book: sort_key(book, "publication_year")))
+
+    def read_books_similar_to_title(self, title, limit):
+        found_books = self._merge(self._fan_out(
+            lambda shard_repository: shard_repository.read_books_similar_to_title(title, limit)))
+
+        return self._rank(found_books, lambda book: book.title, title, limit)
+
+    def read_books_similar_to_author(self, author, limit):
+        found_books = self._merge(self._fan_out(
+            lambda shard_repository: shard_repository.read_books_similar_to_author(author, limit)))
+
+        return self._rank(found_books, lambda book: book.author, author, limit)
+
+    def read_editions_by_title(self, title):
+        # Copies of one edition land on different shards, so their counts are summed.
+        return merge_editions(self._merge_by_year(self._fan_out(
+            lambda shard_repository: shard_repository.read_editions_by_title(title))))
+
+    def read_editions_by_author(self, author):
+        return merge_editions(self._merge_by_year(self._fan_out(
+            lambda shard_repository: shard_repository.read_editions_by_author(author))))
+
+    def read_editions_similar_to_title(self, title, limit):
+        found_editions = merge_editions(self._merge(self._fan_out(
+            lambda shard_repository: shard_repository.read_editions_similar_to_title(title, limit))))
+
+        return self._rank(found_editions, lambda edition: edition.title, title, limit)
+
+    def read_editions_similar_to_author(self, author, limit):
+        found_editions = merge_editions(self._merge(self._fan_out(
+            lambda shard_repository: shard_repository.read_editions_similar_to_author(author, limit))))
+
+        return self._rank(found_editions, lambda edition: edition.author, author, limit)
+
+    def query_books(self, predicate):
+        return self._merge(self._fan_out(lambda shard_repository: shard_repository.query_books(predicate)))
+
+    def update_book(self, updated_book: BookEntity):
+        return self._shard_for(updated_book.id).update_book(updated_book)
+
+    def update_books(self, updated_books):
+        updated_books = list(updated_books)
+        self._write_by_shard(updated_books,
+                             lambda shard_repository, shard_books: shard_repository.update_books(shard_books))
+
+        return updated_books
+
+    def set_taken(self, book_id, is_taken, expected=None):
+        return self._shard_for(book_id).set_taken(book_id, is_taken, expected)
+
+    def set_taken_many(self, book_ids, is_taken, expected=None):
+        book_ids = list(dict.fromkeys(book_ids))
+        shard_book_ids = {}
+        for book_id in book_ids:
+            shard_book_ids.setdefault(shard_index(book_id, len(self.__shard_repositories)), []).append(book_id)
+
+        changed_ids = set()
+        for shard_changed_ids in self.__executor.map(
+                lambda item: self.__shard_repositories[item[0]].set_taken_many(item[1], is_taken, expected),
+                shard_book_ids.items()):
+            changed_ids.update(shard_changed_ids)
+
+        return [book_id for book_id in book_ids if book_id in changed_ids]
+
+    def _shard_for(self, book_id):
+        return self.__shard_repositories[shard_index(book_id, len(self.__shard_repositories))]
+
+    def _write_by_shard(self, books, write):
+        shard_books = {}
+        for book in books:
+            shard_books.setdefault(shard_index(book.id, len(self.__shard_repositories)), []).append(book)
+
+        list(self.__executor.map(lambda item: write(self.__shard_repositories[item[0]], item[1]), shard_books.items()))
+
+    def _fan_out(self, read):
+        return list(self.__executor.map(read, self.__shard_repositories))
+
+    def _merge(self, shard_books):
+        return [book for books in shard_books for book in books]
+
+    def _merge_by_year(self, shard_results):
+        # Every shard already returns its results ordered by publication year.
+        return list(heapq.merge(*shard_results, key=lambda result: result.publication_year))
+
+    def _rank(self, books, get_key, query, limit):
+        # Each shard ranked only its own texts, the union is ranked once more.
+        search_index = TrigramIndex()
+        books_by_key = {}
+        for book in books:
+            key = get_key(book)
+            if key not in books_by_key:
+                books_by_key[key] = []
+                search_index.add(key)
+            books_by_key[key].append(book)
+
+        return [book for key in search_index.search(query, limit) for book in books_by_key[key]]
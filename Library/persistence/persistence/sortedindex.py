@@ -0,0 +1,30 @@
+import bisect
+
+
+class SortedIndex:
+    def __init__(self, keys=()):
+        self.__keys = sorted(keys)
+
+    def __len__(self):
+        return len(self.__keys)
+
+    def __iter__(self):
+        return iter(self.__keys)
+
+    def add(self, key):
+        bisect.insort(self.__keys, key)
+
+    def remove(self, key):
+        index = bisect.bisect_left(self.__keys, key)
+        if index < len(self.__keys) and self.__keys[index] == key:
+            del self.__keys[index]
+
+    def after(self, key, limit):
+        start = 0 if key is None else bisect.bisect_right(self.__keys, key)
+        return self.__keys[start:start + limit]
+
+    def between(self, low, high):
+        # Keys are tuples led by the indexed value, both bounds are inclusive.
+        start = bisect.bisect_left(self.__keys, low, key=lambda key: key[0])
+        stop = bisect.bisect_right(self.__keys, high, key=lambda key: key[0])
+        return self.__keys[start:stop]
@@ -0,0 +1,493 @@
+import uuid
+import sqlite3
+import itertools
+import threading
+from Library.persistence.persistence.bookcodecs import read_book_file
+from Library.persistence.persistence.bookcursor import decode_cursor, sort_key, to_page
+from Library.persistence.persistence.ibookrepository import IBookRepository
+from Library.persistence.persistence.repositoryexception import RepositoryException
+from Library.persistence.persistence.trigramindex import TrigramIndex
+from Library.persistence.persistenceentities.bookentity import BookEntity
+from Library.persistence.persistenceentities.iostatistics import IoStatistics
+from Library.persistence.persistenceentities.editionentity import EditionEntity
+from Library.persistence.persistenceentities.repositoryexceptions import RepositoryExceptions
+
+# SQL texts are module constants so the connection statement cache reuses
+# their prepared statements for the lifetime of each connection.
+CREATE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS books (
+    id TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    author TEXT NOT NULL,
+    publication_year INTEGER NOT NULL,
+    is_taken INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS books_title ON books (title, id);
+CREATE INDEX IF NOT EXISTS books_author ON books (author, id);
+CREATE INDEX IF NOT EXISTS books_publication_year ON books (publication_year, id);
+CREATE INDEX IF NOT EXISTS books_edition ON books (title, author, publication_year);
+CREATE INDEX IF NOT EXISTS books_title_publication_year ON books (title, publication_year);
+CREATE INDEX IF NOT EXISTS books_author_publication_year ON books (author, publication_year);
+CREATE TABLE IF NOT EXISTS editions (
+    title TEXT NOT NULL,
+    author TEXT NOT NULL,
+    publication_year INTEGER NOT NULL,
+    copy_count INTEGER NOT NULL,
+    taken_count INTEGER NOT NULL,
+    PRIMARY KEY (title, author, publication_year)
+);
+CREATE INDEX IF NOT EXISTS editions_author ON editions (author);
+CREATE TRIGGER IF NOT EXISTS books_insert_edition AFTER INSERT ON books BEGIN
+    INSERT INTO editions (title, author, publication_year, copy_count, taken_count)
+    VALUES (NEW.title, NEW.author, NEW.publication_year, 1, NEW.is_taken)
+    ON CONFLICT (title, author, publication_year)
+    DO UPDATE SET copy_count = copy_count + 1, taken_count = taken_count + NEW.is_taken;
+END;
+CREATE TRIGGER IF NOT EXISTS books_update_edition AFTER UPDATE OF title, author, publication_year, is_taken ON books BEGIN
+    UPDATE editions SET copy_count = copy_count - 1, taken_count = taken_count - OLD.is_taken
+    WHERE title = OLD.title AND author = OLD.author AND publication_year = OLD.publication_year;
+    INSERT INTO editions (title, author, publication_year, copy_count, taken_count)
+    VALUES (NEW.title, NEW.author, NEW.publication_year, 1, NEW.is_taken)
+    ON CONFLICT (title, author, publication_year)
+    DO UPDATE SET copy_count = copy_count + 1, taken_count = taken_count + NEW.is_taken;
+    DELETE FROM editions
+    WHERE title = OLD.title AND author = OLD.author AND publication_year = OLD.publication_year AND copy_count = 0;
+END;
+"""
+BOOK_COLUMNS = "title, author, publication_year, id, is_taken"
+# Importing an id that exists replaces that book, like the other repositories do.
+INSERT_BOOK = f"INSERT INTO books ({BOOK_COLUMNS}) VALUES (?, ?, ?, ?, ?) ON CONFLICT (id) DO UPDATE SET " \
+              "title = excluded.title, author = excluded.author, publication_year = excluded.publication_year, " \
+              "is_taken = excluded.is_taken"
+UPDATE_BOOK = "UPDATE books SET title = ?, author = ?, publication_year = ?, is_taken = ? WHERE id = ?"
+UPDATE_TAKEN = "UPDATE books SET is_taken = ? WHERE id = ?"
+UPDATE_TAKEN_IF = "UPDATE books SET is_taken = ? WHERE id = ? AND is_taken = ?"
+SELECT_BOOKS = f"SELECT {BOOK_COLUMNS} FROM books ORDER BY rowid"
+SELECT_BOOK_BY_ID = f"SELECT {BOOK_COLUMNS} FROM books WHERE id = ?"
+SELECT_BOOKS_BY_TITLE = f"SELECT {BOOK_COLUMNS} FROM books WHERE title = ? ORDER BY publication_year, rowid"
+SELECT_BOOKS_BY_AUTHOR = f"SELECT {BOOK_COLUMNS} FROM books WHERE author = ? ORDER BY publication_year, rowid"
+SELECT_BOOKS_BY_YEAR_RANGE = f"SELECT {BOOK_COLUMNS} FROM books WHERE publication_year BETWEEN ? AND ? ORDER BY publication_year, id"
+SELECT_TITLE_EXISTS = "SELECT 1 FROM books WHERE title = ? LIMIT 1"
+SELECT_AUTHOR_EXISTS = "SELECT 1 FROM books WHERE author = ? LIMIT 1"
+SELECT_DISTINCT_TITLES = "SELECT DISTINCT title FROM books"
+SELECT_DISTINCT_AUTHORS = "SELECT DISTINCT author FROM books"
+SELECT_DATA_VERSION = "PRAGMA data_version"
+SELECT_EDITIONS = """
+SELECT editions.title, editions.author, editions.publication_year, editions.taken_count, books.id
+FROM editions JOIN books ON books.title = editions.title AND books.author = editions.author
+    AND books.publication_year = editions.publication_year
+WHERE editions.{column} = ?
+ORDER BY editions.publication_year, editions.title, editions.author, books.rowid
+"""
+SELECT_EDITIONS_BY_TITLE = SELECT_EDITIONS.format(column="title")
+SELECT_EDITIONS_BY_AUTHOR = SELECT_EDITIONS.format(column="author")
+SELECT_EDITIONS_EXIST = "SELECT 1 FROM editions LIMIT 1"
+# Databases created before the editions table existed are counted once.
+BACKFILL_EDITIONS = """
+INSERT INTO editions (title, author, publication_year, copy_count, taken_count)
+SELECT title, author, publication_year, COUNT(*), SUM(is_taken) FROM books
+GROUP BY title, author, publication_year
+"""
+MAXIMUM_PARAMETERS = 500
+
+
+def migrate_json_to_sqlite(json_file_path: str, database_path: str):
+    try:
+        books = read_book_file(json_file_path)
+
+        connection = _connect(database_path)
+        try:
+            with connection:
+                connection.executemany(INSERT_BOOK, [_to_row(book) for book in books])
+        finally:
+            connection.close()
+
+        return len(books)
+    except Exception:
+        raise RepositoryException(RepositoryExceptions.ERROR_MIGRATING_FILE)
+
+
+def _connect(database_path, check_same_thread = True):
+    connection = sqlite3.connect(database_path, timeout=30, check_same_thread=check_same_thread,
+                                 cached_statements=64)
+    connection.execute("PRAGMA journal_mode = WAL")
+    connection.execute("PRAGMA synchronous = NORMAL")
+    connection.executescript(CREATE_SCHEMA)
+
+    return connection
+
+
+def _database_has_books(database_path):
+    connection = _connect(database_path)
+    try:
+        return connection.execute("SELECT 1 FROM books LIMIT 1").fetchone() is not None
+    finally:
+        connection.close()
+
+
+def _to_row(book: BookEntity):
+    return (book.title, book.author, book.publication_year, book.id, int(bool(book.is_taken)))
+
+
+def _to_book(row):
+    title, author, publication_year, book_id, is_taken = row
+    return BookEntity(title, author, publication_year, book_id, bool(is_taken))
+
+
+def _to_editions(rows):
+    # Rows arrive grouped by edition, one row per copy.
+    return [
+        EditionEntity(title, author, publication_year, [row[4] for row in copy_rows], taken_count)
+        for (title, author, publication_year, taken_count), copy_rows in itertools.groupby(rows, key=lambda row: row[:4])
+    ]
+
+
+class SqliteBookRepository(IBookRepository):
+    def __init__(self, database_path: str, legacy_file_path: str = None):
+        self.__database_path = database_path
+        self.__readers = threading.local()
+        # Reader connections by thread, so close() and threads that have ended can release them.
+        self.__reader_connections = {}
+        self.__reader_lock = threading.Lock()
+        self.__io_statistics = IoStatistics()
+
+        if legacy_file_path and database_path != ":memory:" and not _database_has_books(database_path):
+            migrate_json_to_sqlite(legacy_file_path, database_path)
+
+        # All writes share one connection, so data_version only moves when
+        # another process commits and the search indexes must be rebuilt.
+        self.__writer = _connect(database_path, check_same_thread=False)
+        self.__write_lock = threading.Lock()
+        self.__write_generation = 0
+        with self.__writer:
+            if self.__writer.execute(SELECT_EDITIONS_EXIST).fetchone() is None:
+                self.__writer.execute(BACKFILL_EDITIONS)
+        self.__data_version = None
+        self.__title_search_index = None
+        self.__author_search_index = None
+
+    @property
+    def io_statistics(self):
+        # Pages are read by SQLite, so only the rows turned into books are counted.
+        return self.__io_statistics
+
+    @property
+    def write_generation(self):
+        # data_version also moves when another connection commits.
+        with self.__write_lock:
+            return (self.__write_generation, self.__writer.execute(SELECT_DATA_VERSION).fetchone()[0])
+
+    def close(self):
+        with self.__reader_lock:
+            for connection in self.__reader_connections.values():
+                connection.close()
+            self.__reader_connections.clear()
+
+        with self.__write_lock:
+            self.__writer.close()
+
+    def create_book(self, book: BookEntity):
+        try:
+            book.id = str(uuid.uuid4())
+            self._insert_books([book])
+
+            return book
+        except Exception:
+            raise RepositoryException(RepositoryExceptions.ERROR_CREATING_BOOK)
+
+    def create_books(self, books):
+        books = list(books)
+
+        for book in books:
+            book.id = str(uuid.uuid4())
+
+        try:
+            self._insert_books(books)
+
+            return books
+        except Exception:
+            raise RepositoryException(RepositoryExceptions.ERROR_CREATING_BOOK)
+
+    def import_books(self, books):
+        books = list(books)
+
+        try:
+            self._insert_books(books, may_exist=True)
+
+            return books
+        except Exception:
+            raise RepositoryException(RepositoryExceptions.ERROR_CREATING_BOOK)
+
+    def read_books(self):
+        return self._read(lambda connection: [self._to_book(row) for row in connection.execute(SELECT_BOOKS)])
+
+    def iter_books(self):
+        try:
+            connection = self._reader()
+            # A dedicated cursor lets several streams share the thread's connection.
+            for row in connection.cursor().execute(SELECT_BOOKS):
+                yield self._to_book(row)
+        except Exception:
+            raise RepositoryException(RepositoryExceptions.ERROR_READING_FILE)
+
+    def get_books(self, cursor, limit, sort):
+        after_key = decode_cursor(cursor, sort)
+
+        def read_page(connection):
+            # sort is one of SORT_FIELDS, and every field has a (sort, id) index.
+            if after_key is None:
+                rows = connection.execute(f"SELECT {BOOK_COLUMNS} FROM books ORDER BY {sort}, id LIMIT ?",
+                                          (limit + 1,))
+            else:
+                rows = connection.execute(f"SELECT {BOOK_COLUMNS} FROM books WHERE ({sort}, id) > (?, ?) "
+                                          f"ORDER BY {sort}, id LIMIT ?", (*after_key, limit + 1))
+
+            return to_page([(sort_key(book, sort), book) for book in map(self._to_book, rows)], limit, sort)
+
+        return self._read(read_page)
+
+    def get_book_by_id(self, book_id):
+        def read_book(connection):
+            row = connection.execute(SELECT_BOOK_BY_ID, (book_id,)).fetchone()
+            return self._to_book(row) if row else None
+
+        return self._read(read_book)
+
+    def get_books_by_ids(self, book_ids):
+        book_ids = list(book_ids)
+
+        def read_books(connection):
+            books = {}
+            for start in range(0, len(book_ids), MAXIMUM_PARAMETERS):
+                chunk = book_ids[start:start + MAXIMUM_PARAMETERS]
+                placeholders = ", ".join("?" * len(chunk))
+                rows = connection.execute(f"SELECT {BOOK_COLUMNS} FROM books WHERE id IN ({placeholders})", chunk)
+                books.update((book.id, book) for book in map(self._to_book, rows))
+
+            return [books.get(book_id) for book_id in book_ids]
+
+        return self._read(read_books)
+
+    def read_books_by_title(self, title):
+        return self._read(lambda connection: [self._to_book(row) for row in connection.execute(SELECT_BOOKS_BY_TITLE, (title,))])
+
+    def read_books_by_author(self, author):
+        return self._read(lambda connection: [self._to_book(row) for row in connection.execute(SELECT_BOOKS_BY_AUTHOR, (author,))])
+
+    def read_books_similar_to_title(self, title, limit):
+        try:
+            with self.__write_lock:
+                self._refresh_search_indexes()
+                titles = self.__title_search_index.search(title, limit)
+        except Exception:
+            raise RepositoryException(RepositoryExceptions.ERROR_READING_FILE)
+
+        return [book for found_title in titles for book in self.read_books_by_title(found_title)]
+
+    def read_books_similar_to_author(self, author, limit):
+        try:
+            with self.__write_lock:
+                self._refresh_search_indexes()
+                authors = self.__author_search_index.search(author, limit)
+        except Exception:
+            raise RepositoryException(RepositoryExceptions.ERROR_READING_FILE)
+
+        return [book for found_author in authors for book in self.read_books_by_author(found_author)]
+
+    def read_books_by_year_range(self, start_year, end_year):
+        return self._read(lambda connection: [
+            self._to_book(row) for row in connection.execute(SELECT_BOOKS_BY_YEAR_RANGE, (start_year, end_year))
+        ])
+
+    def read_editions_by_title(self, title):
+        return self._read(lambda connection: _to_editions(connection.execute(SELECT_EDITIONS_BY_TITLE, (title,))))
+
+    def read_editions_by_author(self, author):
+        return self._read(lambda connection: _to_editions(connection.execute(SELECT_EDITIONS_BY_AUTHOR, (author,))))
+
+    def read_editions_similar_to_title(self, title, limit):
+        try:
+            with self.__write_lock:
+                self._refresh_search_indexes()
+                titles = self.__title_search_index.search(title, limit)
+        except Exception:
+            raise RepositoryException(RepositoryExceptions.ERROR_READING_FILE)
+
+        return [edition for found_title in titles for edition in self.read_editions_by_title(found_title)]
+
+    def read_editions_similar_to_author(self, author, limit):
+        try:
+            with self.__write_lock:
+                self._refresh_search_indexes()
+                authors = self.__author_search_index.search(author, limit)
+        except Exception:
+            raise RepositoryException(RepositoryExceptions.ERROR_READING_FILE)
+
+        return [edition for found_author in authors for edition in self.read_editions_by_author(found_author)]
+
+    def query_books(self, predicate):
+        return [book for book in self.iter_books() if predicate.matches(book)]
+
+    def update_book(self, updated_book: BookEntity):
+        try:
+            self._update_books([updated_book])
+
+            return updated_book
+        except Exception:
+            raise RepositoryException(RepositoryExceptions.ERROR_UPDATING_BOOK)
+
+    def update_books(self, updated_books):
+        updated_books = list(updated_books)
+
+        try:
+            self._update_books(updated_books)
+
+            return updated_books
+        except Exception:
+            raise RepositoryException(RepositoryExceptions.ERROR_UPDATING_BOOK)
+
+    def set_taken(self, book_id, is_taken, expected=None):
+        if expected is None:
+            statement, parameters = UPDATE_TAKEN, (int(bool(is_taken)), book_id)
+        else:
+            # The condition is checked by the database, so writers in other processes cannot both win.
+            statement, parameters = UPDATE_TAKEN_IF, (int(bool(is_taken)), book_id, int(bool(expected)))
+
+        try:
+            with self.__write_lock:
+                with self.__writer:
+                    if self.__writer.execute(statement, parameters).rowcount == 0:
+                        return None
+                    row = self.__writer.execute(SELECT_BOOK_BY_ID, (book_id,)).fetchone()
+                self.__write_generation += 1
+
+            return _to_book(row)
+        except Exception:
+            raise RepositoryException(RepositoryExceptions.ERROR_UPDATING_BOOK)
+
+    def set_taken_many(self, book_ids, is_taken, expected=None):
+        book_ids = list(dict.fromkeys(book_ids))
+        statement = UPDATE_TAKEN if expected is None else UPDATE_TAKEN_IF
+        condition = () if expected is None else (int(bool(expected)),)
+
+        try:
+            with self.__write_lock:
+                # One transaction, each row's condition is still checked by the database.
+                with self.__writer:
+                    changed_ids = [
+                        book_id for book_id in book_ids
+                        if self.__writer.execute(statement, (int(bool(is_taken)), book_id, *condition)).rowcount
+                    ]
+                if changed_ids:
+                    self.__write_generation += 1
+
+            return changed_ids
+        except Exception:
+            raise RepositoryException(RepositoryExceptions.ERROR_UPDATING_BOOK)
+
+    def _insert_books(self, books, may_exist=False):
+        with self.__write_lock:
+            search_indexes_are_current = self._search_indexes_are_current()
+
+            with self.__writer:
+                # Only imported ids can exist already, fresh ids skip the lookup.
+                previous_books = [
+                    self.__writer.execute(SELECT_BOOK_BY_ID, (book.id,)).fetchone() for book in books
+                ] if search_indexes_are_current and may_exist else [None] * len(books)
+                self.__writer.executemany(INSERT_BOOK, [_to_row(book) for book in books])
+            self.__write_generation += 1
+
+            if not search_indexes_are_current:
+                return
+
+            for previous_book, book in zip(previous_books, books):
+                if previous_book is None:
+                    self.__title_search_index.add(book.title)
+                    self.__author_search_index.add(book.author)
+                else:
+                    previous_book = _to_book(previous_book)
+                    self._reindex(self.__title_search_index, SELECT_TITLE_EXISTS, previous_book.title, book.title)
+                    self._reindex(self.__author_search_index, SELECT_AUTHOR_EXISTS, previous_book.author, book.author)
+
+    def _update_books(self, updated_books):
+        with self.__write_lock:
+            search_indexes_are_current = self._search_indexes_are_current()
+
+            with self.__writer:
+                previous_books = [
+                    self.__writer.execute(SELECT_BOOK_BY_ID, (book.id,)).fetchone() for book in updated_books
+                ] if search_indexes_are_current else []
+                self.__writer.executemany(UPDATE_BOOK, [
+                    (book.title, book.author, book.publication_year, int(bool(book.is_taken)), book.id)
+                    for book in updated_books
+                ])
+            self.__write_generation += 1
+
+            for previous_book, updated_book in zip(previous_books, updated_books):
+                if previous_book is None:
+                    continue
+
+                previous_book = _to_book(previous_book)
+                self._reindex(self.__title_search_index, SELECT_TITLE_EXISTS, previous_book.title, updated_book.title)
+                self._reindex(self.__author_search_index, SELECT_AUTHOR_EXISTS, previous_book.author, updated_book.author)
+
+    def _reindex(self, search_index, select_exists, previous_text, text):
+        if previous_text == text:
+            return
+
+        search_index.add(text)
+        if self.__writer.execute(select_exists, (previous_text,)).fetchone() is None:
+            search_index.remove(previous_text)
+
+    def _search_indexes_are_current(self):
+        # Writes only keep built indexes up to date, the next fuzzy search builds missing or stale ones.
+        if self.__title_search_index is None:
+            return False
+
+        if self.__writer.execute(SELECT_DATA_VERSION).fetchone()[0] != self.__data_version:
+            self.__title_search_index = None
+            self.__author_search_index = None
+            return False
+
+        return True
+
+    def _refresh_search_indexes(self):
+        data_version = self.__writer.execute(SELECT_DATA_VERSION).fetchone()[0]
+        if data_version == self.__data_version and self.__title_search_index is not None:
+            return
+
+        self.__title_search_index = TrigramIndex()
+        for (title,) in self.__writer.execute(SELECT_DISTINCT_TITLES):
+            self.__title_search_index.add(title)
+
+        self.__author_search_index = TrigramIndex()
+        for (author,) in self.__writer.execute(SELECT_DISTINCT_AUTHORS):
+            self.__author_search_index.add(author)
+
+        self.__data_version = data_version
+
+    def _to_book(self, row):
+        self.__io_statistics.books_scanned += 1
+        return _to_book(row)
+
+    def _read(self, read):
+        try:
+            return read(self._reader())
+        except Exception:
+            raise RepositoryException(RepositoryExceptions.ERROR_READING_FILE)
+
+    def _reader(self):
+        if self.__database_path == ":memory:":
+            return self.__writer
+
+        connection = getattr(self.__readers, "connection", None)
+        if connection is None:
+            # Not bound to the thread, so that close() may close it from any thread.
+            connection = self.__readers.connection = _connect(self.__database_path, check_same_thread=False)
+            with self.__reader_lock:
+                for thread in [thread for thread in self.__reader_connections if not thread.is_alive()]:
+                    self.__reader_connections.pop(thread).close()
+                self.__reader_connections[threading.current_thread()] = connection
+
+        return connection
+
@@ -0,0 +1,238 @@
+import os
+import uuid
+import heapq
+import threading
+from Library.persistence.persistence.availabilitybitmap import bitmap_file_path, file_signature, read_bitmap, remove_bitmap, \
+    taken_at, write_bit, write_bits
+from Library.persistence.persistence.bookcursor import decode_cursor, sort_key, to_page
+from Library.persistence.persistence.editionindex import EditionIndex
+from Library.persistence.persistence.ibookrepository import IBookRepository
+from Library.persistence.persistence.jsonstream import iter_json_array, write_json_array
+from Library.persistence.persistence.repositoryexception import RepositoryException
+from Library.persistence.persistence.trigramindex import TrigramIndex
+from Library.persistence.persistenceentities.bookentity import BookEntity
+from Library.persistence.persistenceentities.iostatistics import IoStatistics
+from Library.persistence.persistenceentities.repositoryexceptions import RepositoryExceptions
+
+
+class StreamingBookRepository(IBookRepository):
+    def __init__(self, file_path: str):
+        self.__file_path = file_path
+        self.__io_statistics = IoStatistics()
+        self.__write_generation = 0
+        self.__write_lock = threading.Lock()
+
+    @property
+    def io_statistics(self):
+        return self.__io_statistics
+
+    @property
+    def write_generation(self):
+        # The file signatures also move when another process rewrites the files.
+        return (self.__write_generation, file_signature(self.__file_path),
+                file_signature(bitmap_file_path(self.__file_path)))
+
+    def create_book(self, book: BookEntity):
+        try:
+            book.id = str(uuid.uuid4())
+            self._rewrite_books(new_books=[book])
+
+            return book
+        except Exception:
+            raise RepositoryException(RepositoryExceptions.ERROR_CREATING_BOOK)
+
+    def create_books(self, books):
+        books = list(books)
+
+        for book in books:
+            book.id = str(uuid.uuid4())
+
+        return self.import_books(books)
+
+    def import_books(self, books):
+        books = list(books)
+
+        try:
+            self._rewrite_books(new_books=books)
+
+            return books
+        except Exception:
+            raise RepositoryException(RepositoryExceptions.ERROR_CREATING_BOOK)
+
+    def read_books(self):
+        return list(self.iter_books())
+
+    def iter_books(self):
+        try:
+            if not os.path.exists(self.__file_path):
+                return
+
+            bitmap = read_bitmap(self.__file_path)
+            with open(self.__file_path, 'r') as file:
+                # Counted up front, a scan that stops early still reads whole chunks.
+                self.__io_statistics.bytes_read += os.fstat(file.fileno()).st_size
+                for position, book_dict in enumerate(iter_json_array(file)):
+                    book = BookEntity.from_dict(book_dict)
+                    self.__io_statistics.books_scanned += 1
+                    if bitmap is not None:
+                        book.is_taken = taken_at(bitmap, position)
+                    yield book
+
+        except FileNotFoundError:
+            raise RepositoryException(RepositoryExceptions.FILE_NOT_FOUND)
+        except RepositoryException:
+            raise
+        except Exception:
+            raise RepositoryException(RepositoryExceptions.ERROR_READING_FILE)
+
+    def get_books(self, cursor, limit, sort):
+        after_key = decode_cursor(cursor, sort)
+        # A file has no index to seek in, so a page is one scan keeping limit + 1 rows.
+        keyed_books = ((sort_key(book, sort), book) for book in self.iter_books())
+        keyed_books = heapq.nsmallest(limit + 1, (
+            (key, book) for key, book in keyed_books if after_key is None or key > after_key
+        ), key=lambda keyed_book: keyed_book[0])
+
+        return to_page(keyed_books, limit, sort)
+
+    def get_book_by_id(self, book_id):
+        return next((book for book in self.iter_books() if book.id == book_id), None)
+
+    def get_books_by_ids(self, book_ids):
+        book_ids = list(book_ids)
+        wanted_book_ids = set(book_ids)
+        books = {book.id: book for book in self.iter_books() if book.id in wanted_book_ids}
+
+        return [books.get(book_id) for book_id in book_ids]
+
+    def read_books_by_title(self, title):
+        return sorted((book for book in self.iter_books() if book.title == title), key=lambda book: book.publication_year)
+
+    def read_books_by_author(self, author):
+        return sorted((book for book in self.iter_books() if book.author == author), key=lambda book: book.publication_year)
+
+    def read_books_by_year_range(self, start_year, end_year):
+        return sorted((book for book in self.iter_books() if start_year <= book.publication_year <= end_year),
+                      key=lambda book: sort_key(book, "publication_year"))
+
+    def read_books_similar_to_title(self, title, limit):
+        titles = set(self._search_distinct(lambda book: book.title, title, limit))
+
+        return [book for book in self.iter_books() if book.title in titles]
+
+    def read_books_similar_to_author(self, author, limit):
+        authors = set(self._search_distinct(lambda book: book.author, author, limit))
+
+        return [book for book in self.iter_books() if book.author in authors]
+
+    def read_editions_by_title(self, title):
+        return EditionIndex(book for book in self.iter_books() if book.title == title).editions_by_title(title)
+
+    def read_editions_by_author(self, author):
+        return EditionIndex(book for book in self.iter_books() if book.author == author).editions_by_author(author)
+
+    def read_editions_similar_to_title(self, title, limit):
+        titles = self._search_distinct(lambda book: book.title, title, limit)
+        found_titles = set(titles)
+
+        return EditionIndex(book for book in self.iter_books() if book.title in found_titles).editions_by_titles(titles)
+
+    def read_editions_similar_to_author(self, author, limit):
+        authors = self._search_distinct(lambda book: book.author, author, limit)
+        found_authors = set(authors)
+
+        return EditionIndex(book for book in self.iter_books() if book.author in found_authors).editions_by_authors(authors)
+
+    def query_books(self, predicate):
+        return [book for book in self.iter_books() if predicate.matches(book)]
+
+    def update_book(self, updated_book: BookEntity):
+        try:
+            self._rewrite_books(updated_books={updated_book.id: updated_book})
+
+            return updated_book
+        except Exception:
+            raise RepositoryException(RepositoryExceptions.ERROR_UPDATING_BOOK)
+
+    def update_books(self, updated_books):
+        updated_books = list(updated_books)
+
+        try:
+            self._rewrite_books(updated_books={book.id: book for book in updated_books})
+
+            return updated_books
+        except Exception:
+            raise RepositoryException(RepositoryExceptions.ERROR_UPDATING_BOOK)
+
+    def set_taken(self, book_id, is_taken, expected=None):
+        try:
+            with self.__write_lock:
+                # Finding the book is a scan, but only its bit is written back.
+                found = next(((position, book) for position, book in enumerate(self.iter_books()) if book.id == book_id), None)
+                if found is None or (expected is not None and found[1].is_taken != expected):
+                    return None
+
+                position, book = found
+                self.__io_statistics.bytes_written += write_bit(
+                    self.__file_path, position, is_taken, lambda: (book.is_taken for book in self.iter_books()))
+                book.is_taken = is_taken
+                self.__write_generation += 1
+
+            return book
+        except Exception:
+            raise RepositoryException(RepositoryExceptions.ERROR_UPDATING_BOOK)
+
+    def set_taken_many(self, book_ids, is_taken, expected=None):
+        book_ids = list(dict.fromkeys(book_ids))
+        requested_ids = set(book_ids)
+
+        try:
+            with self.__write_lock:
+                # One scan finds every book, and only their bits are written back.
+                changed_positions = {
+                    book.id: position for position, book in enumerate(self.iter_books())
+                    if book.id in requested_ids and (expected is None or book.is_taken == expected)
+                }
+                if not changed_positions:
+                    return []
+
+                self.__io_statistics.bytes_written += write_bits(
+                    self.__file_path, {position: is_taken for position in changed_positions.values()},
+                    lambda: (book.is_taken for book in self.iter_books()))
+                self.__write_generation += 1
+
+            return [book_id for book_id in book_ids if book_id in changed_positions]
+        except Exception:
+            raise RepositoryException(RepositoryExceptions.ERROR_UPDATING_BOOK)
+
+    def _search_distinct(self, get_key, query, limit):
+        # Only the distinct keys are held in memory, never the books themselves.
+        search_index = TrigramIndex()
+        for book in self.iter_books():
+            search_index.add(get_key(book))
+
+        return search_index.search(query, limit)
+
+    def _rewrite_books(self, new_books = (), updated_books = None):
+        with self.__write_lock:
+            self._write_books(new_books, updated_books or {})
+
+    def _write_books(self, new_books, updated_books):
+        temporary_file_path = self.__file_path + ".tmp"
+
+        # New books with an id that is already stored replace it where it stands.
+        pending_books = {book.id: book for book in new_books}
+
+        def books():
+            for book in self.iter_books():
+                yield (pending_books.pop(book.id, None) or updated_books.get(book.id, book)).to_dict()
+            for book in pending_books.values():
+                yield book.to_dict()
+
+        with open(temporary_file_path, 'w') as file:
+            write_json_array(file, books())
+
+        self.__io_statistics.bytes_written += os.path.getsize(temporary_file_path)
+        os.replace(temporary_file_path, self.__file_path)
+        remove_bitmap(self.__file_path)
+        self.__write_generation += 1
@@ -0,0 +1,157 @@
+import heapq
+import math
+import unicodedata
+
+EXACT_MATCH = 0
+PREFIX_MATCH = 1
+SUBSTRING_MATCH = 2
+SIMILAR_MATCH = 3
+
+_NO_TERMS = frozenset()
+
+
+def normalize_text(text):
+    text = unicodedata.normalize("NFKD", str(text)).casefold()
+    text = "".join(character for character in text if not unicodedata.combining(character))
+
+    return " ".join(text.split())
+
+
+def _trigrams(text):
+    return {text[index:index + 3] for index in range(len(text) - 2)}
+
+
+class TrigramIndex:
+    def __init__(self, similarity_threshold: float = 0.3):
+        self.__similarity_threshold = similarity_threshold
+        self.__term_ids = {}
+        self.__terms = []
+        self.__term_texts = []
+        self.__term_trigram_counts = []
+        self.__postings = {}
+
+    def __len__(self):
+        return len(self.__term_ids)
+
+    def add(self, text):
+        term = normalize_text(text)
+        term_id = self.__term_ids.get(term)
+
+        if term_id is None:
+            term_id = len(self.__terms)
+            term_trigrams = _trigrams(f"  {term} ")
+
+            self.__term_ids[term] = term_id
+            self.__terms.append(term)
+            self.__term_texts.append(set())
+            self.__term_trigram_counts.append(len(term_trigrams))
+            for trigram in term_trigrams:
+                self.__postings.setdefault(trigram, set()).add(term_id)
+
+        self.__term_texts[term_id].add(text)
+
+    def remove(self, text):
+        term = normalize_text(text)
+        term_id = self.__term_ids.get(term)
+        if term_id is None:
+            return
+
+        texts = self.__term_texts[term_id]
+        texts.discard(text)
+        if texts:
+            return
+
+        for trigram in _trigrams(f"  {term} "):
+            term_ids = self.__postings[trigram]
+            term_ids.discard(term_id)
+            if not term_ids:
+                del self.__postings[trigram]
+
+        del self.__term_ids[term]
+        self.__terms[term_id] = None
+
+    def search(self, query, limit: int = 20):
+        query_term = normalize_text(query)
+        if not query_term or limit <= 0:
+            return []
+
+        matches = {}
+        exact_term_id = self.__term_ids.get(query_term)
+        if exact_term_id is not None:
+            matches[exact_term_id] = (EXACT_MATCH, 0)
+
+        # Each tier only runs when the cheaper ones cannot fill the page.
+        if len(matches) < limit:
+            matches.update(self._find_prefixed(query_term, matches))
+        if len(matches) < limit:
+            matches.update(self._find_containing(query_term, matches))
+        if len(matches) < limit:
+            matches.update(self._find_similar(query_term, matches))
+
+        ranked_term_ids = heapq.nsmallest(
+            limit, matches, key=lambda term_id: (*matches[term_id], self.__terms[term_id]))
+
+        return [text for term_id in ranked_term_ids for text in sorted(self.__term_texts[term_id])]
+
+    def _find_prefixed(self, query_term, excluded_term_ids):
+        matches = {}
+
+        for term_id in self._intersect_postings(_trigrams(f"  {query_term}")):
+            term = self.__terms[term_id]
+            if term_id not in excluded_term_ids and term.startswith(query_term):
+                matches[term_id] = (PREFIX_MATCH, len(term) - len(query_term))
+
+        return matches
+
+    def _find_containing(self, query_term, excluded_term_ids):
+        # Queries shorter than a trigram are only matched as prefixes.
+        query_trigrams = _trigrams(query_term)
+        if not query_trigrams:
+            return {}
+
+        matches = {}
+
+        for term_id in self._intersect_postings(query_trigrams):
+            term = self.__terms[term_id]
+            if term_id not in excluded_term_ids and query_term in term:
+                matches[term_id] = (SUBSTRING_MATCH, len(term) - len(query_term))
+
+        return matches
+
+    def _find_similar(self, query_term, excluded_term_ids):
+        query_trigrams = sorted(_trigrams(f"  {query_term} "),
+                                key=lambda trigram: len(self.__postings.get(trigram, _NO_TERMS)))
+
+        # A term reaching the threshold shares at least minimum_shared trigrams
+        # with the query, so it must appear in one of the rarest posting lists.
+        minimum_shared = max(1, math.ceil(self.__similarity_threshold * len(query_trigrams)))
+        candidates = set()
+        for trigram in query_trigrams[:len(query_trigrams) - minimum_shared + 1]:
+            candidates.update(self.__postings.get(trigram, _NO_TERMS))
+
+        postings = [self.__postings.get(trigram, _NO_TERMS) for trigram in query_trigrams]
+        matches = {}
+
+        for term_id in candidates:
+            if term_id in excluded_term_ids:
+                continue
+
+            shared = sum(1 for term_ids in postings if term_id in term_ids)
+            similarity = shared / (len(query_trigrams) + self.__term_trigram_counts[term_id] - shared)
+            if similarity >= self.__similarity_threshold:
+                matches[term_id] = (SIMILAR_MATCH, -similarity)
+
+        return matches
+
+    def _intersect_postings(self, trigrams):
+        postings = sorted((self.__postings.get(trigram, _NO_TERMS) for trigram in trigrams), key=len)
+        if not postings:
+            return set()
+
+        candidates = set(postings[0])
+        for term_ids in postings[1:]:
+            candidates.intersection_update(term_ids)
+            if not candidates:
+                break
+
+        return candidates
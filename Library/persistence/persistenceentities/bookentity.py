@@ -1,58 +1,23 @@
 class BookEntity:
-    def __init__(self, title, author, publication_year, id = None, is_taken = False):
-        self._title = title
-        self._author = author
-        self._publication_year = publication_year
-        self._id = id
-        self._is_taken = is_taken
-
-    @property
-    def title(self):
-        return self._title
-
-    @title.setter
-    def title(self, new_title):
-        self._title = new_title
-
-    @property
-    def author(self):
-        return self._author
-
-    @author.setter
-    def author(self, new_author):
-        self._author = new_author
+    __slots__ = ("title", "author", "publication_year", "id", "is_taken")
 
-    @property
-    def publication_year(self):
-        return self._publication_year
-
-    @publication_year.setter
-    def publication_year(self, new_publication_date):
-        self._publication_year = new_publication_date
-
-    @property
-    def id(self):
-        return self._id
-
-    @id.setter
-    def id(self, new_id):
-        self._id = new_id
-
-    @property
-    def is_taken(self):
-        return self._is_taken
+    def __init__(self, title, author, publication_year, id = None, is_taken = False):
+        self.title = title
+        self.author = author
+        self.publication_year = publication_year
+        self.id = id
+        self.is_taken = is_taken
 
-    @is_taken.setter
-    def is_taken(self, is_taken):
-        self._is_taken = is_taken
+    def copy(self):
+        return BookEntity(self.title, self.author, self.publication_year, self.id, self.is_taken)
 
     def to_dict(self):
         return {
-            "title": self._title,
-            "author": self._author,
-            "publication_year": self._publication_year,
-            "id": self._id,
-            "is_taken": self._is_taken
+            "title": self.title,
+            "author": self.author,
+            "publication_year": self.publication_year,
+            "id": self.id,
+            "is_taken": self.is_taken
         }
 
     @staticmethod
@@ -63,4 +28,4 @@ class BookEntity:
             publication_year=int((book_dict.get('publication_year'))),
             id=book_dict.get('id'),
             is_taken=book_dict.get('is_taken', False)
-        )
\ No newline at end of file
+        )
@@ -0,0 +1,16 @@
+class CacheStatistics:
+    def __init__(self, hits = 0, misses = 0, evictions = 0):
+        self.hits = hits
+        self.misses = misses
+        self.evictions = evictions
+
+    @property
+    def requests(self):
+        return self.hits + self.misses
+
+    @property
+    def hit_ratio(self):
+        if self.requests == 0:
+            return 0.0
+
+        return self.hits / self.requests
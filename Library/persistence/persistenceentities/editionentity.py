@@ -0,0 +1,17 @@
+class EditionEntity:
+    __slots__ = ("title", "author", "publication_year", "book_ids", "taken_count")
+
+    def __init__(self, title, author, publication_year, book_ids = None, taken_count = 0):
+        self.title = title
+        self.author = author
+        self.publication_year = publication_year
+        self.book_ids = book_ids if book_ids is not None else []
+        self.taken_count = taken_count
+
+    @property
+    def copy_count(self):
+        return len(self.book_ids)
+
+    @property
+    def available_count(self):
+        return self.copy_count - self.taken_count
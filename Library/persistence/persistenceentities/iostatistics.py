@@ -0,0 +1,5 @@
+class IoStatistics:
+    def __init__(self, bytes_read = 0, bytes_written = 0, books_scanned = 0):
+        self.bytes_read = bytes_read
+        self.bytes_written = bytes_written
+        self.books_scanned = books_scanned
@@ -2,4 +2,8 @@ class RepositoryExceptions:
     ERROR_CREATING_BOOK = "Error creating book"
     FILE_NOT_FOUND = "File of books not found"
     ERROR_READING_FILE = "Error reading file"
-    ERROR_UPDATING_BOOK = "Error updating book"
\ No newline at end of file
+    ERROR_UPDATING_BOOK = "Error updating book"
+    ERROR_MIGRATING_FILE = "Error migrating file of books"
+    ERROR_COMPACTING_LOG = "Error compacting log of books"
+    INVALID_CURSOR = "Invalid page cursor"
+    INVALID_SORT = "Books cannot be sorted by this field"
@@ -0,0 +1,84 @@
+from Library.persistence.persistence.coalescingexecutor import CoalescingExecutor
+from Library.services.services.bookservice import FUZZY_SEARCH_LIMIT, PAGE_SIZE
+from Library.services.services.iasyncbookservice import IAsyncBookService
+from Library.services.services.ibookservice import IBookService
+from Library.services.servicesmodels.bookmodel import BookModel
+
+
+class AsyncBookService(IAsyncBookService):
+    def __init__(self, book_service: IBookService, max_workers: int = 4):
+        self._book_service = book_service
+        self._executor = CoalescingExecutor(max_workers)
+
+    def close(self):
+        self._executor.shutdown()
+
+    async def create_book(self, book: BookModel):
+        return await self._executor.write(self._book_service.create_book, book)
+
+    async def create_books(self, books):
+        return await self._executor.write(self._book_service.create_books, list(books))
+
+    async def buy_book_copy(self, book_id, publication_year):
+        return await self._executor.write(self._book_service.buy_book_copy, book_id, publication_year)
+
+    async def get_all_books(self):
+        return await self._executor.read(("get_all_books",), self._book_service.get_all_books)
+
+    def iter_all_books(self):
+        return self._executor.iterate(self._book_service.iter_all_books)
+
+    async def get_books(self, cursor = None, limit = PAGE_SIZE, sort = "title"):
+        return await self._executor.read(("get_books", cursor, limit, sort), self._book_service.get_books,
+                                         cursor, limit, sort)
+
+    async def take_book(self, book_id):
+        return await self._executor.write(self._book_service.take_book, book_id)
+
+    async def return_book(self, book_id):
+        return await self._executor.write(self._book_service.return_book, book_id)
+
+    async def take_books(self, book_ids):
+        return await self._executor.write(self._book_service.take_books, list(book_ids))
+
+    async def return_books(self, book_ids):
+        return await self._executor.write(self._book_service.return_books, list(book_ids))
+
+    async def search_books_by_title(self, title):
+        return await self._executor.read(("search_books_by_title", title), self._book_service.search_books_by_title,
+                                         title)
+
+    async def search_books_by_author(self, author):
+        return await self._executor.read(("search_books_by_author", author),
+                                         self._book_service.search_books_by_author, author)
+
+    async def fuzzy_search_books_by_title(self, title, limit = FUZZY_SEARCH_LIMIT):
+        return await self._executor.read(("fuzzy_search_books_by_title", title, limit),
+                                         self._book_service.fuzzy_search_books_by_title, title, limit)
+
+    async def fuzzy_search_books_by_author(self, author, limit = FUZZY_SEARCH_LIMIT):
+        return await self._executor.read(("fuzzy_search_books_by_author", author, limit),
+                                         self._book_service.fuzzy_search_books_by_author, author, limit)
+
+    async def search_books_by_year_range(self, start_year, end_year):
+        return await self._executor.read(("search_books_by_year_range", start_year, end_year),
+                                         self._book_service.search_books_by_year_range, start_year, end_year)
+
+    async def query_books(self, predicate):
+        return await self._executor.run(self._book_service.query_books, predicate)
+
+    async def search_editions_by_title(self, title):
+        return await self._executor.read(("search_editions_by_title", title),
+                                         self._book_service.search_editions_by_title, title)
+
+    async def search_editions_by_author(self, author):
+        return await self._executor.read(("search_editions_by_author", author),
+                                         self._book_service.search_editions_by_author, author)
+
+    async def fuzzy_search_editions_by_title(self, title, limit = FUZZY_SEARCH_LIMIT):
+        return await self._executor.read(("fuzzy_search_editions_by_title", title, limit),
+                                         self._book_service.fuzzy_search_editions_by_title, title, limit)
+
+    async def fuzzy_search_editions_by_author(self, author, limit = FUZZY_SEARCH_LIMIT):
+        return await self._executor.read(("fuzzy_search_editions_by_author", author, limit),
+                                         self._book_service.fuzzy_search_editions_by_author, author, limit)
@@ -1,33 +1,57 @@
 from datetime import datetime
+from Library.persistence.persistence.bookcursor import SORT_FIELDS
+from Library.persistence.persistence.bookpredicates import Predicate
 from Library.persistence.persistence.ibookrepository import IBookRepository
 from Library.services.services.bookvalueexception import BookValueException
 from Library.services.services.ibookservice import IBookService
-from Library.services.services.mappers import bookentity_to_bookmodel, bookmodel_to_bookentity
+from Library.services.services.lrucache import LruCache
+from Library.services.services.stripedlock import StripedLock
+from Library.services.services.mappers import bookentities_to_bookmodels, bookentity_to_bookmodel, bookmodel_to_bookentity, \
+    editionentities_to_editionmodels
+from Library.services.servicesmodels.bookbatchresult import BookBatchResult
 from Library.services.servicesmodels.bookmodel import BookModel
-from Library.services.servicesmodels.valueerrors import BookServiceExceptions
+from Library.services.servicesmodels.bookoperationstatus import BookOperationStatus
+from Library.services.servicesmodels.bookpagemodel import BookPageModel
+from Library.services.servicesmodels.bookserviceexceptions import BookServiceExceptions
+
+FUZZY_SEARCH_LIMIT = 20
+PAGE_SIZE = 20
+SEARCH_CACHE_SIZE = 256
 
 
 class BookService(IBookService):
-    def __init__(self, book_repository: IBookRepository):
+    def __init__(self, book_repository: IBookRepository, search_cache_size: int = SEARCH_CACHE_SIZE):
         self._book_repository = book_repository
+        self._book_locks = StripedLock()
+        self._search_cache = LruCache(search_cache_size) if search_cache_size > 0 else None
 
-    def create_book(self, book: BookModel):
-        if self._is_null_or_empty(book.author):
-            raise ValueError(BookServiceExceptions.AUTHOR_NULL_OR_EMPTY)
-        
-        if self._is_null_or_empty(book.title):
-            raise ValueError(BookServiceExceptions.TITLE_NULL_OR_EMPTY)
+    @property
+    def search_cache_statistics(self):
+        return self._search_cache.statistics if self._search_cache is not None else None
 
-        if self._is_null_or_empty(book.publication_year):
-            raise ValueError(BookServiceExceptions.PUBLICATION_YEAR_NULL_OR_EMPTY)
-        
-        book.publication_year = self._change_publication_year_type(book.publication_year)
+    def create_book(self, book: BookModel):
+        self._validate_book(book)
         
         new_book = self._book_repository.create_book(bookmodel_to_bookentity(book))
         book_model = bookentity_to_bookmodel(new_book)
 
         return book_model
 
+    def create_books(self, books):
+        valid_books = []
+        failures = []
+
+        for index, book in enumerate(books):
+            try:
+                self._validate_book(book)
+                valid_books.append(bookmodel_to_bookentity(book))
+            except ValueError as e:
+                failures.append((index, str(e)))
+
+        created_books = self._book_repository.create_books(valid_books) if valid_books else []
+
+        return BookBatchResult([bookentity_to_bookmodel(book) for book in created_books], failures)
+
     def buy_book_copy(self, book_id, publication_year):        
         if self._is_null_or_empty(publication_year):
             publication_year = datetime.now().year
@@ -40,48 +64,155 @@ class BookService(IBookService):
         
 
     def get_all_books(self):
-        books = self._book_repository.read_books()
-        return  [bookentity_to_bookmodel(book) for book in books]
+        return list(self.iter_all_books())
+
+    def iter_all_books(self):
+        return bookentities_to_bookmodels(self._book_repository.iter_books())
     
-    def take_book(self, book_id):
-        book = self._get_book(book_id)
-        if book.is_taken:
-            raise BookValueException(BookServiceExceptions.BOOK_ALREADY_TAKEN)
+    def get_books(self, cursor = None, limit = PAGE_SIZE, sort = "title"):
+        if sort not in SORT_FIELDS:
+            raise ValueError(BookServiceExceptions.INVALID_SORT)
 
-        book.is_taken = True
-        book = bookmodel_to_bookentity(book)
-        
-        return bookentity_to_bookmodel(self._book_repository.update_book(book))
+        if not isinstance(limit, int) or limit <= 0:
+            raise ValueError(BookServiceExceptions.INVALID_PAGE_LIMIT)
+
+        page = self._book_repository.get_books(cursor, limit, sort)
+
+        return BookPageModel(list(bookentities_to_bookmodels(page.books)), page.next_cursor)
+    
+    def take_book(self, book_id):
+        return self._change_book_taken(book_id, True, BookServiceExceptions.BOOK_ALREADY_TAKEN)
         
     def return_book(self, book_id):
-        book = self._get_book(book_id)
-        if not book.is_taken:
-            raise BookValueException(BookServiceExceptions.BOOK_ALREADY_IN_LIBRARY)
+        return self._change_book_taken(book_id, False, BookServiceExceptions.BOOK_ALREADY_IN_LIBRARY)
 
-        book.is_taken = False
-        
-        return self._book_repository.update_book(book)
+    def take_books(self, book_ids):
+        return self._change_books_taken(book_ids, True, BookOperationStatus.ALREADY_TAKEN)
 
-    def search_books_by_title(self, title):
-        all_books = self.get_all_books()
-        found_books = list(filter(lambda book: book.title == title, all_books))
+    def return_books(self, book_ids):
+        return self._change_books_taken(book_ids, False, BookOperationStatus.ALREADY_IN_LIBRARY)
 
-        return self._filter_books(found_books)
+    def search_books_by_title(self, title):
+        # The repository returns the copies ordered by publication year already.
+        return self._cached_search(("title", title), self._book_repository.read_books_by_title, title)
     
     def search_books_by_author(self, author):
-        all_books = self.get_all_books()
-        found_books = list(filter(lambda book: book.author == author, all_books))
+        return self._cached_search(("author", author), self._book_repository.read_books_by_author, author)
 
-        return self._filter_books(found_books)
+    def search_books_by_year_range(self, start_year, end_year):
+        if self._is_null_or_empty(start_year) or self._is_null_or_empty(end_year):
+            raise ValueError(BookServiceExceptions.PUBLICATION_YEAR_NULL_OR_EMPTY)
 
-    def _filter_books(self, books):
-        filtered_books = self._filter_unique_books(books)
-        if filtered_books:
-            filtered_books.sort(key=lambda book: book.publication_year)
-            return filtered_books
-        else:
+        start_year = self._change_publication_year_type(start_year)
+        end_year = self._change_publication_year_type(end_year)
+        if start_year > end_year:
+            raise ValueError(BookServiceExceptions.INVALID_YEAR_RANGE)
+
+        found_books = self._book_repository.read_books_by_year_range(start_year, end_year)
+
+        return self._filter_unique_books(bookentities_to_bookmodels(found_books))
+
+    def fuzzy_search_books_by_title(self, title, limit = FUZZY_SEARCH_LIMIT):
+        if self._is_null_or_empty(title):
             return []
-    
+
+        found_books = self._book_repository.read_books_similar_to_title(title, limit)
+
+        return self._filter_unique_books(bookentities_to_bookmodels(found_books))
+
+    def fuzzy_search_books_by_author(self, author, limit = FUZZY_SEARCH_LIMIT):
+        if self._is_null_or_empty(author):
+            return []
+
+        found_books = self._book_repository.read_books_similar_to_author(author, limit)
+
+        return self._filter_unique_books(bookentities_to_bookmodels(found_books))
+
+    def query_books(self, predicate: Predicate):
+        if not isinstance(predicate, Predicate):
+            raise ValueError(BookServiceExceptions.INVALID_QUERY)
+
+        return list(bookentities_to_bookmodels(self._book_repository.query_books(predicate)))
+
+    def search_editions_by_title(self, title):
+        found_editions = self._book_repository.read_editions_by_title(title)
+
+        return list(editionentities_to_editionmodels(found_editions))
+
+    def search_editions_by_author(self, author):
+        found_editions = self._book_repository.read_editions_by_author(author)
+
+        return list(editionentities_to_editionmodels(found_editions))
+
+    def fuzzy_search_editions_by_title(self, title, limit = FUZZY_SEARCH_LIMIT):
+        if self._is_null_or_empty(title):
+            return []
+
+        return list(editionentities_to_editionmodels(self._book_repository.read_editions_similar_to_title(title, limit)))
+
+    def fuzzy_search_editions_by_author(self, author, limit = FUZZY_SEARCH_LIMIT):
+        if self._is_null_or_empty(author):
+            return []
+
+        return list(editionentities_to_editionmodels(self._book_repository.read_editions_similar_to_author(author, limit)))
+
+    def _change_book_taken(self, book_id, is_taken, conflict_message):
+        with self._book_locks.lock(book_id):
+            book = self._get_book(book_id)
+            if book.is_taken == is_taken:
+                raise BookValueException(conflict_message)
+
+            # The repository sets the flag only if it still holds the checked value, other services may share it.
+            changed_book = self._book_repository.set_taken(book_id, is_taken, not is_taken)
+            if changed_book is None:
+                raise BookValueException(conflict_message)
+
+            return bookentity_to_bookmodel(changed_book)
+
+    def _change_books_taken(self, book_ids, is_taken, conflict_status):
+        book_ids = list(book_ids)
+
+        with self._book_locks.lock_all(book_ids):
+            return self._change_locked_books_taken(book_ids, is_taken, conflict_status)
+
+    def _change_locked_books_taken(self, book_ids, is_taken, conflict_status):
+        existing_books = self._book_repository.get_books_by_ids(book_ids)
+        books = {book.id: bookentity_to_bookmodel(book) for book in existing_books if book is not None}
+
+        # One conditional write for the batch, books changed elsewhere since the read are left alone.
+        candidate_ids = [book_id for book_id, book in books.items() if book.is_taken != is_taken]
+        changed_ids = set(self._book_repository.set_taken_many(candidate_ids, is_taken, not is_taken)) \
+            if candidate_ids else set()
+
+        results = []
+        for book_id in book_ids:
+            if book_id not in books:
+                results.append((book_id, BookOperationStatus.NOT_FOUND))
+            elif book_id in changed_ids:
+                changed_ids.remove(book_id)
+                results.append((book_id, BookOperationStatus.OK))
+            else:
+                results.append((book_id, conflict_status))
+
+        return results
+
+    def _cached_search(self, key, read_books, query):
+        # The generation is read before the search, so a concurrent write can only make the entry miss.
+        generation = getattr(self._book_repository, "write_generation", None)
+        if self._search_cache is None or generation is None:
+            return self._filter_unique_books(bookentities_to_bookmodels(read_books(query)))
+
+        # Entries are immutable rows, every caller gets models of its own to change.
+        rows = self._search_cache.get(key, generation)
+        if rows is None:
+            found_books = self._filter_unique_books(bookentities_to_bookmodels(read_books(query)))
+            self._search_cache.put(key, generation, tuple(
+                (book.title, book.author, book.publication_year, book.id, book.is_taken) for book in found_books))
+
+            return found_books
+
+        return [BookModel(*row) for row in rows]
+
     def _filter_unique_books(self, books):
         unique_books = set()
         filtered_books = []
@@ -95,22 +226,32 @@ class BookService(IBookService):
 
         return filtered_books
 
+    def _validate_book(self, book: BookModel):
+        if self._is_null_or_empty(book.author):
+            raise ValueError(BookServiceExceptions.AUTHOR_NULL_OR_EMPTY)
+        
+        if self._is_null_or_empty(book.title):
+            raise ValueError(BookServiceExceptions.TITLE_NULL_OR_EMPTY)
+
+        if self._is_null_or_empty(book.publication_year):
+            raise ValueError(BookServiceExceptions.PUBLICATION_YEAR_NULL_OR_EMPTY)
+        
+        book.publication_year = self._change_publication_year_type(book.publication_year)
+
     def _is_null_or_empty(self, value: str):
         return value is None or value == ""
     
     def _get_book(self, book_id):
-        existing_books = self.get_all_books()
+        book = self._book_repository.get_book_by_id(book_id)
+        if book is None:
+            raise BookValueException(BookServiceExceptions.BOOK_ID_NOT_EXIST)
 
-        for book in existing_books:
-            if book.id == book_id:
-                return book
-            
-        raise BookValueException(BookServiceExceptions.BOOK_ID_NOT_EXIST)
+        return bookentity_to_bookmodel(book)
         
     
     def _change_publication_year_type(self, year):
             try:
                 return int(year)
-            except ValueError:
+            except (ValueError, TypeError):
                 raise ValueError(BookServiceExceptions.PUBLICATION_YEAR_NOT_INTEGER)
                 
\ No newline at end of file
@@ -0,0 +1,84 @@
+from abc import ABC, abstractmethod
+from Library.services.servicesmodels.bookmodel import BookModel
+
+
+class IAsyncBookService(ABC):
+    @abstractmethod
+    async def create_book(self, book: BookModel):
+        pass
+
+    @abstractmethod
+    async def create_books(self, books):
+        pass
+
+    @abstractmethod
+    async def buy_book_copy(self, book_id, publication_year):
+        pass
+
+    @abstractmethod
+    async def get_all_books(self):
+        pass
+
+    @abstractmethod
+    def iter_all_books(self):
+        pass
+
+    @abstractmethod
+    async def get_books(self, cursor, limit, sort):
+        pass
+
+    @abstractmethod
+    async def take_book(self, book_id):
+        pass
+
+    @abstractmethod
+    async def return_book(self, book_id):
+        pass
+
+    @abstractmethod
+    async def take_books(self, book_ids):
+        pass
+
+    @abstractmethod
+    async def return_books(self, book_ids):
+        pass
+
+    @abstractmethod
+    async def search_books_by_title(self, title):
+        pass
+
+    @abstractmethod
+    async def search_books_by_author(self, author):
+        pass
+
+    @abstractmethod
+    async def fuzzy_search_books_by_title(self, title, limit):
+        pass
+
+    @abstractmethod
+    async def fuzzy_search_books_by_author(self, author, limit):
+        pass
+
+    @abstractmethod
+    async def search_books_by_year_range(self, start_year, end_year):
+        pass
+
+    @abstractmethod
+    async def query_books(self, predicate):
+        pass
+
+    @abstractmethod
+    async def search_editions_by_title(self, title):
+        pass
+
+    @abstractmethod
+    async def search_editions_by_author(self, author):
+        pass
+
+    @abstractmethod
+    async def fuzzy_search_editions_by_title(self, title, limit):
+        pass
+
+    @abstractmethod
+    async def fuzzy_search_editions_by_author(self, author, limit):
+        pass
@@ -7,6 +7,10 @@ class IBookService(ABC):
     def create_book(self, book: BookModel):
         pass
 
+    @abstractmethod
+    def create_books(self, books):
+        pass
+
     @abstractmethod
     def buy_book_copy(self, book_id, publication_year):
         pass
@@ -15,6 +19,14 @@ class IBookService(ABC):
     def get_all_books(self):
         pass
 
+    @abstractmethod
+    def iter_all_books(self):
+        pass
+
+    @abstractmethod
+    def get_books(self, cursor, limit, sort):
+        pass
+
     @abstractmethod
     def take_book(self, book_id):
         pass
@@ -23,10 +35,50 @@ class IBookService(ABC):
     def return_book(self, book_id):
         pass
 
+    @abstractmethod
+    def take_books(self, book_ids):
+        pass
+
+    @abstractmethod
+    def return_books(self, book_ids):
+        pass
+
     @abstractmethod
     def search_books_by_title(self, title):
         pass
 
     @abstractmethod
     def search_books_by_author(self, author):
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def fuzzy_search_books_by_title(self, title, limit):
+        pass
+
+    @abstractmethod
+    def fuzzy_search_books_by_author(self, author, limit):
+        pass
+
+    @abstractmethod
+    def search_books_by_year_range(self, start_year, end_year):
+        pass
+
+    @abstractmethod
+    def query_books(self, predicate):
+        pass
+
+    @abstractmethod
+    def search_editions_by_title(self, title):
+        pass
+
+    @abstractmethod
+    def search_editions_by_author(self, author):
+        pass
+
+    @abstractmethod
+    def fuzzy_search_editions_by_title(self, title, limit):
+        pass
+
+    @abstractmethod
+    def fuzzy_search_editions_by_author(self, author, limit):
+        pass
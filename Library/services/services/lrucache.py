@@ -0,0 +1,40 @@
+import threading
+from collections import OrderedDict
+from Library.persistence.persistenceentities.cachestatistics import CacheStatistics
+
+
+class LruCache:
+    def __init__(self, maximum_size: int):
+        self.__maximum_size = maximum_size
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__statistics = CacheStatistics()
+
+    def __len__(self):
+        return len(self.__entries)
+
+    @property
+    def statistics(self):
+        with self.__lock:
+            return CacheStatistics(self.__statistics.hits, self.__statistics.misses, self.__statistics.evictions)
+
+    def get(self, key, generation):
+        with self.__lock:
+            entry = self.__entries.get(key)
+            # An entry written under an older generation may be stale and is never served.
+            if entry is None or entry[0] != generation:
+                self.__statistics.misses += 1
+                return None
+
+            self.__entries.move_to_end(key)
+            self.__statistics.hits += 1
+            return entry[1]
+
+    def put(self, key, generation, value):
+        with self.__lock:
+            self.__entries[key] = (generation, value)
+            self.__entries.move_to_end(key)
+
+            while len(self.__entries) > self.__maximum_size:
+                self.__entries.popitem(last=False)
+                self.__statistics.evictions += 1
@@ -1,9 +1,20 @@
 from Library.persistence.persistenceentities.bookentity import BookEntity
+from Library.persistence.persistenceentities.editionentity import EditionEntity
 from Library.services.servicesmodels.bookmodel import BookModel
+from Library.services.servicesmodels.editionmodel import EditionModel
 
 
 def bookmodel_to_bookentity(book: BookModel):
     return BookEntity(book.title, book.author, book.publication_year, book.id, book.is_taken)
 
 def bookentity_to_bookmodel(book: BookEntity) -> BookModel:
-    return BookModel(book.title, book.author, book.publication_year, book.id, book.is_taken)
\ No newline at end of file
+    return BookModel(book.title, book.author, book.publication_year, book.id, book.is_taken)
+
+def bookentities_to_bookmodels(books):
+    return map(bookentity_to_bookmodel, books)
+
+def editionentity_to_editionmodel(edition: EditionEntity) -> EditionModel:
+    return EditionModel(edition.title, edition.author, edition.publication_year, list(edition.book_ids), edition.taken_count)
+
+def editionentities_to_editionmodels(editions):
+    return map(editionentity_to_editionmodel, editions)
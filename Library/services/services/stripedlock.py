@@ -0,0 +1,22 @@
+import threading
+from contextlib import ExitStack, contextmanager
+
+STRIPE_COUNT = 64
+
+
+class StripedLock:
+    def __init__(self, stripe_count: int = STRIPE_COUNT):
+        self.__stripes = [threading.Lock() for _ in range(stripe_count)]
+
+    def lock(self, key):
+        return self.__stripes[hash(key) % len(self.__stripes)]
+
+    @contextmanager
+    def lock_all(self, keys):
+        # Stripes are always taken in index order, so batches cannot deadlock each other.
+        stripe_indexes = sorted({hash(key) % len(self.__stripes) for key in keys})
+
+        with ExitStack() as stack:
+            for stripe_index in stripe_indexes:
+                stack.enter_context(self.__stripes[stripe_index])
+            yield
@@ -0,0 +1,12 @@
+class BookBatchResult:
+    def __init__(self, created_books, failures):
+        self._created_books = created_books
+        self._failures = failures
+
+    @property
+    def created_books(self):
+        return self._created_books
+
+    @property
+    def failures(self):
+        return self._failures
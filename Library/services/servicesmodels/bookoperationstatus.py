@@ -0,0 +1,5 @@
+class BookOperationStatus:
+    OK = "ok"
+    ALREADY_TAKEN = "already taken"
+    ALREADY_IN_LIBRARY = "already in library"
+    NOT_FOUND = "not found"
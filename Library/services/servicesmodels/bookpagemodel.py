@@ -0,0 +1,6 @@
+class BookPageModel:
+    __slots__ = ("books", "next_cursor")
+
+    def __init__(self, books, next_cursor = None):
+        self.books = books
+        self.next_cursor = next_cursor
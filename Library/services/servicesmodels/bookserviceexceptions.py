@@ -5,4 +5,8 @@ class BookServiceExceptions:
     BOOK_ALREADY_TAKEN = "This book is already taken"
     BOOK_ALREADY_IN_LIBRARY = "This book is already in the library"
     BOOK_ID_NOT_EXIST = "Book with such id doesn't exist"
-    PUBLICATION_YEAR_NOT_INTEGER = "Publication year must be an integer"
\ No newline at end of file
+    PUBLICATION_YEAR_NOT_INTEGER = "Publication year must be an integer"
+    INVALID_SORT = "Books can be sorted only by id, title, author or publication_year"
+    INVALID_PAGE_LIMIT = "Page limit must be a positive integer"
+    INVALID_YEAR_RANGE = "Start year cannot be after end year"
+    INVALID_QUERY = "Books can only be queried with a predicate"
\ No newline at end of file
@@ -0,0 +1,166 @@
+import asyncio
+import threading
+import pytest
+from Library.persistence.persistence.asyncbookrepository import AsyncBookRepository
+from Library.persistence.persistence.bookrepository import BookRepository
+from Library.persistence.persistence.coalescingexecutor import CoalescingExecutor
+from Library.persistence.persistence.sqlitebookrepository import SqliteBookRepository
+from Library.persistence.persistenceentities.bookentity import BookEntity
+from Library.services.services.asyncbookservice import AsyncBookService
+from Library.services.services.bookservice import BookService
+from Library.services.servicesmodels.bookmodel import BookModel
+from faker import Faker
+
+fake = Faker()
+
+@pytest.fixture
+def book_repository(tmp_path):
+    return BookRepository(str(tmp_path / "books.json"))
+
+class _SlowBookRepository:
+    def __init__(self, book_repository):
+        self.book_repository = book_repository
+        self.title_reads = 0
+        self.release = threading.Event()
+
+    def read_books_by_title(self, title):
+        self.title_reads += 1
+        self.release.wait(5)
+        return self.book_repository.read_books_by_title(title)
+
+def _new_book():
+    return BookEntity(fake.word(), fake.name(), int(fake.year()))
+
+def test_given_created_books_when_read_asynchronously_then_books_are_returned(book_repository):
+    # Given
+    async_book_repository = AsyncBookRepository(book_repository)
+
+    async def create_and_read():
+        created_books = await async_book_repository.create_books([_new_book() for _ in range(3)])
+        return created_books, await async_book_repository.read_books()
+
+    # When
+    created_books, books = asyncio.run(create_and_read())
+    async_book_repository.close()
+
+    # Then
+    assert [book.to_dict() for book in books] == [book.to_dict() for book in created_books]
+
+def test_given_concurrent_identical_reads_when_awaited_then_repository_is_read_once(book_repository):
+    # Given
+    book = book_repository.create_book(_new_book())
+    slow_book_repository = _SlowBookRepository(book_repository)
+    async_book_repository = AsyncBookRepository(slow_book_repository)
+
+    async def read_concurrently():
+        reads = [asyncio.ensure_future(async_book_repository.read_books_by_title(book.title)) for _ in range(5)]
+        await asyncio.sleep(0.05)
+        slow_book_repository.release.set()
+        return await asyncio.gather(*reads)
+
+    # When
+    results = asyncio.run(read_concurrently())
+    async_book_repository.close()
+
+    # Then
+    assert slow_book_repository.title_reads == 1
+    assert all([found_book.id for found_book in books] == [book.id] for books in results)
+
+def test_given_coalesced_reads_when_one_result_is_changed_then_other_callers_do_not_see_it(book_repository):
+    # Given
+    book = book_repository.create_book(_new_book())
+    slow_book_repository = _SlowBookRepository(book_repository)
+    async_book_repository = AsyncBookRepository(slow_book_repository)
+
+    async def read_concurrently():
+        reads = [asyncio.ensure_future(async_book_repository.read_books_by_title(book.title)) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        slow_book_repository.release.set()
+        return await asyncio.gather(*reads)
+
+    # When
+    results = asyncio.run(read_concurrently())
+    async_book_repository.close()
+    results[0][0].title = "changed"
+    results[0].clear()
+
+    # Then
+    assert slow_book_repository.title_reads == 1
+    assert all([found_book.title for found_book in books] == [book.title] for books in results[1:])
+
+def test_given_books_when_iterated_asynchronously_then_all_books_are_yielded(book_repository):
+    # Given
+    created_books = book_repository.create_books([_new_book() for _ in range(5)])
+    async_book_repository = AsyncBookRepository(book_repository)
+
+    async def collect():
+        return [book async for book in async_book_repository.iter_books()]
+
+    # When
+    books = asyncio.run(collect())
+    async_book_repository.close()
+
+    # Then
+    assert [book.id for book in books] == [book.id for book in created_books]
+
+def test_given_sqlite_books_when_iterated_asynchronously_then_all_batches_are_read_on_one_thread(tmp_path):
+    # Given
+    book_repository = SqliteBookRepository(str(tmp_path / "books.db"))
+    created_books = book_repository.create_books([_new_book() for _ in range(5000)])
+    async_book_repository = AsyncBookRepository(book_repository)
+    async_book_service = AsyncBookService(BookService(book_repository))
+
+    async def collect():
+        books = [book async for book in async_book_repository.iter_books()]
+        models = [model async for model in async_book_service.iter_all_books()]
+        return books, models
+
+    # When
+    books, models = asyncio.run(collect())
+    async_book_repository.close()
+    async_book_service.close()
+
+    # Then
+    assert [book.id for book in books] == [book.id for book in created_books]
+    assert [model.id for model in models] == [book.id for book in created_books]
+
+def test_given_many_concurrent_iterations_when_awaited_then_they_share_the_bounded_pool():
+    # Given
+    executor = CoalescingExecutor(max_workers=2)
+    thread_ids = set()
+
+    def numbers():
+        for number in range(3):
+            thread_ids.add(threading.get_ident())
+            yield number
+
+    async def collect():
+        async def collect_one():
+            return [number async for number in executor.iterate(numbers, batch_size=1)]
+
+        return await asyncio.gather(*(collect_one() for _ in range(20)))
+
+    # When
+    results = asyncio.run(collect())
+    executor.shutdown()
+
+    # Then
+    assert results == [[0, 1, 2]] * 20
+    assert len(thread_ids) <= 2
+
+def test_given_available_book_when_taken_asynchronously_then_search_sees_taken_book(book_repository):
+    # Given
+    async_book_service = AsyncBookService(BookService(book_repository))
+
+    async def take_and_search():
+        book = await async_book_service.create_book(BookModel(fake.word(), fake.name(), 2000))
+        await async_book_service.take_book(book.id)
+        return await async_book_service.search_books_by_title(book.title)
+
+    # When
+    books = asyncio.run(take_and_search())
+    async_book_service.close()
+
+    # Then
+    assert len(books) == 1
+    assert books[0].is_taken is True
@@ -0,0 +1,114 @@
+import io
+import json
+import pytest
+from Library.consoleapp.consoleapp.batchrunner import BatchRunner
+from Library.persistence.persistence.bookrepository import BookRepository
+from Library.persistence.persistence.mmapbookrepository import MmapBookRepository
+from Library.services.services.bookservice import BookService
+from Library.services.servicesmodels.bookserviceexceptions import BookServiceExceptions
+from faker import Faker
+
+fake = Faker()
+
+@pytest.fixture
+def book_service(tmp_path):
+    return BookService(BookRepository(str(tmp_path / "books.json")))
+
+def _run(book_service, operations):
+    output = io.StringIO()
+    lines = [operation if isinstance(operation, str) else json.dumps(operation) for operation in operations]
+    summary = BatchRunner(book_service).run(lines, output)
+
+    return [json.loads(line) for line in output.getvalue().splitlines()], summary
+
+def test_given_replayed_traffic_when_run_then_results_follow_input_order(book_service):
+    # Given
+    title = fake.word()
+    operations = [
+        {"op": "create", "ref": "first", "title": title, "author": fake.name(), "publication_year": 2001},
+        {"op": "create", "title": title, "author": fake.name(), "publication_year": ""},
+        {"op": "take", "book_ref": "first"},
+        {"op": "take", "book_ref": "first"},
+        {"op": "return", "book_ref": "first"},
+        {"op": "buy_copy", "book_ref": "first", "publication_year": 2020},
+        {"op": "search", "title": title},
+    ]
+
+    # When
+    results, summary = _run(book_service, operations)
+
+    # Then
+    assert [result["op"] for result in results] == ["create", "create", "take", "take", "return", "buy_copy", "search"]
+    assert [result["ok"] for result in results] == [True, False, True, False, True, True, True]
+    assert results[1]["error"] == BookServiceExceptions.PUBLICATION_YEAR_NULL_OR_EMPTY
+    assert results[3]["error"] == BookServiceExceptions.BOOK_ALREADY_TAKEN
+    assert [book["publication_year"] for book in results[6]["books"]] == [2001, 2020]
+    assert summary.succeeded == 5
+    assert summary.failed == 2
+
+def test_given_consecutive_creates_when_run_then_repository_is_written_once(book_service, tmp_path):
+    # Given
+    book_repository = BookRepository(str(tmp_path / "batched.json"))
+    operations = [{"op": "create", "title": fake.word(), "author": fake.name(), "publication_year": 2000} for _ in range(50)]
+
+    # When
+    results, _ = _run(BookService(book_repository), operations)
+
+    # Then
+    assert all(result["ok"] for result in results)
+    assert book_repository.io_statistics.bytes_written == (tmp_path / "batched.json").stat().st_size
+
+def test_given_unknown_book_ref_in_batch_when_run_then_only_that_operation_fails(tmp_path):
+    # Given
+    book_repository = MmapBookRepository(str(tmp_path / "books.bin"))
+    operations = [
+        {"op": "create", "ref": "first", "title": fake.word(), "author": fake.name(), "publication_year": 2001},
+        {"op": "take", "book_ref": "missing"},
+        {"op": "take", "book_ref": "first"},
+        {"op": "return"},
+        {"op": "buy_copy", "book_ref": "missing", "publication_year": 2020},
+    ]
+
+    # When
+    results, summary = _run(BookService(book_repository), operations)
+    book_repository.close()
+
+    # Then
+    assert [result["ok"] for result in results] == [True, False, True, False, False]
+    assert results[1]["error"] == "Unknown book reference: missing"
+    assert results[4]["error"] == "Unknown book reference: missing"
+    assert results[2]["book_id"] == results[0]["book"]["id"]
+    assert (summary.succeeded, summary.failed) == (2, 3)
+
+def test_given_non_string_book_ids_in_batch_when_run_then_only_those_operations_fail(tmp_path):
+    # Given
+    book_repository = MmapBookRepository(str(tmp_path / "books.bin"))
+    operations = [
+        {"op": "create", "ref": "first", "title": fake.word(), "author": fake.name(), "publication_year": 2001},
+        {"op": "take", "book_id": 123},
+        {"op": "take", "book_id": [1]},
+        {"op": "take", "book_ref": [1]},
+        {"op": "take", "book_ref": "first"},
+        {"op": "buy_copy", "book_id": 123, "publication_year": 2020},
+    ]
+
+    # When
+    results, summary = _run(BookService(book_repository), operations)
+    book_repository.close()
+
+    # Then
+    assert [result["ok"] for result in results] == [True, False, False, False, True, False]
+    assert results[1]["error"] == "A book_id must be a string: 123"
+    assert results[2]["error"] == "A book_id must be a string: [1]"
+    assert results[3]["error"] == "Unknown book reference: [1]"
+    assert results[5]["error"] == "A book_id must be a string: 123"
+    assert (summary.succeeded, summary.failed) == (2, 4)
+
+def test_given_malformed_and_unknown_lines_when_run_then_failures_are_reported(book_service):
+    # When
+    results, summary = _run(book_service, ["{not json", {"op": "delete"}, {"op": "take", "book_id": "missing"}])
+
+    # Then
+    assert [result["ok"] for result in results] == [False, False, False]
+    assert results[2]["error"] == BookServiceExceptions.BOOK_ID_NOT_EXIST
+    assert summary.operation_counts == {"invalid": 1, "delete": 1, "take": 1}
@@ -0,0 +1,57 @@
+import pytest
+from Library.persistence.persistence.bookcodecs import CODECS, JSON_CODEC, PICKLE_CODEC, convert_book_file, read_book_file
+from Library.persistence.persistence.bookrepository import BookRepository
+from Library.persistence.persistenceentities.bookentity import BookEntity
+from faker import Faker
+
+fake = Faker()
+
+@pytest.fixture
+def book_file_path(tmp_path):
+    return str(tmp_path / "books.db")
+
+def _new_book():
+    return BookEntity(fake.word(), fake.name(), int(fake.year()))
+
+@pytest.mark.parametrize("codec", CODECS.keys())
+def test_given_codec_when_books_are_written_then_reopened_repository_reads_them(codec, book_file_path):
+    # Given
+    created_books = BookRepository(book_file_path, codec=codec).create_books([_new_book() for _ in range(3)])
+
+    # When
+    books = BookRepository(book_file_path, codec=codec).read_books()
+
+    # Then
+    assert [book.to_dict() for book in books] == [book.to_dict() for book in created_books]
+
+def test_given_pickled_file_when_json_repository_writes_then_file_is_detected_and_converted(book_file_path):
+    # Given
+    created_book = BookRepository(book_file_path, codec=PICKLE_CODEC).create_book(_new_book())
+    book_repository = BookRepository(book_file_path, codec=JSON_CODEC)
+
+    # When
+    found_book = book_repository.get_book_by_id(created_book.id)
+    book_repository.create_book(_new_book())
+
+    # Then
+    assert found_book.to_dict() == created_book.to_dict()
+    with open(book_file_path, 'rb') as file:
+        assert file.read(1) == b"["
+
+def test_given_json_file_when_converted_to_pickle_then_books_are_kept_and_file_shrinks(tmp_path, book_file_path):
+    # Given
+    created_books = BookRepository(book_file_path).create_books([_new_book() for _ in range(50)])
+    pickle_file_path = str(tmp_path / "books.pickle")
+
+    # When
+    book_count = convert_book_file(book_file_path, pickle_file_path, PICKLE_CODEC)
+
+    # Then
+    assert book_count == 50
+    assert [book.to_dict() for book in read_book_file(pickle_file_path)] == [book.to_dict() for book in created_books]
+    assert (tmp_path / "books.pickle").stat().st_size < (tmp_path / "books.db").stat().st_size
+
+def test_given_unknown_codec_when_repository_is_created_then_raises_valueerror(book_file_path):
+    # When/Then
+    with pytest.raises(ValueError):
+        BookRepository(book_file_path, codec="yaml")
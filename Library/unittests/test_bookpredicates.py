@@ -0,0 +1,31 @@
+import pytest
+from Library.persistence.persistence.bookpredicates import field
+from Library.persistence.persistenceentities.bookentity import BookEntity
+from faker import Faker
+
+fake = Faker()
+
+def test_given_compound_predicate_when_matches_then_every_condition_is_applied():
+    # Given
+    author = fake.name()
+    predicate = (field("author") == author) & (field("publication_year") > 1990) & ~(field("is_taken") == True)
+
+    # When/Then
+    assert predicate.matches(BookEntity(fake.word(), author, 1991))
+    assert not predicate.matches(BookEntity(fake.word(), author, 1990))
+    assert not predicate.matches(BookEntity(fake.word(), author, 1991, None, True))
+    assert not predicate.matches(BookEntity(fake.word(), fake.name() + "x", 1991))
+
+def test_given_alternative_predicates_when_matches_then_either_condition_is_enough():
+    # Given
+    predicate = field("title").isin({"dune", "emma"}) | (field("publication_year") <= 1900)
+
+    # When/Then
+    assert predicate.matches(BookEntity("dune", fake.name(), 2000))
+    assert predicate.matches(BookEntity(fake.word() + "x", fake.name(), 1850))
+    assert not predicate.matches(BookEntity("ulysses", fake.name(), 1922))
+
+def test_given_unknown_field_when_field_then_value_error_is_raised():
+    # When/Then
+    with pytest.raises(ValueError):
+        field("isbn")
@@ -0,0 +1,253 @@
+import os
+import json
+import threading
+import pytest
+from unittest.mock import patch
+from Library.persistence.persistence.bookrepository import BookRepository
+from Library.persistence.persistence.repositoryexception import RepositoryException
+from Library.persistence.persistenceentities.bookentity import BookEntity
+from faker import Faker
+
+fake = Faker()
+
+@pytest.fixture
+def book_file_path(tmp_path):
+    return str(tmp_path / "books.json")
+
+@pytest.fixture
+def book_repository(book_file_path):
+    return BookRepository(book_file_path)
+
+def _new_book():
+    return BookEntity(fake.word(), fake.name(), int(fake.year()))
+
+def test_given_created_book_when_read_books_then_book_is_returned(book_repository, book_file_path):
+    # Given
+    created_book = book_repository.create_book(_new_book())
+
+    # When
+    books = BookRepository(book_file_path).read_books()
+
+    # Then
+    assert [book.to_dict() for book in books] == [created_book.to_dict()]
+
+def test_given_loaded_catalog_when_read_books_again_then_cache_is_hit(book_repository):
+    # Given
+    book_repository.create_book(_new_book())
+    book_repository.read_books()
+    hits = book_repository.cache_statistics.hits
+
+    # When
+    first_read = book_repository.read_books()
+    second_read = book_repository.read_books()
+
+    # Then
+    assert book_repository.cache_statistics.hits == hits + 2
+    assert book_repository.cache_statistics.misses == 1
+    assert first_read[0].to_dict() == second_read[0].to_dict()
+
+def test_given_own_writes_when_read_books_then_file_is_not_parsed_again(book_repository):
+    # Given
+    book = book_repository.create_book(_new_book())
+    misses = book_repository.cache_statistics.misses
+
+    # When
+    book_repository.update_book(BookEntity(book.title, book.author, book.publication_year, book.id, True))
+    books = book_repository.read_books()
+
+    # Then
+    assert book_repository.cache_statistics.misses == misses
+    assert books[0].is_taken is True
+
+def test_given_outside_change_when_read_books_then_catalog_is_reloaded(book_repository, book_file_path):
+    # Given
+    book_repository.create_book(_new_book())
+    book_repository.read_books()
+    outside_book = BookEntity(fake.word(), fake.name(), 2000, "outside-id", False)
+    with open(book_file_path, 'w') as file:
+        json.dump([outside_book.to_dict()], file)
+
+    # When
+    books = book_repository.read_books()
+
+    # Then
+    assert book_repository.cache_statistics.misses == 2
+    assert [book.to_dict() for book in books] == [outside_book.to_dict()]
+
+def test_given_created_books_when_get_book_by_id_then_matching_book_is_returned(book_repository):
+    # Given
+    created_books = [book_repository.create_book(_new_book()) for _ in range(3)]
+
+    # When
+    found_book = book_repository.get_book_by_id(created_books[1].id)
+
+    # Then
+    assert found_book.to_dict() == created_books[1].to_dict()
+
+def test_given_nonexistent_id_when_get_book_by_id_then_none_is_returned(book_repository):
+    # Given
+    book_repository.create_book(_new_book())
+
+    # When
+    found_book = book_repository.get_book_by_id("nonexistent-id")
+
+    # Then
+    assert found_book is None
+
+def test_given_books_when_read_books_by_title_then_only_matching_books_are_returned(book_repository):
+    # Given
+    title = fake.word()
+    matching_book = book_repository.create_book(BookEntity(title, fake.name(), 2000))
+    book_repository.create_book(BookEntity(title + "x", fake.name(), 2000))
+
+    # When
+    found_books = book_repository.read_books_by_title(title)
+
+    # Then
+    assert [book.id for book in found_books] == [matching_book.id]
+
+def test_given_book_with_changed_author_when_read_books_by_author_then_index_is_current(book_repository):
+    # Given
+    book = book_repository.create_book(_new_book())
+    old_author = book.author
+    new_author = old_author + " Jr."
+
+    # When
+    book_repository.update_book(BookEntity(book.title, new_author, book.publication_year, book.id, book.is_taken))
+
+    # Then
+    assert book_repository.read_books_by_author(old_author) == []
+    assert [found_book.id for found_book in book_repository.read_books_by_author(new_author)] == [book.id]
+
+def test_given_misspelled_title_when_read_books_similar_to_title_then_all_copies_are_returned(book_repository):
+    # Given
+    first_copy = book_repository.create_book(BookEntity("The Name of the Wind", fake.name(), 2007))
+    second_copy = book_repository.create_book(BookEntity("The Name of the Wind", first_copy.author, 2008))
+    book_repository.create_book(BookEntity("Dune", fake.name(), 1965))
+
+    # When
+    found_books = book_repository.read_books_similar_to_title("name of teh wind", 5)
+
+    # Then
+    assert [book.id for book in found_books] == [first_copy.id, second_copy.id]
+
+def test_given_batch_of_books_when_create_books_then_all_books_are_persisted(book_repository, book_file_path):
+    # Given
+    new_books = [_new_book() for _ in range(5)]
+
+    # When
+    created_books = book_repository.create_books(book for book in new_books)
+
+    # Then
+    assert all(book.id is not None for book in created_books)
+    assert [book.to_dict() for book in BookRepository(book_file_path).read_books()] == [book.to_dict() for book in created_books]
+
+def test_given_changed_books_when_update_books_then_all_changes_are_persisted(book_repository, book_file_path):
+    # Given
+    created_books = book_repository.create_books([_new_book() for _ in range(3)])
+    changed_books = [BookEntity(book.title, book.author, book.publication_year, book.id, True) for book in created_books[:2]]
+
+    # When
+    book_repository.update_books(changed_books)
+
+    # Then
+    books = BookRepository(book_file_path).get_books_by_ids([book.id for book in created_books] + ["nonexistent-id"])
+    assert [book.is_taken if book else None for book in books] == [True, True, False, None]
+
+def test_given_group_commit_when_writers_run_concurrently_then_writes_share_file_rewrites(book_file_path):
+    # Given
+    book_repository = BookRepository(book_file_path, group_commit=True, commit_window=0.05)
+    writer_count = 8
+    barrier = threading.Barrier(writer_count)
+    created_books = []
+
+    def create_book():
+        barrier.wait()
+        created_books.append(book_repository.create_book(_new_book()))
+
+    # When
+    with patch("json.dumps", wraps=json.dumps) as dump:
+        threads = [threading.Thread(target=create_book) for _ in range(writer_count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    book_repository.close()
+
+    # Then
+    assert 0 < dump.call_count < writer_count
+    assert sorted(book.id for book in BookRepository(book_file_path).read_books()) == sorted(book.id for book in created_books)
+
+def test_given_group_commit_when_one_write_fails_then_other_writes_in_batch_are_committed(book_file_path):
+    # Given
+    book_repository = BookRepository(book_file_path, group_commit=True, commit_window=0.05)
+    barrier = threading.Barrier(2)
+    failures = []
+
+    def update_missing_book():
+        barrier.wait()
+        try:
+            book_repository.update_book(None)
+        except RepositoryException as e:
+            failures.append(e)
+
+    # When
+    failing_writer = threading.Thread(target=update_missing_book)
+    failing_writer.start()
+    barrier.wait()
+    created_book = book_repository.create_book(_new_book())
+    failing_writer.join()
+    book_repository.close()
+
+    # Then
+    assert len(failures) == 1
+    assert [book.id for book in BookRepository(book_file_path).read_books()] == [created_book.id]
+
+def test_given_set_taken_when_flag_changes_then_catalog_file_is_not_rewritten(book_repository, book_file_path):
+    # Given
+    created_books = book_repository.create_books([_new_book() for _ in range(20)])
+    with open(book_file_path, 'rb') as file:
+        catalog_data = file.read()
+    bytes_written = book_repository.io_statistics.bytes_written
+
+    # When
+    book_repository.set_taken(created_books[3].id, True)
+    book_repository.set_taken(created_books[17].id, True)
+    book_repository.set_taken(created_books[3].id, False)
+
+    # Then
+    with open(book_file_path, 'rb') as file:
+        assert file.read() == catalog_data
+    assert book_repository.io_statistics.bytes_written - bytes_written < 64
+    assert [book.id for book in BookRepository(book_file_path).read_books() if book.is_taken] == [created_books[17].id]
+
+def test_given_taken_flags_in_bitmap_when_catalog_is_rewritten_then_flags_move_into_catalog(book_repository, book_file_path):
+    # Given
+    created_book = book_repository.create_book(_new_book())
+    book_repository.set_taken(created_book.id, True)
+
+    # When
+    book_repository.create_book(_new_book())
+
+    # Then
+    assert not os.path.exists(book_file_path + ".taken")
+    with open(book_file_path) as file:
+        assert json.load(file)[0]["is_taken"] is True
+
+@pytest.mark.parametrize("group_commit", [False, True], ids=["direct", "group_commit"])
+def test_given_open_reader_when_catalog_is_rewritten_then_previous_file_is_replaced_not_truncated(book_file_path, group_commit):
+    # Given
+    book_repository = BookRepository(book_file_path, group_commit=group_commit)
+    book_repository.create_book(_new_book())
+    with open(book_file_path, 'rb') as file:
+        catalog_data = file.read()
+        file.seek(0)
+
+        # When
+        created_book = book_repository.create_book(_new_book())
+
+        # Then
+        assert file.read() == catalog_data
+    assert not os.path.exists(book_file_path + ".tmp")
+    assert created_book.id in [book.id for book in BookRepository(book_file_path).read_books()]
+    book_repository.close()
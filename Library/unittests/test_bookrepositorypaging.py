@@ -0,0 +1,325 @@
+import pytest
+from Library.persistence.persistence.bookcursor import encode_cursor
+from Library.persistence.persistence.bookpredicates import field
+from Library.persistence.persistence.bookrepository import BookRepository
+from Library.persistence.persistence.logbookrepository import LogBookRepository
+from Library.persistence.persistence.mmapbookrepository import MmapBookRepository
+from Library.persistence.persistence.repositoryexception import RepositoryException
+from Library.persistence.persistence.shardedbookrepository import ShardedBookRepository
+from Library.persistence.persistence.sqlitebookrepository import SqliteBookRepository
+from Library.persistence.persistence.streamingbookrepository import StreamingBookRepository
+from Library.persistence.persistenceentities.bookentity import BookEntity
+from Library.persistence.persistenceentities.repositoryexceptions import RepositoryExceptions
+from faker import Faker
+
+fake = Faker()
+
+REPOSITORY_FACTORIES = {
+    "json": lambda tmp_path: BookRepository(str(tmp_path / "books.json")),
+    "streaming": lambda tmp_path: StreamingBookRepository(str(tmp_path / "books.json")),
+    "log": lambda tmp_path: LogBookRepository(str(tmp_path / "books.jsonl")),
+    "sqlite": lambda tmp_path: SqliteBookRepository(str(tmp_path / "books.db")),
+    "mmap": lambda tmp_path: MmapBookRepository(str(tmp_path / "books.bin")),
+    "sharded": lambda tmp_path: ShardedBookRepository([BookRepository(str(tmp_path / f"books.{index}.json")) for index in range(3)]),
+}
+
+@pytest.fixture(params=REPOSITORY_FACTORIES.values(), ids=REPOSITORY_FACTORIES.keys())
+def book_repository(request, tmp_path):
+    return request.param(tmp_path)
+
+def _new_book():
+    return BookEntity(fake.word(), fake.name(), int(fake.year()))
+
+def test_given_books_when_get_books_page_by_page_then_all_books_are_returned_once_in_order(book_repository):
+    # Given
+    created_books = book_repository.create_books([BookEntity(fake.word(), fake.name(), 2000 + index % 3) for index in range(7)])
+    expected_ids = [book.id for book in sorted(created_books, key=lambda book: (book.publication_year, book.id))]
+
+    # When
+    page_ids = []
+    cursor = None
+    while True:
+        page = book_repository.get_books(cursor, 3, "publication_year")
+        page_ids.append([book.id for book in page.books])
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    # Then
+    assert [len(ids) for ids in page_ids] == [3, 3, 1]
+    assert [book_id for ids in page_ids for book_id in ids] == expected_ids
+
+def test_given_cursor_when_book_is_renamed_then_next_page_follows_new_order(book_repository):
+    # Given
+    first_book, second_book, third_book = book_repository.create_books([BookEntity(title, fake.name(), 2000) for title in ("a", "b", "c")])
+    first_page = book_repository.get_books(None, 1, "title")
+
+    # When
+    book_repository.update_book(BookEntity("d", second_book.author, second_book.publication_year, second_book.id, False))
+    second_page = book_repository.get_books(first_page.next_cursor, 5, "title")
+
+    # Then
+    assert [book.id for book in first_page.books] == [first_book.id]
+    assert [book.id for book in second_page.books] == [third_book.id, second_book.id]
+    assert second_page.next_cursor is None
+
+def test_given_cursor_for_another_sort_when_get_books_then_raises_repository_exception(book_repository):
+    # Given
+    book_repository.create_books([_new_book() for _ in range(2)])
+    cursor = book_repository.get_books(None, 1, "title").next_cursor
+
+    # When/Then
+    with pytest.raises(RepositoryException, match=RepositoryExceptions.INVALID_CURSOR):
+        book_repository.get_books(cursor, 1, "author")
+
+@pytest.mark.parametrize("sort, key", [
+    ("publication_year", ["2000", "00000000-0000-4000-8000-000000000000"]),
+    ("publication_year", [True, "00000000-0000-4000-8000-000000000000"]),
+    ("title", [2000, "00000000-0000-4000-8000-000000000000"]),
+    ("author", ["name", 1]),
+    ("id", ["not an id", "not an id"]),
+], ids=["year_as_text", "year_as_bool", "title_as_number", "id_as_number", "id_not_uuid"])
+def test_given_cursor_with_mistyped_key_when_get_books_then_raises_repository_exception(book_repository, sort, key):
+    # Given
+    book_repository.create_books([_new_book() for _ in range(2)])
+
+    # When/Then
+    with pytest.raises(RepositoryException, match=RepositoryExceptions.INVALID_CURSOR):
+        book_repository.get_books(encode_cursor(sort, key), 1, sort)
+
+def test_given_set_taken_when_repository_is_reopened_then_only_that_flag_has_changed(book_repository, request, tmp_path):
+    # Given
+    created_books = book_repository.create_books([_new_book() for _ in range(5)])
+
+    # When
+    taken_book = book_repository.set_taken(created_books[2].id, True)
+    books = request.node.callspec.params["book_repository"](tmp_path).read_books()
+
+    # Then
+    assert taken_book.is_taken is True
+    assert {book.id: book.is_taken for book in books} == {book.id: book.id == created_books[2].id for book in created_books}
+
+def test_given_unknown_id_when_set_taken_then_none_is_returned(book_repository):
+    # Given
+    book_repository.create_book(_new_book())
+
+    # When/Then
+    assert book_repository.set_taken("00000000-0000-4000-8000-000000000000", True) is None
+
+def test_given_copies_of_an_edition_when_one_is_taken_then_edition_counts_its_copies(book_repository, request, tmp_path):
+    # Given
+    author = fake.name()
+    created_books = book_repository.create_books([BookEntity("dune", author, 1965) for _ in range(3)] + [BookEntity("dune", author, 1984)])
+
+    # When
+    book_repository.set_taken(created_books[1].id, True)
+    editions = book_repository.read_editions_by_title("dune")
+    reopened_editions = request.node.callspec.params["book_repository"](tmp_path).read_editions_by_author(author)
+
+    # Then
+    for found_editions in (editions, reopened_editions):
+        by_year = {edition.publication_year: edition for edition in found_editions}
+        assert sorted(by_year) == [1965, 1984]
+        assert sorted(by_year[1965].book_ids) == sorted(book.id for book in created_books[:3])
+        assert (by_year[1965].copy_count, by_year[1965].taken_count, by_year[1965].available_count) == (3, 1, 2)
+        assert (by_year[1984].copy_count, by_year[1984].available_count) == (1, 1)
+
+def test_given_copy_moved_to_another_edition_when_read_editions_then_counts_follow_it(book_repository):
+    # Given
+    author = fake.name()
+    first_book, second_book = book_repository.create_books([BookEntity("emma", author, 1815) for _ in range(2)])
+
+    # When
+    book_repository.update_book(BookEntity("emma", author, 1816, second_book.id, True))
+    editions = book_repository.read_editions_by_author(author)
+
+    # Then
+    assert sorted((edition.publication_year, edition.book_ids, edition.taken_count) for edition in editions) == \
+        [(1815, [first_book.id], 0), (1816, [second_book.id], 1)]
+
+def test_given_misspelled_title_when_read_editions_similar_to_title_then_matching_editions_are_returned(book_repository):
+    # Given
+    created_books = book_repository.create_books([BookEntity("dune", fake.name(), 1965), BookEntity("emma", fake.name(), 1815)])
+
+    # When
+    editions = book_repository.read_editions_similar_to_title("dunes", 5)
+
+    # Then
+    assert [(edition.title, edition.book_ids) for edition in editions] == [("dune", [created_books[0].id])]
+
+def test_given_books_of_several_years_when_read_books_by_title_then_books_are_ordered_by_year(book_repository):
+    # Given
+    created_books = book_repository.create_books([BookEntity("dune", fake.name(), year) for year in (2003, 1965, 2003, 1984)])
+
+    # When
+    books = book_repository.read_books_by_title("dune")
+
+    # Then
+    assert [book.publication_year for book in books] == [1965, 1984, 2003, 2003]
+    assert [book.id for book in books[:2]] == [created_books[1].id, created_books[3].id]
+    assert {book.id for book in books[2:]} == {created_books[0].id, created_books[2].id}
+
+def test_given_books_when_read_books_by_year_range_then_books_in_range_are_returned_in_year_order(book_repository):
+    # Given
+    created_books = book_repository.create_books([BookEntity(fake.word(), fake.name(), year) for year in (2005, 1990, 2000, 1989, 2001)])
+    book_repository.update_book(BookEntity(created_books[0].title, created_books[0].author, 1995, created_books[0].id, False))
+
+    # When
+    books = book_repository.read_books_by_year_range(1990, 2000)
+
+    # Then
+    assert [(book.publication_year, book.id) for book in books] == \
+        [(1990, created_books[1].id), (1995, created_books[0].id), (2000, created_books[2].id)]
+
+def test_given_compound_predicate_when_query_books_then_matching_books_are_returned(book_repository):
+    # Given
+    author = fake.name()
+    created_books = book_repository.create_books([BookEntity(fake.word(), author, year) for year in (1985, 1995, 2005)] + [_new_book()])
+    book_repository.set_taken(created_books[2].id, True)
+
+    # When
+    books = book_repository.query_books((field("author") == author) & (field("publication_year") > 1990) & (field("is_taken") == False))
+
+    # Then
+    assert [book.id for book in books] == [created_books[1].id]
+
+def test_given_writes_when_write_generation_is_read_then_every_write_moves_it(book_repository):
+    # Given
+    generations = [book_repository.write_generation]
+    book = book_repository.create_book(_new_book())
+    generations.append(book_repository.write_generation)
+
+    # When
+    book_repository.update_book(BookEntity(fake.word(), book.author, book.publication_year, book.id, False))
+    generations.append(book_repository.write_generation)
+    book_repository.set_taken(book.id, True)
+    generations.append(book_repository.write_generation)
+    book_repository.read_books_by_title(book.title)
+
+    # Then
+    assert len(set(generations)) == 4
+    assert book_repository.write_generation == generations[-1]
+
+def test_given_read_book_is_changed_in_place_when_update_book_then_indexes_follow_new_values(book_repository):
+    # Given
+    author = fake.name()
+    book_repository.create_books([BookEntity("old", author, 1990), BookEntity(fake.word(), fake.name(), 2000)])
+    book = book_repository.read_books_by_title("old")[0]
+    book.title = "new"
+    book.publication_year = 2010
+
+    # When
+    book_repository.update_book(book)
+
+    # Then
+    assert list(book_repository.read_books_by_title("old")) == []
+    assert [found_book.id for found_book in book_repository.read_books_by_title("new")] == [book.id]
+    assert [found_book.id for found_book in book_repository.read_books_by_year_range(2005, 2015)] == [book.id]
+    assert [(edition.title, edition.publication_year) for edition in book_repository.read_editions_by_author(author)] == [("new", 2010)]
+    assert [found_book.title for found_book in book_repository.get_books(None, 5, "title").books] == sorted(
+        found_book.title for found_book in book_repository.read_books())
+
+def test_given_returned_books_are_changed_when_read_again_then_repository_is_unchanged_until_update_book(book_repository):
+    # Given
+    created_book = book_repository.create_book(BookEntity("old", fake.name(), 1990))
+    book = book_repository.get_book_by_id(created_book.id)
+    created_book.title = "created"
+    book.title = "new"
+    book_repository.read_books_by_title("old")[0].is_taken = True
+
+    # When
+    unchanged_book = book_repository.get_book_by_id(book.id)
+    book_repository.update_book(book)
+    updated_book = book_repository.get_book_by_id(book.id)
+
+    # Then
+    assert (unchanged_book.title, unchanged_book.is_taken) == ("old", False)
+    assert (updated_book.title, updated_book.is_taken) == ("new", False)
+    assert [found_book.id for found_book in book_repository.read_books_by_title("new")] == [book.id]
+    assert [edition.title for edition in book_repository.read_editions_by_title("new")] == ["new"]
+
+def test_given_existing_book_when_imported_again_then_pages_list_it_once(book_repository):
+    # Given
+    first_book, second_book = book_repository.create_books([BookEntity(title, fake.name(), 2000) for title in ("a", "b")])
+    book_repository.get_books(None, 5, "title")
+
+    # When
+    book_repository.import_books([BookEntity("c", first_book.author, 2001, first_book.id, False)])
+    page = book_repository.get_books(None, 5, "title")
+
+    # Then
+    assert [(book.id, book.title) for book in page.books] == [(second_book.id, "b"), (first_book.id, "c")]
+
+def test_given_existing_book_when_imported_again_then_year_range_returns_it_once(book_repository):
+    # Given
+    book = book_repository.create_book(BookEntity(fake.word(), fake.name(), 2000))
+    book_repository.read_books_by_year_range(1990, 2010)
+
+    # When
+    book_repository.import_books([BookEntity(book.title, book.author, 2005, book.id, False)])
+    books = book_repository.read_books_by_year_range(1990, 2010)
+
+    # Then
+    assert [(found_book.id, found_book.publication_year) for found_book in books] == [(book.id, 2005)]
+
+def test_given_reimported_book_when_book_created_then_both_books_are_kept(book_repository):
+    # Given
+    book = book_repository.create_book(BookEntity("old", fake.name(), 2000))
+    book_repository.read_books_by_title("old")
+    book_repository.import_books([BookEntity("new", book.author, 2000, book.id, False)])
+
+    # When
+    created_book = book_repository.create_book(BookEntity("other", fake.name(), 2001))
+
+    # Then
+    assert book_repository.get_book_by_id(book.id).title == "new"
+    assert book_repository.get_book_by_id(created_book.id).title == "other"
+    assert list(book_repository.read_books_by_title("old")) == []
+    assert [found_book.id for found_book in book_repository.read_books_by_title("new")] == [book.id]
+
+def test_given_unexpected_flag_when_set_taken_conditionally_then_nothing_is_written(book_repository):
+    # Given
+    book = book_repository.create_book(_new_book())
+    generation = book_repository.write_generation
+
+    # When
+    stale_result = book_repository.set_taken(book.id, False, True)
+    taken_book = book_repository.set_taken(book.id, True, False)
+    second_result = book_repository.set_taken(book.id, True, False)
+
+    # Then
+    assert stale_result is None
+    assert taken_book.is_taken is True
+    assert second_result is None
+    assert book_repository.get_book_by_id(book.id).is_taken is True
+    assert book_repository.write_generation != generation
+    assert [edition.taken_count for edition in book_repository.read_editions_by_title(book.title)] == [1]
+
+def test_given_books_when_query_books_then_every_book_is_counted_as_scanned(book_repository):
+    # Given
+    book_repository.create_books([BookEntity(fake.word(), fake.name(), 2000 + index) for index in range(3)])
+    books_scanned = book_repository.io_statistics.books_scanned
+
+    # When
+    found_books = book_repository.query_books(field("publication_year") == 2000)
+
+    # Then
+    assert len(found_books) == 1
+    assert book_repository.io_statistics.books_scanned - books_scanned == 3
+
+def test_given_mixed_flags_when_set_taken_many_conditionally_then_only_matching_books_change_in_one_write(book_repository):
+    # Given
+    available_book, taken_book = book_repository.create_books([_new_book(), _new_book()])
+    book_repository.set_taken(taken_book.id, True)
+    generation = book_repository.write_generation
+
+    # When
+    changed_ids = book_repository.set_taken_many(
+        [taken_book.id, available_book.id, "missing", available_book.id], True, False)
+
+    # Then
+    assert changed_ids == [available_book.id]
+    assert book_repository.get_book_by_id(available_book.id).is_taken is True
+    assert book_repository.get_book_by_id(taken_book.id).is_taken is True
+    assert book_repository.write_generation != generation
+    assert book_repository.set_taken_many([available_book.id], True, False) == []
@@ -3,10 +3,15 @@ import uuid
 import pytest
 import copy
 from unittest.mock import Mock
+from Library.persistence.persistence.bookpredicates import field
 from Library.persistence.persistenceentities.bookentity import BookEntity
+from Library.persistence.persistenceentities.bookpage import BookPage
+from Library.persistence.persistenceentities.editionentity import EditionEntity
 from Library.services.services.bookvalueexception import BookValueException
 from Library.services.services.mappers import bookentity_to_bookmodel, bookmodel_to_bookentity
 from Library.services.servicesmodels.bookmodel import BookModel
+from Library.services.servicesmodels.bookoperationstatus import BookOperationStatus
+from Library.services.servicesmodels.editionmodel import EditionModel
 from Library.services.services.bookservice import BookService
 from faker import Faker
 
@@ -84,7 +89,7 @@ def test_given_book_id_and_publication_year_when_buy_book_copy_then_book_copy_is
     publication_year = 2023
 
     existing_book = BookModel(fake.word(), fake.name(), 2022, book_id, False)
-    mock_book_repository.read_books.return_value = [existing_book]
+    mock_book_repository.get_book_by_id.return_value = existing_book
     book_copy = copy.deepcopy(existing_book)
     book_copy.publication_year = publication_year
     mock_book_repository.create_book.return_value = book_copy
@@ -93,7 +98,7 @@ def test_given_book_id_and_publication_year_when_buy_book_copy_then_book_copy_is
     purchased_book = book_service.buy_book_copy(book_id, publication_year)
 
     # Then
-    assert mock_book_repository.read_books.called
+    assert mock_book_repository.get_book_by_id.called
     assert mock_book_repository.create_book.called
 
     assert isinstance(purchased_book, BookModel)
@@ -107,7 +112,7 @@ def test_given_book_id_when_buy_book_copy_then_book_copy_is_returned(book_servic
     book_id = str(uuid.uuid4())
 
     existing_book = BookModel(fake.word() ,fake.name(), 2022, book_id, False)
-    mock_book_repository.read_books.return_value = [existing_book]
+    mock_book_repository.get_book_by_id.return_value = existing_book
     book_copy = copy.deepcopy(existing_book)
     book_copy.publication_year = datetime.now().year
     mock_book_repository.create_book.return_value = book_copy
@@ -116,7 +121,7 @@ def test_given_book_id_when_buy_book_copy_then_book_copy_is_returned(book_servic
     purchased_book = book_service.buy_book_copy(book_id, None)
 
     # Then
-    assert mock_book_repository.read_books.called
+    assert mock_book_repository.get_book_by_id.called
     assert mock_book_repository.create_book.called
 
     assert isinstance(purchased_book, BookModel)
@@ -129,51 +134,50 @@ def test_given_wrong_book_id_when_buy_book_copy_then_raises_value_error(book_ser
     # Given
     book_id = str(uuid.uuid4())
     existing_book = Mock()
-    mock_book_repository.read_books.return_value = [existing_book]
+    mock_book_repository.get_book_by_id.return_value = existing_book
 
     # When/Then
     with pytest.raises(ValueError, match=BookServiceExceptions.PUBLICATION_YEAR_NOT_INTEGER):
         book_service.buy_book_copy(book_id, "invalid_year")
-    assert not mock_book_repository.read_books.called
+    assert not mock_book_repository.get_book_by_id.called
     assert not mock_book_repository.create_book.called
 
 def test_given_book_wrong_type_publication_year_when_buy_book_copy_then_raises_value_error(book_service, mock_book_repository):
     # Given
     book_id = str(uuid.uuid4())
-    existing_book = Mock()
-    mock_book_repository.read_books.return_value = [existing_book]
+    mock_book_repository.get_book_by_id.return_value = None
 
     # When/Then
     with pytest.raises(BookValueException, match=BookServiceExceptions.BOOK_ID_NOT_EXIST):
         book_service.buy_book_copy(book_id, None)
-    assert mock_book_repository.read_books.called
+    assert mock_book_repository.get_book_by_id.called
     assert not mock_book_repository.create_book.called
 
 def test_given_books_when_get_all_books_books_are_retrieved(book_service, mock_book_repository):
     # Given
-    mock_book_repository.read_books.return_value = [
+    mock_book_repository.iter_books.return_value = iter([
         Mock(),
         Mock(),
         Mock()
-    ]
+    ])
 
     # When
     all_books = book_service.get_all_books()
 
     # Then
-    assert mock_book_repository.read_books.called
+    assert mock_book_repository.iter_books.called
     assert isinstance(all_books, list)
     assert all(isinstance(book, BookModel) for book in all_books)
 
 def test_given_epmty_book_list_when_get_all_books_empty_list_is_retrieved(book_service, mock_book_repository):
     # Given
-    mock_book_repository.read_books.return_value = []
+    mock_book_repository.iter_books.return_value = iter([])
 
     # When
     all_books = book_service.get_all_books()
 
     # Then
-    assert mock_book_repository.read_books.called
+    assert mock_book_repository.iter_books.called
     assert isinstance(all_books, list)
 
 def test_given_book_id_when_take_book_then_book_is_returned(book_service, mock_book_repository):
@@ -184,15 +188,15 @@ def test_given_book_id_when_take_book_then_book_is_returned(book_service, mock_b
     book.is_taken = False
     updated_book = copy.deepcopy(book)
     updated_book.is_taken = True
-    mock_book_repository.read_books.return_value = [book]
-    mock_book_repository.update_book.return_value = updated_book
+    mock_book_repository.get_book_by_id.return_value = book
+    mock_book_repository.set_taken.return_value = updated_book
 
     # When
     taken_book = book_service.take_book(book_id)
 
     # Then
-    assert mock_book_repository.read_books.called
-    assert mock_book_repository.update_book.called
+    assert mock_book_repository.get_book_by_id.called
+    assert mock_book_repository.set_taken.called
     assert taken_book.is_taken is True
 
 
@@ -202,26 +206,22 @@ def test_given_taken_book_when_take_book_then_raises_bookvalueexception(book_ser
     mock_existing_book = Mock()
     mock_existing_book.is_taken = True
     mock_existing_book.id = book_id
-    mock_book_repository.read_books.return_value = [mock_existing_book]
+    mock_book_repository.get_book_by_id.return_value = mock_existing_book
 
     # When/Then
     with pytest.raises(BookValueException, match=BookServiceExceptions.BOOK_ALREADY_TAKEN):
         book_service.take_book(book_id)
-    assert not mock_book_repository.update_book.called
+    assert not mock_book_repository.set_taken.called
 
 def test_given_nonexistent_book_when_take_book_then_raises_bookvalueexception(book_service, mock_book_repository):
     # Given
     book_id = str(uuid.uuid4())
-    mock_book_repository.read_books.return_value = [
-        Mock(),
-        Mock(),
-        Mock()
-    ]
+    mock_book_repository.get_book_by_id.return_value = None
 
     # When/Then
     with pytest.raises(BookValueException, match=BookServiceExceptions.BOOK_ID_NOT_EXIST):
         book_service.take_book(book_id)
-    assert not mock_book_repository.update_book.called
+    assert not mock_book_repository.set_taken.called
 
 def test_given_taken_book_id_when_return_book_then_updated_book_is_returned(book_service, mock_book_repository):
     # Given
@@ -229,39 +229,39 @@ def test_given_taken_book_id_when_return_book_then_updated_book_is_returned(book
     taken_book = BookEntity(fake.word(), fake.name(), 2022, book_id, True)
     updated_book = copy.deepcopy(taken_book)
     updated_book.is_taken = False
-    mock_book_repository.read_books.return_value = [taken_book]
-    mock_book_repository.update_book.return_value = updated_book
+    mock_book_repository.get_book_by_id.return_value = taken_book
+    mock_book_repository.set_taken.return_value = updated_book
 
     # When
     returned_book = book_service.return_book(book_id)
 
     # Then  
-    assert mock_book_repository.update_book.called
-    assert mock_book_repository.read_books.called
+    assert mock_book_repository.set_taken.called
+    assert mock_book_repository.get_book_by_id.called
     assert returned_book.is_taken is False
 
 def test_given_available_book_id_when_return_book_then_raises_bookvalueexception(book_service, mock_book_repository):
     # Given
     available_book = Mock()
     available_book.is_taken = False
-    mock_book_repository.read_books.return_value = [available_book]
+    mock_book_repository.get_book_by_id.return_value = available_book
 
     # When, Then
     with pytest.raises(BookValueException, match=BookServiceExceptions.BOOK_ALREADY_IN_LIBRARY):
         book_service.return_book(available_book.id)
-    assert mock_book_repository.read_books.called
-    assert not mock_book_repository.update_book.called
+    assert mock_book_repository.get_book_by_id.called
+    assert not mock_book_repository.set_taken.called
 
 def test_given_nonexistent_book_id_when_return_book_then_raises_bookvalueexception(book_service, mock_book_repository):
     # Given
     nonexistent_book_id = str(uuid.uuid4())
-    mock_book_repository.read_books.return_value = [Mock()]
+    mock_book_repository.get_book_by_id.return_value = None
 
     # When, Then
     with pytest.raises(BookValueException, match=BookServiceExceptions.BOOK_ID_NOT_EXIST):
         book_service.return_book(nonexistent_book_id)
-    assert mock_book_repository.read_books.called
-    assert not mock_book_repository.update_book.called
+    assert mock_book_repository.get_book_by_id.called
+    assert not mock_book_repository.set_taken.called
 
 
 def test_given_matching_title_when_search_books_by_title_then_matching_book_is_returned(book_service, mock_book_repository):
@@ -269,27 +269,26 @@ def test_given_matching_title_when_search_books_by_title_then_matching_book_is_r
     title_to_search = fake.word()
     book_with_matching_title = Mock()
     book_with_matching_title.title = title_to_search
-    mock_book_repository.read_books.return_value = [book_with_matching_title]
+    mock_book_repository.read_books_by_title.return_value = [book_with_matching_title]
 
     # When
     found_books = book_service.search_books_by_title(title_to_search)
 
     # Then
-    assert mock_book_repository.read_books.called
+    assert mock_book_repository.read_books_by_title.called
     assert len(found_books) == 1
     assert found_books[0].title == title_to_search
 
 def test_given_nonmatching_title_when_search_books_by_title_then_returned_empty_list(book_service, mock_book_repository):
     # Given
     title_to_search = fake.word()
-    book_with_nonmatching_title = Mock()
-    mock_book_repository.read_books.return_value = [book_with_nonmatching_title]
+    mock_book_repository.read_books_by_title.return_value = []
 
     # When
     found_books = book_service.search_books_by_title(title_to_search)
 
     # Then
-    assert mock_book_repository.read_books.called
+    assert mock_book_repository.read_books_by_title.called
     assert len(found_books) == 0
 
 def test_given_matching_title_when_search_books_by_title_then_matching_book_is_returned(book_service, mock_book_repository):
@@ -297,17 +296,17 @@ def test_given_matching_title_when_search_books_by_title_then_matching_book_is_r
     title_to_search = fake.word()
     book_with_matching_title = Mock()
     book_with_matching_title.title = title_to_search
-    mock_book_repository.read_books.return_value = [book_with_matching_title]
+    mock_book_repository.read_books_by_title.return_value = [book_with_matching_title]
 
     # When
     found_books = book_service.search_books_by_title(title_to_search)
 
     # Then
-    assert mock_book_repository.read_books.called
+    assert mock_book_repository.read_books_by_title.called
     assert len(found_books) == 1
     assert found_books[0].title == title_to_search
 
-def test_given_uprocessed_book_list_when_search_books_by_title_then_returned_filtered_and_sorted_list_returned(book_service, mock_book_repository):
+def test_given_year_ordered_book_list_when_search_books_by_title_then_unique_books_are_returned_in_order(book_service, mock_book_repository):
     # Given
     title_to_search = fake.word()
     book_with_matching_title = BookModel(title_to_search, fake.name(), 2000, uuid.uuid4())
@@ -316,15 +315,16 @@ def test_given_uprocessed_book_list_when_search_books_by_title_then_returned_fil
 
     different_publication_year_book.publication_year = 2001
     different_publication_year_book2.publication_year = 2002
+    # The repository returns the copies ordered by publication year.
     unprocessed_book_list = [
-        bookmodel_to_bookentity(different_publication_year_book2),
         bookmodel_to_bookentity(book_with_matching_title),
-        bookmodel_to_bookentity(different_publication_year_book),
         bookmodel_to_bookentity(copy.deepcopy(book_with_matching_title)),
         bookmodel_to_bookentity(copy.deepcopy(book_with_matching_title)),
-        bookmodel_to_bookentity(copy.deepcopy(book_with_matching_title))
+        bookmodel_to_bookentity(different_publication_year_book),
+        bookmodel_to_bookentity(copy.deepcopy(different_publication_year_book)),
+        bookmodel_to_bookentity(different_publication_year_book2)
     ]
-    mock_book_repository.read_books.return_value = unprocessed_book_list
+    mock_book_repository.read_books_by_title.return_value = unprocessed_book_list
 
     expected_book_list = [
         book_with_matching_title,
@@ -336,7 +336,7 @@ def test_given_uprocessed_book_list_when_search_books_by_title_then_returned_fil
     found_books = book_service.search_books_by_title(title_to_search)
 
     # Then
-    assert mock_book_repository.read_books.called
+    assert mock_book_repository.read_books_by_title.called
     assert found_books == expected_book_list
 
 def test_given_matching_title_when_search_books_by_author_then_matching_book_is_returned(book_service, mock_book_repository):
@@ -344,27 +344,26 @@ def test_given_matching_title_when_search_books_by_author_then_matching_book_is_
     author_to_search = fake.name()
     book_with_matching_author = Mock()
     book_with_matching_author.title = author_to_search
-    mock_book_repository.read_books.return_value = [book_with_matching_author]
+    mock_book_repository.read_books_by_author.return_value = [book_with_matching_author]
 
     # When
     found_books = book_service.search_books_by_author(author_to_search)
 
     # Then
-    assert mock_book_repository.read_books.called
+    assert mock_book_repository.read_books_by_author.called
     assert len(found_books) == 1
     assert found_books[0].title == author_to_search
 
 def test_given_nonmatching_title_when_search_books_by_author_then_returned_empty_list(book_service, mock_book_repository):
     # Given
     author_to_search = fake.word()
-    book_with_nonmatching_author = Mock()
-    mock_book_repository.read_books.return_value = [book_with_nonmatching_author]
+    mock_book_repository.read_books_by_author.return_value = []
 
     # When
     found_books = book_service.search_books_by_author(author_to_search)
 
     # Then
-    assert mock_book_repository.read_books.called
+    assert mock_book_repository.read_books_by_author.called
     assert len(found_books) == 0
 
 def test_given_matching_title_when_search_books_by_author_then_matching_book_is_returned(book_service, mock_book_repository):
@@ -372,17 +371,17 @@ def test_given_matching_title_when_search_books_by_author_then_matching_book_is_
     author_to_search = fake.name()
     book_with_matching_author = Mock()
     book_with_matching_author.author = author_to_search
-    mock_book_repository.read_books.return_value = [book_with_matching_author]
+    mock_book_repository.read_books_by_author.return_value = [book_with_matching_author]
 
     # When
     found_books = book_service.search_books_by_author(author_to_search)
 
     # Then
-    assert mock_book_repository.read_books.called
+    assert mock_book_repository.read_books_by_author.called
     assert len(found_books) == 1
     assert found_books[0].author == author_to_search
 
-def test_given_uprocessed_book_list_when_search_books_by_author_then_returned_filtered_and_sorted_list_returned(book_service, mock_book_repository):
+def test_given_year_ordered_book_list_when_search_books_by_author_then_unique_books_are_returned_in_order(book_service, mock_book_repository):
     # Given
     author_to_search = fake.name()
     book_with_matching_author = BookModel(fake.word(), author_to_search, 2000, uuid.uuid4())
@@ -391,15 +390,16 @@ def test_given_uprocessed_book_list_when_search_books_by_author_then_returned_fi
 
     different_publication_year_book.publication_year = 2001
     different_publication_year_book2.publication_year = 2002
+    # The repository returns the copies ordered by publication year.
     unprocessed_book_list = [
-        bookmodel_to_bookentity(different_publication_year_book2),
         bookmodel_to_bookentity(book_with_matching_author),
-        bookmodel_to_bookentity(different_publication_year_book),
         bookmodel_to_bookentity(copy.deepcopy(book_with_matching_author)),
         bookmodel_to_bookentity(copy.deepcopy(book_with_matching_author)),
-        bookmodel_to_bookentity(copy.deepcopy(book_with_matching_author))
+        bookmodel_to_bookentity(different_publication_year_book),
+        bookmodel_to_bookentity(copy.deepcopy(different_publication_year_book)),
+        bookmodel_to_bookentity(different_publication_year_book2)
     ]
-    mock_book_repository.read_books.return_value = unprocessed_book_list
+    mock_book_repository.read_books_by_author.return_value = unprocessed_book_list
 
     expected_book_list = [
         book_with_matching_author,
@@ -411,8 +411,315 @@ def test_given_uprocessed_book_list_when_search_books_by_author_then_returned_fi
     found_books = book_service.search_books_by_author(author_to_search)
 
     # Then
-    assert mock_book_repository.read_books.called
+    assert mock_book_repository.read_books_by_author.called
     assert found_books == expected_book_list
 
+def test_given_similar_titles_when_fuzzy_search_books_by_title_then_ranked_unique_books_are_returned(book_service, mock_book_repository):
+    # Given
+    title_to_search = fake.word()
+    best_match = BookEntity(title_to_search, fake.name(), 2001, str(uuid.uuid4()))
+    best_match_copy = BookEntity(best_match.title, best_match.author, 2001, str(uuid.uuid4()))
+    other_match = BookEntity(title_to_search + "s", fake.name(), 1990, str(uuid.uuid4()))
+    mock_book_repository.read_books_similar_to_title.return_value = [best_match, best_match_copy, other_match]
+
+    # When
+    found_books = book_service.fuzzy_search_books_by_title(title_to_search)
+
+    # Then
+    mock_book_repository.read_books_similar_to_title.assert_called_once_with(title_to_search, 20)
+    assert found_books == [bookentity_to_bookmodel(best_match), bookentity_to_bookmodel(other_match)]
+
+def test_given_empty_author_when_fuzzy_search_books_by_author_then_returned_empty_list(book_service, mock_book_repository):
+    # When
+    found_books = book_service.fuzzy_search_books_by_author("")
+
+    # Then
+    assert found_books == []
+    assert not mock_book_repository.read_books_similar_to_author.called
+
+def test_given_valid_and_invalid_books_when_create_books_then_valid_books_are_created_in_one_call(book_service, mock_book_repository):
+    # Given
+    valid_book = BookModel(fake.word(), fake.name(), "2001")
+    invalid_book = BookModel("", fake.name(), 2002)
+    another_valid_book = BookModel(fake.word(), fake.name(), 2003)
+    mock_book_repository.create_books.side_effect = lambda books: [
+        BookEntity(book.title, book.author, book.publication_year, str(uuid.uuid4())) for book in books
+    ]
+
+    # When
+    batch_result = book_service.create_books([valid_book, invalid_book, another_valid_book])
+
+    # Then
+    assert mock_book_repository.create_books.call_count == 1
+    assert not mock_book_repository.create_book.called
+    assert [book.title for book in batch_result.created_books] == [valid_book.title, another_valid_book.title]
+    assert batch_result.created_books[0].publication_year == 2001
+    assert batch_result.failures == [(1, BookServiceExceptions.TITLE_NULL_OR_EMPTY)]
+
+def test_given_only_invalid_books_when_create_books_then_repository_is_not_called(book_service, mock_book_repository):
+    # Given
+    invalid_book = BookModel(fake.word(), fake.name(), "text")
+
+    # When
+    batch_result = book_service.create_books([invalid_book])
+
+    # Then
+    assert not mock_book_repository.create_books.called
+    assert batch_result.created_books == []
+    assert batch_result.failures == [(0, BookServiceExceptions.PUBLICATION_YEAR_NOT_INTEGER)]
+
+def test_given_mixed_book_ids_when_take_books_then_per_id_results_are_returned_and_written_once(book_service, mock_book_repository):
+    # Given
+    available_book = BookEntity(fake.word(), fake.name(), 2000, str(uuid.uuid4()), False)
+    taken_book = BookEntity(fake.word(), fake.name(), 2000, str(uuid.uuid4()), True)
+    nonexistent_book_id = str(uuid.uuid4())
+    mock_book_repository.get_books_by_ids.return_value = [available_book, taken_book, None, available_book]
+    mock_book_repository.set_taken_many.return_value = [available_book.id]
+
+    # When
+    results = book_service.take_books([available_book.id, taken_book.id, nonexistent_book_id, available_book.id])
+
+    # Then
+    assert results == [
+        (available_book.id, BookOperationStatus.OK),
+        (taken_book.id, BookOperationStatus.ALREADY_TAKEN),
+        (nonexistent_book_id, BookOperationStatus.NOT_FOUND),
+        (available_book.id, BookOperationStatus.ALREADY_TAKEN)
+    ]
+    assert mock_book_repository.get_books_by_ids.call_count == 1
+    mock_book_repository.set_taken_many.assert_called_once_with([available_book.id], True, False)
+    assert not mock_book_repository.set_taken.called
+    assert available_book.is_taken is False
+
+def test_given_book_taken_elsewhere_when_take_books_then_conflict_is_reported(book_service, mock_book_repository):
+    # Given
+    book = BookEntity(fake.word(), fake.name(), 2000, str(uuid.uuid4()), False)
+    mock_book_repository.get_books_by_ids.return_value = [book]
+    mock_book_repository.set_taken_many.return_value = []
+
+    # When
+    results = book_service.take_books([book.id])
+
+    # Then
+    assert results == [(book.id, BookOperationStatus.ALREADY_TAKEN)]
+
+def test_given_available_books_when_return_books_then_nothing_is_written(book_service, mock_book_repository):
+    # Given
+    available_book = BookEntity(fake.word(), fake.name(), 2000, str(uuid.uuid4()), False)
+    mock_book_repository.get_books_by_ids.return_value = [available_book]
+
+    # When
+    results = book_service.return_books([available_book.id])
+
+    # Then
+    assert results == [(available_book.id, BookOperationStatus.ALREADY_IN_LIBRARY)]
+    assert not mock_book_repository.set_taken_many.called
+
+def test_given_books_when_iter_all_books_then_models_are_yielded_lazily(book_service, mock_book_repository):
+    # Given
+    book = BookEntity(fake.word(), fake.name(), 2000, str(uuid.uuid4()))
+    mock_book_repository.iter_books.return_value = iter([book])
+
+    # When
+    all_books = book_service.iter_all_books()
+
+    # Then
+    assert not isinstance(all_books, list)
+    assert list(all_books) == [bookentity_to_bookmodel(book)]
+
+def test_given_cursor_when_get_books_then_page_of_models_is_returned(book_service, mock_book_repository):
+    # Given
+    book = BookEntity(fake.word(), fake.name(), 2000, str(uuid.uuid4()))
+    mock_book_repository.get_books.return_value = BookPage([book], "next-cursor")
+
+    # When
+    page = book_service.get_books("cursor", 1, "author")
+
+    # Then
+    mock_book_repository.get_books.assert_called_once_with("cursor", 1, "author")
+    assert page.books == [bookentity_to_bookmodel(book)]
+    assert page.next_cursor == "next-cursor"
+
+def test_given_unknown_sort_when_get_books_then_raises_value_error(book_service, mock_book_repository):
+    # When/Then
+    with pytest.raises(ValueError, match=BookServiceExceptions.INVALID_SORT):
+        book_service.get_books(None, 10, "is_taken")
+    assert not mock_book_repository.get_books.called
+
+def test_given_non_positive_limit_when_get_books_then_raises_value_error(book_service, mock_book_repository):
+    # When/Then
+    with pytest.raises(ValueError, match=BookServiceExceptions.INVALID_PAGE_LIMIT):
+        book_service.get_books(None, 0, "title")
+    assert not mock_book_repository.get_books.called
+
+def test_given_taken_book_id_when_return_book_then_only_taken_flag_is_written(book_service, mock_book_repository):
+    # Given
+    taken_book = BookEntity(fake.word(), fake.name(), 2022, str(uuid.uuid4()), True)
+    mock_book_repository.get_book_by_id.return_value = taken_book
+    mock_book_repository.set_taken.return_value = BookEntity(taken_book.title, taken_book.author, 2022, taken_book.id, False)
+
+    # When
+    returned_book = book_service.return_book(taken_book.id)
+
+    # Then
+    mock_book_repository.set_taken.assert_called_once_with(taken_book.id, False, True)
+    assert not mock_book_repository.update_book.called
+    assert isinstance(returned_book, BookModel)
+    assert returned_book.is_taken is False
+
+def test_given_book_taken_elsewhere_after_check_when_take_book_then_book_value_exception_is_raised(book_service, mock_book_repository):
+    # Given
+    book = BookEntity(fake.word(), fake.name(), 2022, str(uuid.uuid4()), False)
+    mock_book_repository.get_book_by_id.return_value = book
+    mock_book_repository.set_taken.return_value = None
+
+    # When/Then
+    with pytest.raises(BookValueException, match=BookServiceExceptions.BOOK_ALREADY_TAKEN):
+        book_service.take_book(book.id)
+    mock_book_repository.set_taken.assert_called_once_with(book.id, True, False)
+
+def test_given_editions_when_search_editions_by_title_then_editions_are_returned_with_counts(book_service, mock_book_repository):
+    # Given
+    title = fake.word()
+    author = fake.name()
+    newer_edition = EditionEntity(title, author, 2010, [str(uuid.uuid4()), str(uuid.uuid4())], 1)
+    older_edition = EditionEntity(title, author, 1990, [str(uuid.uuid4())], 0)
+    mock_book_repository.read_editions_by_title.return_value = [older_edition, newer_edition]
+
+    # When
+    found_editions = book_service.search_editions_by_title(title)
+
+    # Then
+    mock_book_repository.read_editions_by_title.assert_called_once_with(title)
+    assert all(isinstance(edition, EditionModel) for edition in found_editions)
+    assert [(edition.publication_year, edition.copy_count, edition.available_count) for edition in found_editions] == \
+        [(1990, 1, 1), (2010, 2, 1)]
+    assert found_editions[1].book_ids == newer_edition.book_ids
+
+def test_given_empty_title_when_fuzzy_search_editions_by_title_then_returned_empty_list(book_service, mock_book_repository):
+    # When
+    found_editions = book_service.fuzzy_search_editions_by_title("")
+
+    # Then
+    assert found_editions == []
+    assert not mock_book_repository.read_editions_similar_to_title.called
+
+def test_given_year_range_when_search_books_by_year_range_then_unique_books_are_returned(book_service, mock_book_repository):
+    # Given
+    book = BookEntity(fake.word(), fake.name(), 1995, str(uuid.uuid4()))
+    book_copy = BookEntity(book.title, book.author, book.publication_year, str(uuid.uuid4()))
+    newer_book = BookEntity(fake.word(), fake.name(), 1999, str(uuid.uuid4()))
+    mock_book_repository.read_books_by_year_range.return_value = [book, book_copy, newer_book]
+
+    # When
+    found_books = book_service.search_books_by_year_range("1990", 2000)
+
+    # Then
+    mock_book_repository.read_books_by_year_range.assert_called_once_with(1990, 2000)
+    assert found_books == [bookentity_to_bookmodel(book), bookentity_to_bookmodel(newer_book)]
+
+def test_given_start_after_end_when_search_books_by_year_range_then_value_error_is_raised(book_service, mock_book_repository):
+    # When/Then
+    with pytest.raises(ValueError, match=BookServiceExceptions.INVALID_YEAR_RANGE):
+        book_service.search_books_by_year_range(2001, 2000)
+    assert not mock_book_repository.read_books_by_year_range.called
+
+@pytest.mark.parametrize("start_year, end_year, message", [
+    (None, 2000, BookServiceExceptions.PUBLICATION_YEAR_NULL_OR_EMPTY),
+    (1990, "", BookServiceExceptions.PUBLICATION_YEAR_NULL_OR_EMPTY),
+    ([1990], 2000, BookServiceExceptions.PUBLICATION_YEAR_NOT_INTEGER),
+])
+def test_given_missing_or_invalid_year_when_search_books_by_year_range_then_value_error_is_raised(
+        book_service, mock_book_repository, start_year, end_year, message):
+    # When/Then
+    with pytest.raises(ValueError, match=message):
+        book_service.search_books_by_year_range(start_year, end_year)
+    assert not mock_book_repository.read_books_by_year_range.called
+
+def test_given_predicate_when_query_books_then_matching_books_are_returned(book_service, mock_book_repository):
+    # Given
+    predicate = (field("author") == fake.name()) & (field("publication_year") > 1990)
+    book = BookEntity(fake.word(), fake.name(), 1995, str(uuid.uuid4()))
+    mock_book_repository.query_books.return_value = [book]
+
+    # When
+    found_books = book_service.query_books(predicate)
+
+    # Then
+    mock_book_repository.query_books.assert_called_once_with(predicate)
+    assert found_books == [bookentity_to_bookmodel(book)]
+
+def test_given_no_predicate_when_query_books_then_value_error_is_raised(book_service, mock_book_repository):
+    # When/Then
+    with pytest.raises(ValueError, match=BookServiceExceptions.INVALID_QUERY):
+        book_service.query_books(lambda book: True)
+    assert not mock_book_repository.query_books.called
+
+def test_given_repeated_search_when_nothing_was_written_then_cached_result_is_returned(book_service, mock_book_repository):
+    # Given
+    title = fake.word()
+    mock_book_repository.write_generation = 1
+    mock_book_repository.read_books_by_title.return_value = [BookEntity(title, fake.name(), 2000, str(uuid.uuid4()))]
+
+    # When
+    first_books = book_service.search_books_by_title(title)
+    second_books = book_service.search_books_by_title(title)
+
+    # Then
+    mock_book_repository.read_books_by_title.assert_called_once_with(title)
+    assert second_books == first_books
+    assert (book_service.search_cache_statistics.hits, book_service.search_cache_statistics.misses) == (1, 1)
+    assert book_service.search_cache_statistics.hit_ratio == 0.5
+
+def test_given_changed_search_results_when_search_is_repeated_then_cached_books_are_unchanged(book_service, mock_book_repository):
+    # Given
+    title = fake.word()
+    mock_book_repository.write_generation = 1
+    mock_book_repository.read_books_by_title.return_value = [BookEntity(title, fake.name(), 2000, str(uuid.uuid4()))]
+    book_service.search_books_by_title(title)[0].title = "HACKED"
+    book_service.search_books_by_title(title)[0].is_taken = True
+
+    # When
+    found_books = book_service.search_books_by_title(title)
+
+    # Then
+    assert mock_book_repository.read_books_by_title.call_count == 1
+    assert (found_books[0].title, found_books[0].is_taken) == (title, False)
+
+def test_given_write_after_search_when_search_is_repeated_then_repository_is_read_again(book_service, mock_book_repository):
+    # Given
+    author = fake.name()
+    book = BookEntity(fake.word(), author, 2000, str(uuid.uuid4()))
+    mock_book_repository.write_generation = 1
+    mock_book_repository.read_books_by_author.return_value = [book]
+    book_service.search_books_by_author(author)
+
+    # When
+    mock_book_repository.write_generation = 2
+    mock_book_repository.read_books_by_author.return_value = [book, BookEntity(fake.word(), author, 2001, str(uuid.uuid4()))]
+    found_books = book_service.search_books_by_author(author)
+
+    # Then
+    assert mock_book_repository.read_books_by_author.call_count == 2
+    assert len(found_books) == 2
+
+def test_given_full_search_cache_when_new_title_is_searched_then_least_recently_used_entry_is_evicted(mock_book_repository):
+    # Given
+    book_service = BookService(mock_book_repository, search_cache_size=2)
+    mock_book_repository.write_generation = 1
+    mock_book_repository.read_books_by_title.return_value = []
+    book_service.search_books_by_title("a")
+    book_service.search_books_by_title("b")
+    book_service.search_books_by_title("a")
+
+    # When
+    book_service.search_books_by_title("c")
+    book_service.search_books_by_title("a")
+    book_service.search_books_by_title("b")
+
+    # Then
+    assert book_service.search_cache_statistics.evictions == 2
+    assert [call.args[0] for call in mock_book_repository.read_books_by_title.call_args_list] == ["a", "b", "c", "b"]
+
 if __name__ == "__main__":
     pytest.main()
@@ -0,0 +1,115 @@
+import threading
+import pytest
+from Library.persistence.persistence.bookrepository import BookRepository
+from Library.persistence.persistence.readwritelock import ReadWriteLock
+from Library.services.services.bookservice import BookService
+from Library.services.services.bookvalueexception import BookValueException
+from Library.services.servicesmodels.bookmodel import BookModel
+from Library.services.servicesmodels.bookoperationstatus import BookOperationStatus
+from faker import Faker
+
+fake = Faker()
+THREAD_COUNT = 16
+
+@pytest.fixture
+def book_service(tmp_path):
+    return BookService(BookRepository(str(tmp_path / "books.json")))
+
+def _run_concurrently(action, thread_count = THREAD_COUNT):
+    barrier = threading.Barrier(thread_count)
+    results = [None] * thread_count
+
+    def run(index):
+        barrier.wait()
+        results[index] = action(index)
+
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(thread_count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return results
+
+def _try(operation, book_id):
+    try:
+        operation(book_id)
+        return True
+    except BookValueException:
+        return False
+
+def test_given_one_available_book_when_many_threads_take_it_then_exactly_one_succeeds(book_service):
+    # Given
+    book = book_service.create_book(BookModel(fake.word(), fake.name(), 2000))
+
+    # When
+    results = _run_concurrently(lambda _: _try(book_service.take_book, book.id))
+
+    # Then
+    assert results.count(True) == 1
+    assert book_service.search_books_by_title(book.title)[0].is_taken is True
+
+def test_given_books_when_threads_take_and_return_same_ids_then_no_update_is_lost(book_service):
+    # Given
+    books = book_service.create_books([BookModel(fake.word(), fake.name(), 2000) for _ in range(4)]).created_books
+    counts = {book.id: [0, 0] for book in books}
+    counts_lock = threading.Lock()
+
+    def take_and_return(index):
+        for round_index in range(25):
+            book_id = books[(index + round_index) % len(books)].id
+            operation = book_service.take_book if (index + round_index) % 2 == 0 else book_service.return_book
+            if _try(operation, book_id):
+                with counts_lock:
+                    counts[book_id][operation == book_service.return_book] += 1
+
+    # When
+    _run_concurrently(take_and_return)
+
+    # Then
+    for book in book_service.get_all_books():
+        takes, returns = counts[book.id]
+        assert takes - returns == int(book.is_taken)
+
+def test_given_same_ids_when_threads_take_batches_then_each_book_is_taken_once(book_service):
+    # Given
+    books = book_service.create_books([BookModel(fake.word(), fake.name(), 2000) for _ in range(8)]).created_books
+    book_ids = [book.id for book in books]
+
+    # When
+    results = _run_concurrently(lambda index: book_service.take_books(book_ids[index % 2:] + book_ids[:index % 2]))
+
+    # Then
+    successes = [book_id for result in results for book_id, status in result if status == BookOperationStatus.OK]
+    assert sorted(successes) == sorted(book_ids)
+
+def test_given_active_reader_when_writer_waits_then_new_readers_wait_for_writer():
+    # Given
+    lock = ReadWriteLock()
+    events = []
+    writer_waiting = threading.Event()
+
+    def write():
+        writer_waiting.set()
+        with lock.write():
+            events.append("write")
+
+    def read():
+        with lock.read():
+            events.append("read")
+
+    # When
+    with lock.read():
+        writer = threading.Thread(target=write)
+        writer.start()
+        writer_waiting.wait()
+        writer.join(0.05)
+        reader = threading.Thread(target=read)
+        reader.start()
+        reader.join(0.05)
+        events.append("first read")
+    writer.join()
+    reader.join()
+
+    # Then
+    assert events == ["first read", "write", "read"]
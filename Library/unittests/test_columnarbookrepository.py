@@ -0,0 +1,61 @@
+import pytest
+from Library.persistence.persistence.bookpredicates import field
+from Library.persistence.persistence.bookrepository import BookRepository
+from Library.persistence.persistenceentities.bookentity import BookEntity
+from faker import Faker
+
+pytest.importorskip("numpy")
+
+from Library.persistence.persistence.columnarbookrepository import ColumnarBookRepository
+
+fake = Faker()
+
+@pytest.fixture
+def book_repository(tmp_path):
+    return BookRepository(str(tmp_path / "books.json"))
+
+def _new_books(count):
+    authors = [fake.name() for _ in range(5)]
+    return [BookEntity(fake.word(), authors[index % len(authors)], 1950 + index % 70, None, index % 3 == 0) for index in range(count)]
+
+def test_given_compound_predicate_when_query_books_then_columnar_result_matches_scan(book_repository):
+    # Given
+    book_repository.create_books(_new_books(300))
+    columnar_repository = ColumnarBookRepository(book_repository)
+    author = book_repository.read_books()[0].author
+    predicate = (field("author") == author) & (field("publication_year") > 1990) & (field("is_taken") == False)
+
+    # When
+    books = columnar_repository.query_books(predicate)
+
+    # Then
+    assert [book.to_dict() for book in books] == [book.to_dict() for book in book_repository.query_books(predicate)]
+    assert books
+
+def test_given_text_and_membership_predicates_when_query_books_then_columnar_result_matches_scan(book_repository):
+    # Given
+    book_repository.create_books(_new_books(50))
+    columnar_repository = ColumnarBookRepository(book_repository)
+    years = {1950, 1960, 1970}
+    predicate = (field("title") >= "m") | ~field("publication_year").isin(years) & (field("author") != "nobody")
+
+    # When
+    books = columnar_repository.query_books(predicate)
+
+    # Then
+    assert [book.id for book in books] == [book.id for book in book_repository.query_books(predicate)]
+
+def test_given_writes_through_the_repository_when_query_books_then_columns_are_in_sync(book_repository):
+    # Given
+    columnar_repository = ColumnarBookRepository(book_repository)
+    created_books = columnar_repository.create_books(_new_books(2000))
+    book = columnar_repository.create_book(BookEntity("dune", "frank herbert", 1965))
+
+    # When
+    columnar_repository.set_taken(book.id, True)
+    columnar_repository.update_book(BookEntity(created_books[0].title, "frank herbert", 1966, created_books[0].id, False))
+    books = columnar_repository.query_books(field("author") == "frank herbert")
+
+    # Then
+    assert [(found_book.id, found_book.publication_year, found_book.is_taken) for found_book in books] == \
+        [(created_books[0].id, 1966, False), (book.id, 1965, True)]
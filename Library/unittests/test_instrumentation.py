@@ -0,0 +1,131 @@
+import logging
+import pytest
+from Library.instrumentation.instrumentation.inmemorymetricsexporter import InMemoryMetricsExporter
+from Library.instrumentation.instrumentation.instrumentedbookrepository import InstrumentedBookRepository
+from Library.instrumentation.instrumentation.instrumentedbookservice import InstrumentedBookService
+from Library.instrumentation.instrumentation.logmetricsexporter import LogMetricsExporter
+from Library.instrumentation.instrumentation.metricsregistry import MetricsRegistry
+from Library.instrumentation.instrumentation.prometheusmetricsexporter import PrometheusMetricsExporter
+from Library.persistence.persistence.bookpredicates import field
+from Library.persistence.persistence.bookrepository import BookRepository
+from Library.services.services.bookservice import BookService
+from Library.services.services.bookvalueexception import BookValueException
+from Library.services.servicesmodels.bookmodel import BookModel
+from faker import Faker
+
+fake = Faker()
+
+@pytest.fixture
+def exporter():
+    return InMemoryMetricsExporter()
+
+@pytest.fixture
+def metrics(exporter):
+    return MetricsRegistry([exporter])
+
+@pytest.fixture
+def book_service(tmp_path, metrics):
+    book_repository = InstrumentedBookRepository(BookRepository(str(tmp_path / "books.json")), metrics)
+    return InstrumentedBookService(BookService(book_repository), metrics)
+
+def test_given_instrumented_layers_when_book_is_created_then_both_layers_are_recorded(book_service, metrics, exporter):
+    # Given
+    book = BookModel(fake.word(), fake.name(), 2000)
+
+    # When
+    book_service.create_book(book)
+    metrics.export()
+
+    # Then
+    service_metrics = exporter.latest[("service", "create_book")]
+    repository_metrics = exporter.latest[("repository", "create_book")]
+    assert service_metrics.calls == 1
+    assert service_metrics.books == 1
+    assert repository_metrics.books == 0
+    assert repository_metrics.bytes_written > 0
+    assert service_metrics.seconds >= repository_metrics.seconds
+
+def test_given_books_when_iterated_then_books_are_counted_once_iteration_ends(book_service, metrics, exporter):
+    # Given
+    book_service.create_books([BookModel(fake.word(), fake.name(), 2000) for _ in range(3)])
+
+    # When
+    books = list(book_service.iter_all_books())
+    metrics.export()
+
+    # Then
+    assert len(books) == 3
+    assert exporter.latest[("repository", "iter_books")].books == 3
+    assert exporter.latest[("service", "iter_all_books")].books == 3
+
+def test_given_predicate_query_when_recorded_then_books_scanned_not_returned_are_counted(book_service, metrics, exporter):
+    # Given
+    titles = ["alpha", "beta", "gamma", "delta", "epsilon"]
+    book_service.create_books([BookModel(title, fake.name(), 2000 + index) for index, title in enumerate(titles)])
+
+    # When
+    found_books = book_service.query_books(field("publication_year") == 2000)
+    book_service.search_books_by_title("alpha")
+    metrics.export()
+
+    # Then
+    assert len(found_books) == 1
+    assert exporter.latest[("repository", "query_books")].books == 5
+    assert exporter.latest[("repository", "read_books_by_title")].books == 1
+
+def test_given_iteration_stopped_early_when_exported_then_iteration_is_recorded(book_service, metrics, exporter):
+    # Given
+    book_service.create_books([BookModel(fake.word(), fake.name(), 2000) for _ in range(3)])
+    books = book_service.iter_all_books()
+
+    # When
+    next(books)
+    books.close()
+    metrics.export()
+
+    # Then
+    assert exporter.latest[("service", "iter_all_books")].calls == 1
+    assert exporter.latest[("service", "iter_all_books")].errors == 0
+    assert exporter.latest[("service", "iter_all_books")].books == 1
+
+def test_given_failing_operation_when_called_then_error_is_counted(book_service, metrics, exporter):
+    # When
+    with pytest.raises(BookValueException):
+        book_service.take_book("missing")
+    metrics.export()
+
+    # Then
+    assert exporter.latest[("service", "take_book")].errors == 1
+    assert exporter.latest[("repository", "get_book_by_id")].errors == 0
+
+def test_given_recorded_operations_when_exported_to_prometheus_then_histogram_is_cumulative(tmp_path):
+    # Given
+    file_path = str(tmp_path / "library.prom")
+    metrics = MetricsRegistry([PrometheusMetricsExporter(file_path)])
+    metrics.record("service", "take_book", 0.002)
+    metrics.record("service", "take_book", 2.0, error=True)
+
+    # When
+    metrics.export()
+
+    # Then
+    with open(file_path) as file:
+        lines = file.read().splitlines()
+    assert 'library_operation_calls_total{layer="service",operation="take_book"} 2' in lines
+    assert 'library_operation_errors_total{layer="service",operation="take_book"} 1' in lines
+    assert 'library_operation_duration_seconds_bucket{layer="service",operation="take_book",le="0.005"} 1' in lines
+    assert 'library_operation_duration_seconds_bucket{layer="service",operation="take_book",le="+Inf"} 2' in lines
+
+def test_given_recorded_operation_when_exported_to_log_then_one_line_is_logged(caplog):
+    # Given
+    metrics = MetricsRegistry([LogMetricsExporter()])
+    metrics.record("repository", "read_books", 0.01, books=5)
+
+    # When
+    with caplog.at_level(logging.INFO, logger="Library.metrics"):
+        metrics.export()
+
+    # Then
+    assert len(caplog.records) == 1
+    assert "operation=read_books" in caplog.records[0].getMessage()
+    assert "books=5" in caplog.records[0].getMessage()
@@ -0,0 +1,153 @@
+import json
+import pytest
+from Library.persistence.persistence.logbookrepository import LogBookRepository, migrate_json_to_log
+from Library.persistence.persistenceentities.bookentity import BookEntity
+from faker import Faker
+
+fake = Faker()
+
+@pytest.fixture
+def log_file_path(tmp_path):
+    return str(tmp_path / "books.jsonl")
+
+def _new_book():
+    return BookEntity(fake.word(), fake.name(), int(fake.year()))
+
+def test_given_created_books_when_repository_is_reopened_then_books_are_rebuilt(log_file_path):
+    # Given
+    book_repository = LogBookRepository(log_file_path)
+    created_books = [book_repository.create_book(_new_book()) for _ in range(3)]
+
+    # When
+    books = LogBookRepository(log_file_path).read_books()
+
+    # Then
+    assert [book.to_dict() for book in books] == [book.to_dict() for book in created_books]
+
+def test_given_updated_book_when_repository_is_reopened_then_latest_state_is_rebuilt(log_file_path):
+    # Given
+    book_repository = LogBookRepository(log_file_path)
+    book = book_repository.create_book(_new_book())
+    updated_book = BookEntity(book.title, book.author, book.publication_year, book.id, True)
+
+    # When
+    book_repository.update_book(updated_book)
+    books = LogBookRepository(log_file_path).read_books()
+
+    # Then
+    assert len(books) == 1
+    assert books[0].is_taken is True
+
+def test_given_write_when_book_is_created_then_single_record_is_appended(log_file_path):
+    # Given
+    book_repository = LogBookRepository(log_file_path)
+    book_repository.create_book(_new_book())
+
+    # When
+    book_repository.create_book(_new_book())
+
+    # Then
+    with open(log_file_path) as file:
+        assert len(file.readlines()) == 2
+
+def test_given_legacy_json_file_when_repository_is_opened_then_books_are_migrated(tmp_path, log_file_path):
+    # Given
+    legacy_file_path = str(tmp_path / "books.json")
+    legacy_books = [BookEntity(fake.word(), fake.name(), 2000, str(index), False).to_dict() for index in range(3)]
+    with open(legacy_file_path, 'w') as file:
+        json.dump(legacy_books, file, indent=2)
+
+    # When
+    books = LogBookRepository(log_file_path, legacy_file_path=legacy_file_path).read_books()
+
+    # Then
+    assert [book.to_dict() for book in books] == legacy_books
+
+def test_given_legacy_json_file_when_migrate_json_to_log_then_book_count_is_returned(tmp_path, log_file_path):
+    # Given
+    legacy_file_path = str(tmp_path / "books.json")
+    with open(legacy_file_path, 'w') as file:
+        json.dump([BookEntity(fake.word(), fake.name(), 2000, "1", False).to_dict()], file)
+
+    # When
+    migrated_books = migrate_json_to_log(legacy_file_path, log_file_path)
+
+    # Then
+    assert migrated_books == 1
+    assert len(LogBookRepository(log_file_path).read_books()) == 1
+
+def test_given_superseded_records_over_threshold_when_updating_then_log_is_compacted(log_file_path):
+    # Given
+    book_repository = LogBookRepository(log_file_path, compaction_threshold=5)
+    book = book_repository.create_book(_new_book())
+
+    # When
+    for index in range(6):
+        book_repository.update_book(BookEntity(book.title, book.author, book.publication_year, book.id, index % 2 == 0))
+        book_repository.wait_for_compaction()
+
+    # Then
+    with open(log_file_path) as file:
+        assert len(file.readlines()) < 7
+    books = LogBookRepository(log_file_path).read_books()
+    assert len(books) == 1
+    assert books[0].is_taken is False
+
+def test_given_compaction_when_run_then_books_scanned_are_not_counted(log_file_path):
+    # Given
+    book_repository = LogBookRepository(log_file_path)
+    book_repository.create_books([_new_book() for _ in range(3)])
+    books_scanned = book_repository.io_statistics.books_scanned
+
+    # When
+    book_repository.compact()
+
+    # Then
+    assert book_repository.io_statistics.books_scanned == books_scanned
+
+def test_given_torn_final_record_when_repository_is_opened_then_record_is_discarded(log_file_path):
+    # Given
+    book_repository = LogBookRepository(log_file_path)
+    book_repository.create_book(_new_book())
+    with open(log_file_path, 'a') as file:
+        file.write('{"op":"create","book":{"ti')
+
+    # When
+    reopened_repository = LogBookRepository(log_file_path)
+    reopened_repository.create_book(_new_book())
+
+    # Then
+    assert len(LogBookRepository(log_file_path).read_books()) == 2
+
+def test_given_updated_book_when_get_book_by_id_then_latest_state_is_returned(log_file_path):
+    # Given
+    book_repository = LogBookRepository(log_file_path)
+    book = book_repository.create_book(_new_book())
+    book_repository.update_book(BookEntity(book.title, book.author, book.publication_year, book.id, True))
+
+    # When
+    found_book = LogBookRepository(log_file_path).get_book_by_id(book.id)
+
+    # Then
+    assert found_book.is_taken is True
+
+def test_given_batch_of_books_when_create_books_then_all_records_are_appended(log_file_path):
+    # Given
+    book_repository = LogBookRepository(log_file_path)
+
+    # When
+    created_books = book_repository.create_books([_new_book() for _ in range(4)])
+
+    # Then
+    assert [book.to_dict() for book in LogBookRepository(log_file_path).read_books()] == [book.to_dict() for book in created_books]
+
+def test_given_changed_books_when_update_books_then_latest_states_are_rebuilt(log_file_path):
+    # Given
+    book_repository = LogBookRepository(log_file_path)
+    created_books = book_repository.create_books([_new_book() for _ in range(2)])
+
+    # When
+    book_repository.update_books([BookEntity(book.title, book.author, book.publication_year, book.id, True) for book in created_books])
+
+    # Then
+    assert all(book.is_taken for book in LogBookRepository(log_file_path).read_books())
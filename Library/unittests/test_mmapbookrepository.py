@@ -0,0 +1,128 @@
+import os
+import json
+import uuid
+import pytest
+from Library.persistence.persistence.mmapbookrepository import MmapBookRepository, json_to_mapped, mapped_to_json
+from Library.persistence.persistenceentities.bookentity import BookEntity
+from faker import Faker
+
+fake = Faker()
+
+@pytest.fixture
+def record_file_path(tmp_path):
+    return str(tmp_path / "books.bin")
+
+@pytest.fixture
+def book_repository(record_file_path):
+    book_repository = MmapBookRepository(record_file_path)
+    yield book_repository
+    book_repository.close()
+
+def _new_book():
+    return BookEntity(fake.sentence(), fake.name(), int(fake.year()))
+
+def test_given_created_books_when_repository_is_reopened_then_books_are_read(book_repository, record_file_path):
+    # Given
+    created_books = book_repository.create_books([_new_book() for _ in range(3)])
+    created_books.append(book_repository.create_book(BookEntity("Žalgiris", "Ąžuolas", 1410)))
+
+    # When
+    books = MmapBookRepository(record_file_path).read_books()
+
+    # Then
+    assert [book.to_dict() for book in books] == [book.to_dict() for book in created_books]
+
+def test_given_taken_flag_change_when_update_book_then_record_is_patched_in_place(book_repository, record_file_path):
+    # Given
+    book = book_repository.create_book(_new_book())
+    heap_size = os.path.getsize(record_file_path + ".heap")
+    record_size = os.path.getsize(record_file_path)
+
+    # When
+    book_repository.update_book(BookEntity(book.title, book.author, book.publication_year, book.id, True))
+
+    # Then
+    assert os.path.getsize(record_file_path + ".heap") == heap_size
+    assert os.path.getsize(record_file_path) == record_size
+    assert MmapBookRepository(record_file_path).get_book_by_id(book.id).is_taken is True
+
+def test_given_renamed_book_when_read_books_by_title_then_indexes_are_current(book_repository):
+    # Given
+    book = book_repository.create_book(_new_book())
+    old_title = book.title
+    book_repository.read_books_by_title(old_title)
+
+    # When
+    book_repository.update_book(BookEntity("Renamed title", book.author, book.publication_year, book.id, False))
+
+    # Then
+    assert list(book_repository.read_books_by_title(old_title)) == []
+    assert [found_book.id for found_book in book_repository.read_books_by_title("Renamed title")] == [book.id]
+    assert [found_book.id for found_book in book_repository.read_books_similar_to_title("renamed titel", 5)] == [book.id]
+
+def test_given_nonexistent_id_when_get_books_by_ids_then_none_is_returned(book_repository):
+    # Given
+    book = book_repository.create_book(_new_book())
+
+    # When
+    books = book_repository.get_books_by_ids([book.id, str(uuid.uuid4()), "not-a-uuid"])
+
+    # Then
+    assert books[0].id == book.id
+    assert books[1:] == [None, None]
+
+def test_given_json_catalog_when_converted_both_ways_then_books_are_preserved(tmp_path, record_file_path):
+    # Given
+    json_file_path = str(tmp_path / "books.json")
+    exported_file_path = str(tmp_path / "exported.json")
+    legacy_books = [BookEntity(fake.sentence(), fake.name(), 2000, str(uuid.uuid4()), index % 2 == 0).to_dict() for index in range(4)]
+    with open(json_file_path, 'w') as file:
+        json.dump(legacy_books, file)
+
+    # When
+    json_to_mapped(json_file_path, record_file_path)
+    mapped_to_json(record_file_path, exported_file_path)
+
+    # Then
+    with open(exported_file_path) as file:
+        assert json.load(file) == legacy_books
+
+def test_given_single_appends_when_books_are_created_then_files_grow_in_chunks(book_repository, record_file_path):
+    # Given
+    book_repository.create_book(_new_book())
+    record_size = os.path.getsize(record_file_path)
+    heap_size = os.path.getsize(record_file_path + ".heap")
+
+    # When
+    for _ in range(50):
+        book_repository.create_book(_new_book())
+
+    # Then
+    assert os.path.getsize(record_file_path) == record_size
+    assert os.path.getsize(record_file_path + ".heap") == heap_size
+
+def test_given_spare_capacity_when_repository_is_reopened_and_appended_then_books_follow_the_last_book(record_file_path):
+    # Given
+    book_repository = MmapBookRepository(record_file_path)
+    created_books = book_repository.create_books([_new_book() for _ in range(3)])
+    book_repository.close()
+    reopened_repository = MmapBookRepository(record_file_path)
+
+    # When
+    created_books.append(reopened_repository.create_book(BookEntity("Žalgiris", "Ąžuolas", 1410)))
+    reopened_repository.close()
+    books = MmapBookRepository(record_file_path).read_books()
+
+    # Then
+    assert [book.to_dict() for book in books] == [book.to_dict() for book in created_books]
+
+@pytest.mark.parametrize("book_id", [123, [1]])
+def test_given_non_string_id_when_looked_up_then_book_is_not_found(book_repository, book_id):
+    # Given
+    book = book_repository.create_book(_new_book())
+
+    # When/Then
+    assert book_repository.get_book_by_id(book_id) is None
+    assert book_repository.get_books_by_ids([book_id, book.id])[0] is None
+    assert book_repository.set_taken(book_id, True) is None
+    assert book_repository.set_taken_many([book_id, book.id], True) == [book.id]
@@ -0,0 +1,71 @@
+import os
+import pytest
+from Library.persistence.persistence.bookrepository import BookRepository
+from Library.persistence.persistence.shardedbookrepository import ShardedBookRepository, reshard_books, shard_file_paths, shard_index
+from Library.persistence.persistenceentities.bookentity import BookEntity
+from faker import Faker
+
+fake = Faker()
+SHARD_COUNT = 4
+
+@pytest.fixture
+def book_file_path(tmp_path):
+    return str(tmp_path / "books.json")
+
+@pytest.fixture
+def book_repository(book_file_path):
+    return ShardedBookRepository([BookRepository(file_path) for file_path in shard_file_paths(book_file_path, SHARD_COUNT)])
+
+def _new_book():
+    return BookEntity(fake.word(), fake.name(), int(fake.year()))
+
+def test_given_created_books_when_read_shard_files_then_each_book_is_in_its_owning_shard(book_repository, book_file_path):
+    # Given
+    created_books = book_repository.create_books([_new_book() for _ in range(20)])
+
+    # When
+    shard_books = [BookRepository(file_path).read_books() for file_path in shard_file_paths(book_file_path, SHARD_COUNT)]
+
+    # Then
+    assert sorted(book.id for books in shard_books for book in books) == sorted(book.id for book in created_books)
+    assert all(shard_index(book.id, SHARD_COUNT) == index for index, books in enumerate(shard_books) for book in books)
+
+def test_given_updated_book_when_update_book_then_only_owning_shard_is_rewritten(book_repository, book_file_path):
+    # Given
+    created_books = book_repository.create_books([_new_book() for _ in range(20)])
+    book = created_books[0]
+    file_paths = shard_file_paths(book_file_path, SHARD_COUNT)
+    modified_times = [os.stat(file_path).st_mtime_ns for file_path in file_paths]
+
+    # When
+    book_repository.update_book(BookEntity(book.title, book.author, book.publication_year, book.id, True))
+
+    # Then
+    changed_shards = [index for index, file_path in enumerate(file_paths) if os.stat(file_path).st_mtime_ns != modified_times[index]]
+    assert changed_shards == [shard_index(book.id, SHARD_COUNT)]
+    assert book_repository.get_book_by_id(book.id).is_taken is True
+
+def test_given_copies_in_several_shards_when_read_books_similar_to_title_then_copies_are_merged(book_repository):
+    # Given
+    created_books = book_repository.create_books([BookEntity("Dune", fake.name(), 1965) for _ in range(8)])
+    book_repository.create_books([BookEntity("Emma", fake.name(), 1815) for _ in range(8)])
+
+    # When
+    books = book_repository.read_books_similar_to_title("dunes", 1)
+
+    # Then
+    assert sorted(book.id for book in books) == sorted(book.id for book in created_books)
+
+def test_given_unsharded_catalog_when_resharded_twice_then_all_books_are_kept(book_file_path):
+    # Given
+    created_books = BookRepository(book_file_path).create_books([_new_book() for _ in range(12)])
+
+    # When
+    reshard_books(book_file_path, 1, 3)
+    book_count = reshard_books(book_file_path, 3, 2)
+
+    # Then
+    book_repository = ShardedBookRepository([BookRepository(file_path) for file_path in shard_file_paths(book_file_path, 2)])
+    assert book_count == 12
+    assert sorted(book.id for book in book_repository.read_books()) == sorted(book.id for book in created_books)
+    assert not any(os.path.exists(file_path) for file_path in shard_file_paths(book_file_path, 3))
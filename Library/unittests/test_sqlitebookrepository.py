@@ -0,0 +1,188 @@
+import json
+import sqlite3
+import threading
+import pytest
+from Library.persistence.persistence import sqlitebookrepository
+from Library.persistence.persistence.sqlitebookrepository import SqliteBookRepository
+from Library.persistence.persistenceentities.bookentity import BookEntity
+from faker import Faker
+
+fake = Faker()
+
+@pytest.fixture
+def database_path(tmp_path):
+    return str(tmp_path / "books.db")
+
+@pytest.fixture
+def book_repository(database_path):
+    book_repository = SqliteBookRepository(database_path)
+    yield book_repository
+    book_repository.close()
+
+def _new_book():
+    return BookEntity(fake.word(), fake.name(), int(fake.year()))
+
+def test_given_created_books_when_read_books_then_books_are_returned_in_insertion_order(book_repository, database_path):
+    # Given
+    created_books = [book_repository.create_book(_new_book()) for _ in range(3)]
+
+    # When
+    books = SqliteBookRepository(database_path).read_books()
+
+    # Then
+    assert [book.to_dict() for book in books] == [book.to_dict() for book in created_books]
+
+def test_given_database_when_opened_then_wal_journal_and_indexes_are_used(book_repository, database_path):
+    # Given
+    connection = sqlite3.connect(database_path)
+
+    # When
+    journal_mode = connection.execute("PRAGMA journal_mode").fetchone()[0]
+    indexes = {row[1] for row in connection.execute("PRAGMA index_list(books)")}
+
+    # Then
+    assert journal_mode == "wal"
+    assert {"books_title", "books_author", "books_publication_year"} <= indexes
+
+def test_given_updated_books_when_get_books_by_ids_then_latest_states_are_returned(book_repository):
+    # Given
+    created_books = book_repository.create_books([_new_book() for _ in range(3)])
+    book_repository.update_books([BookEntity(book.title, book.author, book.publication_year, book.id, True) for book in created_books[:2]])
+
+    # When
+    books = book_repository.get_books_by_ids([book.id for book in created_books] + ["nonexistent-id"])
+
+    # Then
+    assert [book.is_taken if book else None for book in books] == [True, True, False, None]
+
+def test_given_books_when_read_books_by_title_and_author_then_only_matching_books_are_returned(book_repository):
+    # Given
+    matching_book = book_repository.create_book(_new_book())
+    book_repository.create_book(BookEntity(matching_book.title + "x", matching_book.author + "x", 2000))
+
+    # When
+    books_by_title = book_repository.read_books_by_title(matching_book.title)
+    books_by_author = book_repository.read_books_by_author(matching_book.author)
+
+    # Then
+    assert [book.id for book in books_by_title] == [matching_book.id]
+    assert [book.id for book in books_by_author] == [matching_book.id]
+
+def test_given_renamed_book_when_read_books_similar_to_title_then_search_index_is_current(book_repository):
+    # Given
+    book = book_repository.create_book(BookEntity("The Hobbit", fake.name(), 1937))
+    book_repository.update_book(BookEntity("Silmarillion", book.author, book.publication_year, book.id, False))
+
+    # When
+    old_title_books = book_repository.read_books_similar_to_title("hobbit", 5)
+    new_title_books = book_repository.read_books_similar_to_title("silmarilion", 5)
+
+    # Then
+    assert old_title_books == []
+    assert [found_book.id for found_book in new_title_books] == [book.id]
+
+def test_given_book_created_by_another_connection_when_read_books_similar_to_author_then_book_is_found(book_repository, database_path):
+    # Given
+    book_repository.read_books_similar_to_author("anyone", 5)
+    other_repository = SqliteBookRepository(database_path)
+    book = other_repository.create_book(BookEntity(fake.word(), "Ursula K. Le Guin", 1969))
+
+    # When
+    found_books = book_repository.read_books_similar_to_author("ursula le guin", 5)
+
+    # Then
+    assert [found_book.id for found_book in found_books] == [book.id]
+
+def test_given_built_search_index_when_book_is_renamed_then_index_is_updated_in_place(book_repository):
+    # Given
+    book = book_repository.create_book(BookEntity("The Hobbit", fake.name(), 1937))
+    book_repository.read_books_similar_to_title("hobbit", 5)
+
+    # When
+    book_repository.update_book(BookEntity("Silmarillion", book.author, book.publication_year, book.id, False))
+    created_book = book_repository.create_book(BookEntity("Unfinished Tales", fake.name(), 1980))
+
+    # Then
+    assert book_repository.read_books_similar_to_title("hobbit", 5) == []
+    assert [found_book.id for found_book in book_repository.read_books_similar_to_title("silmarilion", 5)] == [book.id]
+    assert [found_book.id for found_book in book_repository.read_books_similar_to_title("unfinished tale", 5)] == [created_book.id]
+
+def test_given_search_index_and_commit_by_another_connection_when_book_is_created_then_both_books_are_found(book_repository, database_path):
+    # Given
+    book_repository.read_books_similar_to_author("anyone", 5)
+    other_repository = SqliteBookRepository(database_path)
+    other_book = other_repository.create_book(BookEntity(fake.word(), "Ursula K. Le Guin", 1969))
+    other_repository.close()
+
+    # When
+    book = book_repository.create_book(BookEntity(fake.word(), "Ursula Le Guin", 1971))
+    found_books = book_repository.read_books_similar_to_author("ursula le guin", 5)
+
+    # Then
+    assert sorted(found_book.id for found_book in found_books) == sorted([other_book.id, book.id])
+
+def test_given_reads_on_several_threads_when_closed_then_reader_connections_are_closed(database_path, monkeypatch):
+    # Given
+    connections = []
+    connect = sqlitebookrepository._connect
+    monkeypatch.setattr(sqlitebookrepository, "_connect",
+                        lambda *args, **kwargs: connections.append(connect(*args, **kwargs)) or connections[-1])
+    book_repository = SqliteBookRepository(database_path)
+    book_repository.create_book(_new_book())
+    readers = [threading.Thread(target=book_repository.read_books) for _ in range(3)]
+    for reader in readers:
+        reader.start()
+    for reader in readers:
+        reader.join()
+
+    # When
+    book_repository.close()
+
+    # Then
+    assert len(connections) == 4
+    for connection in connections:
+        with pytest.raises(sqlite3.ProgrammingError):
+            connection.execute("SELECT 1")
+
+def test_given_legacy_json_file_when_repository_is_opened_then_books_are_migrated(tmp_path, database_path):
+    # Given
+    legacy_file_path = str(tmp_path / "books.json")
+    legacy_books = [BookEntity(fake.word(), fake.name(), 2000, str(index), False).to_dict() for index in range(3)]
+    with open(legacy_file_path, 'w') as file:
+        json.dump(legacy_books, file)
+
+    # When
+    books = SqliteBookRepository(database_path, legacy_file_path=legacy_file_path).read_books()
+
+    # Then
+    assert [book.to_dict() for book in books] == legacy_books
+
+def test_given_database_without_editions_when_repository_is_opened_then_editions_are_backfilled(book_repository, database_path):
+    # Given
+    title = fake.word()
+    author = fake.name()
+    book_repository.create_books([BookEntity(title, author, 2000), BookEntity(title, author, 2000, None, True)])
+    connection = sqlite3.connect(database_path)
+    with connection:
+        connection.execute("DELETE FROM editions")
+    connection.close()
+
+    # When
+    editions = SqliteBookRepository(database_path).read_editions_by_title(title)
+
+    # Then
+    assert [(edition.copy_count, edition.taken_count) for edition in editions] == [(2, 1)]
+
+def test_given_two_repositories_on_one_database_when_both_take_a_book_then_only_one_succeeds(book_repository, database_path):
+    # Given
+    book = book_repository.create_book(_new_book())
+    other_book_repository = SqliteBookRepository(database_path)
+
+    # When
+    first_result = book_repository.set_taken(book.id, True, False)
+    second_result = other_book_repository.set_taken(book.id, True, False)
+    other_book_repository.close()
+
+    # Then
+    assert first_result.is_taken is True
+    assert second_result is None
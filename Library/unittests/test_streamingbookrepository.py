@@ -0,0 +1,82 @@
+import io
+import json
+import pytest
+from Library.persistence.persistence.jsonstream import iter_json_array, write_json_array
+from Library.persistence.persistence.streamingbookrepository import StreamingBookRepository
+from Library.persistence.persistenceentities.bookentity import BookEntity
+from faker import Faker
+
+fake = Faker()
+
+@pytest.fixture
+def book_file_path(tmp_path):
+    return str(tmp_path / "books.json")
+
+@pytest.fixture
+def book_repository(book_file_path):
+    return StreamingBookRepository(book_file_path)
+
+def _new_book():
+    return BookEntity(fake.word(), fake.name(), int(fake.year()))
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 64])
+def test_given_json_array_split_across_chunks_when_iter_json_array_then_values_are_yielded(chunk_size):
+    # Given
+    values = [{"title": fake.sentence(), "publication_year": 1234}, 5678, {"nested": [1, {"a": "]"}]}]
+    file = io.StringIO(json.dumps(values, indent=2))
+
+    # When
+    streamed_values = list(iter_json_array(file, chunk_size))
+
+    # Then
+    assert streamed_values == values
+
+def test_given_values_when_write_json_array_then_output_matches_json_dump():
+    # Given
+    values = [{"title": fake.word(), "id": str(index)} for index in range(3)]
+    file = io.StringIO()
+
+    # When
+    write_json_array(file, iter(values))
+
+    # Then
+    assert file.getvalue() == json.dumps(values, indent=2)
+
+def test_given_created_books_when_iter_books_then_books_are_streamed(book_repository):
+    # Given
+    created_books = book_repository.create_books([_new_book() for _ in range(3)])
+    created_books.append(book_repository.create_book(_new_book()))
+
+    # When
+    books = book_repository.iter_books()
+
+    # Then
+    assert not isinstance(books, list)
+    assert [book.to_dict() for book in books] == [book.to_dict() for book in created_books]
+
+def test_given_updated_book_when_get_book_by_id_then_latest_state_is_returned(book_repository):
+    # Given
+    book = book_repository.create_book(_new_book())
+    book_repository.create_book(_new_book())
+
+    # When
+    book_repository.update_book(BookEntity(book.title, book.author, book.publication_year, book.id, True))
+
+    # Then
+    assert book_repository.get_book_by_id(book.id).is_taken is True
+    assert book_repository.get_books_by_ids([book.id, "nonexistent-id"])[1] is None
+
+def test_given_books_when_searching_then_only_matching_books_are_returned(book_repository):
+    # Given
+    matching_book = book_repository.create_book(BookEntity("The Left Hand of Darkness", fake.name(), 1969))
+    book_repository.create_book(BookEntity("Dune", fake.name(), 1965))
+
+    # When
+    books_by_title = book_repository.read_books_by_title(matching_book.title)
+    books_by_author = book_repository.read_books_by_author(matching_book.author)
+    similar_books = book_repository.read_books_similar_to_title("left hand of darknes", 5)
+
+    # Then
+    assert [book.id for book in books_by_title] == [matching_book.id]
+    assert [book.id for book in books_by_author] == [matching_book.id]
+    assert [book.id for book in similar_books] == [matching_book.id]
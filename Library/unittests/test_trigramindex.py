@@ -0,0 +1,65 @@
+import pytest
+from Library.persistence.persistence.trigramindex import TrigramIndex, normalize_text
+
+@pytest.fixture
+def trigram_index():
+    trigram_index = TrigramIndex()
+    for text in ["The Hobbit", "The Lord of the Rings", "Hobbit Tales", "Dune", "Émile"]:
+        trigram_index.add(text)
+
+    return trigram_index
+
+def test_given_mixed_case_accented_text_when_normalize_text_then_folded_text_is_returned():
+    # When
+    normalized_text = normalize_text("  Émile   ZOLA ")
+
+    # Then
+    assert normalized_text == "emile zola"
+
+def test_given_exact_and_prefix_matches_when_search_then_exact_match_is_ranked_first(trigram_index):
+    # Given
+    trigram_index.add("Dune Messiah")
+
+    # When
+    found_texts = trigram_index.search("dune")
+
+    # Then
+    assert found_texts == ["Dune", "Dune Messiah"]
+
+def test_given_short_prefix_when_search_then_prefixed_texts_are_returned(trigram_index):
+    # When
+    found_texts = trigram_index.search("th")
+
+    # Then
+    assert found_texts == ["The Hobbit", "The Lord of the Rings"]
+
+def test_given_substring_when_search_then_prefix_matches_rank_before_substring_matches(trigram_index):
+    # When
+    found_texts = trigram_index.search("hobbit")
+
+    # Then
+    assert found_texts == ["Hobbit Tales", "The Hobbit"]
+
+def test_given_misspelled_query_when_search_then_similar_text_is_returned(trigram_index):
+    # When
+    found_texts = trigram_index.search("Lord of the Rigns")
+
+    # Then
+    assert found_texts[0] == "The Lord of the Rings"
+
+def test_given_removed_text_when_search_then_text_is_not_returned(trigram_index):
+    # Given
+    trigram_index.remove("Dune")
+
+    # When
+    found_texts = trigram_index.search("dune")
+
+    # Then
+    assert found_texts == []
+
+def test_given_limit_when_search_then_at_most_limit_texts_are_returned(trigram_index):
+    # When
+    found_texts = trigram_index.search("hobbit", limit=1)
+
+    # Then
+    assert found_texts == ["Hobbit Tales"]